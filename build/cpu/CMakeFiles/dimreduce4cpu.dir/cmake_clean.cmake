@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "/root/package/dimreduce4gpu/lib/libdimreduce4cpu.pdb"
+  "/root/package/dimreduce4gpu/lib/libdimreduce4cpu.so"
+  "CMakeFiles/dimreduce4cpu.dir/src/cpu_backend.cpp.o"
+  "CMakeFiles/dimreduce4cpu.dir/src/cpu_backend.cpp.o.d"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang CXX)
+  include(CMakeFiles/dimreduce4cpu.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -1,10 +1,48 @@
 from __future__ import annotations
 
-from ._backend import gpu_runnable, select_backend
-from .lib_dimreduce4cpu import cpu_built, require_cpu_built
-from .lib_dimreduce4gpu import params
-from .pca import PCA
-from .truncated_svd import TruncatedSVD
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._backend import gpu_runnable, refresh_backends, select_backend
+    from .lib_dimreduce4cpu import cpu_built, require_cpu_built
+    from .lib_dimreduce4gpu import params
+    from .model_selection import RankSelection, select_rank
+    from .pca import PCA
+    from .plan import SVDPlan
+    from .streaming import FrequentDirections, StreamingSVD
+    from .truncated_svd import TruncatedSVD
+
+# Public names are imported on first attribute access so that `import dimreduce4gpu` loads
+# neither numpy-heavy submodules nor any shared library.
+_LAZY_ATTRS = {
+    "FrequentDirections": ".streaming",
+    "PCA": ".pca",
+    "RankSelection": ".model_selection",
+    "SVDPlan": ".plan",
+    "StreamingSVD": ".streaming",
+    "TruncatedSVD": ".truncated_svd",
+    "cpu_built": ".lib_dimreduce4cpu",
+    "gpu_runnable": "._backend",
+    "params": ".lib_dimreduce4gpu",
+    "refresh_backends": "._backend",
+    "require_cpu_built": ".lib_dimreduce4cpu",
+    "select_backend": "._backend",
+    "select_rank": ".model_selection",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 def native_built() -> bool:
@@ -29,6 +67,8 @@ def native_built() -> bool:
 def native_runnable() -> bool:
     """Backward-compatible alias for GPU runnable status."""
 
+    from ._backend import gpu_runnable
+
     return gpu_runnable()
 
 
@@ -53,7 +93,11 @@ def require_native() -> None:
 
 
 __all__ = [
+    "FrequentDirections",
     "PCA",
+    "RankSelection",
+    "SVDPlan",
+    "StreamingSVD",
     "TruncatedSVD",
     "gpu_runnable",
     "native_built",
@@ -62,5 +106,7 @@ __all__ = [
     "cpu_built",
     "require_cpu_built",
     "select_backend",
+    "select_rank",
     "params",
+    "refresh_backends",
 ]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import ctypes
-from typing import Literal
+import os
+import threading
+from typing import Literal, Optional
 
-from .lib_dimreduce4cpu import cpu_built
-from .lib_dimreduce4gpu import _load_pca_lib, _load_tsvd_lib
+from .lib_dimreduce4cpu import cpu_built, reset_cpu_lib_cache
+from .lib_dimreduce4gpu import _load_pca_lib, _load_tsvd_lib, reset_gpu_lib_cache
 
 Backend = Literal["auto", "gpu", "cpu"]
 
@@ -32,8 +34,7 @@ def _cuda_device_count() -> int:
     return int(count.value)
 
 
-def gpu_runnable() -> bool:
-    """True if GPU native library can be loaded and a CUDA device is available."""
+def _probe_gpu() -> bool:
     try:
         _load_tsvd_lib()
         _load_pca_lib()
@@ -42,6 +43,57 @@ def gpu_runnable() -> bool:
     return _cuda_device_count() > 0
 
 
+class _BackendRegistry:
+    """Process-wide record of which native backends can run.
+
+    The GPU probe (dlopen of libdimreduce4gpu and libcuda, cuInit) runs once and the answer is
+    reused by every estimator. CUDA state does not survive fork(), so a forked child drops the
+    GPU answer and probes again on first use; the CPU library handle stays valid across fork.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gpu: Optional[bool] = None
+
+    def gpu_runnable(self) -> bool:
+        gpu = self._gpu
+        if gpu is None:
+            with self._lock:
+                if self._gpu is None:
+                    self._gpu = _probe_gpu()
+                gpu = self._gpu
+        return gpu
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._gpu = None
+            reset_gpu_lib_cache()
+            reset_cpu_lib_cache()
+
+    def _after_fork_in_child(self) -> None:
+        self._lock = threading.Lock()
+        self._gpu = None
+
+
+_registry = _BackendRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_registry._after_fork_in_child)
+
+
+def gpu_runnable() -> bool:
+    """True if GPU native library can be loaded and a CUDA device is available."""
+    return _registry.gpu_runnable()
+
+
+def refresh_backends() -> None:
+    """Re-probe the native backends on next use.
+
+    Backend availability and resolved native entry points are cached per process. Call this
+    after building a library, changing ``DIMREDUCE4GPU_CPU_LIB_PATH`` or attaching a GPU.
+    """
+    _registry.refresh()
+
+
 def select_backend(requested: Backend) -> Backend:
     if requested == "auto":
         if gpu_runnable():
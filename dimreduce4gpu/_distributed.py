@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import ctypes
+import mmap
+import os
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .lib_dimreduce4gpu import fit_info, params
+from .truncated_svd import _as_fptr, _as_ptr
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# A partition is described by a picklable spec so that process (or remote) workers can map the
+# rows themselves instead of receiving a copy:
+#   ("array", X_rows)                      in-process executors, passed by reference
+#   ("memmap", filename, offset, shape, lo, hi)
+#   ("shm", name, shape, lo, hi)           multiprocessing.shared_memory block
+
+
+def merge_column_stats(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Chan et al. pairwise merge of two ``[count, mean(m), m2(m)]`` statistics vectors."""
+    n_a, n_b = a[0], b[0]
+    if n_b == 0:
+        return a.copy()
+    if n_a == 0:
+        return b.copy()
+    m = (a.shape[0] - 1) // 2
+    n = n_a + n_b
+    delta = b[1 : 1 + m] - a[1 : 1 + m]
+    out = np.empty_like(a)
+    out[0] = n
+    out[1 : 1 + m] = a[1 : 1 + m] + delta * (n_b / n)
+    out[1 + m :] = a[1 + m :] + b[1 + m :] + delta**2 * (n_a * n_b / n)
+    return out
+
+
+@contextmanager
+def _mapped_rows(spec):
+    kind = spec[0]
+    if kind == "array":
+        yield spec[1]
+    elif kind == "memmap":
+        _, filename, offset, shape, lo, hi = spec
+        X = np.memmap(filename, dtype=np.float32, mode="r", offset=offset, shape=shape)
+        yield np.ascontiguousarray(X[lo:hi])
+    else:
+        from multiprocessing import shared_memory
+
+        _, name, shape, lo, hi = spec
+        # Pool workers share the creator's resource tracker, so attaching does not transfer
+        # ownership; the coordinator unlinks the block.
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            X = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            yield X[lo:hi]
+            del X
+        finally:
+            shm.close()
+
+
+def _params(n: int, m: int, k: int, info: Optional[fit_info] = None) -> params:
+    p = params()
+    p.set_shape(n, m)
+    p.k = k
+    if info is not None:
+        p.info = ctypes.pointer(info)
+    return p
+
+
+def _task_stats(spec) -> np.ndarray:
+    from .lib_dimreduce4cpu import _load_column_stats_cpu_lib
+
+    with _mapped_rows(spec) as X:
+        stats = np.zeros(2 * X.shape[1] + 1, dtype=np.float64)
+        _load_column_stats_cpu_lib()(
+            _as_fptr(X), _as_ptr(stats, ctypes.c_double), _params(X.shape[0], X.shape[1], 0)
+        )
+    return stats
+
+
+def _task_local(spec, Z: np.ndarray, mean: Optional[np.ndarray]):
+    from .lib_dimreduce4cpu import _load_tsqr_local_cpu_lib
+
+    width = Z.shape[0]
+    with _mapped_rows(spec) as X:
+        n, m = X.shape
+        Q = np.empty((width, n), dtype=np.float32)  # column-major n x l
+        R = np.empty((width, width), dtype=np.float32)
+        info = fit_info()
+        _load_tsqr_local_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(Z),
+            _as_fptr(mean) if mean is not None else None,
+            _as_fptr(Q),
+            _as_fptr(R),
+            _params(n, m, width, info),
+        )
+    if int(info.k) != width:
+        raise RuntimeError("TSQR local factorization failed.")
+    return Q, R
+
+
+def _task_apply(spec, Q: np.ndarray, Q_block: np.ndarray, mean: Optional[np.ndarray]):
+    from .lib_dimreduce4cpu import _load_tsqr_apply_cpu_lib
+
+    width = Q.shape[0]
+    with _mapped_rows(spec) as X:
+        n, m = X.shape
+        Z = np.empty((width, m), dtype=np.float32)  # column-major m x l
+        _load_tsqr_apply_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(Q),
+            _as_fptr(Q_block),
+            _as_fptr(mean) if mean is not None else None,
+            _as_fptr(Z),
+            _params(n, m, width),
+        )
+    return Q, Z
+
+
+@contextmanager
+def _partition_specs(X, n_parts: int, in_process: bool):
+    n = X.shape[0]
+    bounds = np.linspace(0, n, n_parts + 1).astype(int)
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+    if in_process:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        yield [("array", X[lo:hi]) for lo, hi in ranges]
+        return
+    if (
+        isinstance(X, np.memmap)
+        and isinstance(X.base, mmap.mmap)  # the mapping itself, not a view with a stale offset
+        and X.dtype == np.float32
+        and X.flags.c_contiguous
+    ):
+        yield [("memmap", X.filename, int(X.offset), X.shape, lo, hi) for lo, hi in ranges]
+        return
+
+    from multiprocessing import shared_memory
+
+    X = np.asarray(X)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, X.shape[0] * X.shape[1] * 4))
+    try:
+        buf = np.ndarray(X.shape, dtype=np.float32, buffer=shm.buf)
+        buf[...] = X
+        del buf
+        yield [("shm", shm.name, X.shape, lo, hi) for lo, hi in ranges]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def tsqr_fit(
+    X,
+    n_components: int,
+    n_iter: int,
+    random_state: int,
+    center: bool,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+):
+    """Row-partitioned randomized SVD whose QR steps are TSQR reductions across workers.
+
+    Each worker owns a block of rows X_i and computes its Y_i = X_i Z and local QR. The
+    coordinator only factors the stacked l x l R factors and sums the m x l products
+    X_i^T Q_i. Workers run on `executor`, or on a ProcessPoolExecutor with `n_jobs` processes.
+    Rows reach process workers through shared memory, or directly from the file for float32
+    np.memmap inputs. Returns (components, singular_values, U, explained_variance,
+    explained_variance_ratio, mean, info).
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    from .lib_dimreduce4cpu import _load_tsqr_combine_cpu_lib, _load_tsqr_finalize_cpu_lib
+
+    n, m = X.shape
+    width = min(n_components + 10, n, m)
+    k = min(n_components, width)
+    n_workers = n_jobs if n_jobs is not None else (os.cpu_count() or 1)
+    n_parts = max(1, min(n_workers if n_workers > 0 else (os.cpu_count() or 1), n // width))
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=n_parts)
+    try:
+        in_process = isinstance(executor, ThreadPoolExecutor)
+        with _partition_specs(X, n_parts, in_process) as specs:
+            stats = np.zeros(2 * m + 1, dtype=np.float64)
+            for part in executor.map(_task_stats, specs):
+                stats = merge_column_stats(stats, part)
+            mean = stats[1 : 1 + m].astype(np.float32) if center else None
+
+            rng = np.random.default_rng(random_state)
+            Z = rng.standard_normal((width, m)).astype(np.float32)  # column-major m x l
+            combine = _load_tsqr_combine_cpu_lib()
+            for _ in range(max(0, n_iter) + 1):
+                local = list(executor.map(_task_local, specs, [Z] * n_parts, [mean] * n_parts))
+                # Stack the R factors (column-major (P * l) x l) and factor them on the coordinator.
+                R_stack = np.ascontiguousarray(np.concatenate([R for _, R in local], axis=1))
+                R = np.empty((width, width), dtype=np.float32)
+                info = fit_info()
+                combine(
+                    _as_fptr(R_stack),
+                    _as_fptr(R),
+                    _params(n_parts * width, 0, width, info),
+                )
+                if int(info.k) != width:
+                    raise RuntimeError("TSQR reduction failed.")
+                blocks = [
+                    np.ascontiguousarray(R_stack[:, i * width : (i + 1) * width])
+                    for i in range(n_parts)
+                ]
+                applied = list(
+                    executor.map(
+                        _task_apply, specs, [Q for Q, _ in local], blocks, [mean] * n_parts
+                    )
+                )
+                Z = np.sum([Zi.astype(np.float64) for _, Zi in applied], axis=0).astype(np.float32)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    Q = np.zeros((k, m), dtype=np.float32)
+    w = np.zeros((k,), dtype=np.float32)
+    U_small = np.zeros((width, k), dtype=np.float32)
+    explained_variance = np.zeros((k,), dtype=np.float32)
+    explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+    info = fit_info()
+    _load_tsqr_finalize_cpu_lib()(
+        _as_fptr(Z),
+        _as_ptr(stats, ctypes.c_double),
+        _as_fptr(Q),
+        _as_fptr(w),
+        _as_fptr(U_small),
+        _as_fptr(explained_variance),
+        _as_fptr(explained_variance_ratio),
+        _params(width, m, k, info),
+    )
+    if int(info.k) != k:
+        raise RuntimeError("TSQR finalize failed.")
+
+    U = np.concatenate([Qi.T for Qi, _ in applied], axis=0) @ U_small
+    info.n_iter = max(0, n_iter)
+    info.n_matvecs = 2 * width * (max(0, n_iter) + 1)
+    mean_out = mean if center else None
+    return Q, w, U, explained_variance, explained_variance_ratio, mean_out, info
+
+
+# Rows per contiguous copy when a wide-mode worker computes the statistics of its columns.
+_WIDE_STATS_ROWS = 1024
+# Shapes with m >= _WIDE_MIN_ASPECT * n are split by columns when algorithm="auto" (matches the
+# native solver routing).
+_WIDE_MIN_ASPECT = 16
+
+
+def use_wide_partitions(algorithm: str, shape) -> bool:
+    n, m = shape
+    return algorithm == "wide" or (algorithm == "auto" and m >= _WIDE_MIN_ASPECT * n)
+
+
+def _task_wide_stats(spec, col_lo: int, col_hi: int) -> np.ndarray:
+    from .lib_dimreduce4cpu import _load_column_stats_cpu_lib
+
+    column_stats = _load_column_stats_cpu_lib()
+    stats = np.zeros(2 * (col_hi - col_lo) + 1, dtype=np.float64)
+    with _mapped_rows(spec) as X:
+        for lo in range(0, X.shape[0], _WIDE_STATS_ROWS):
+            block = np.ascontiguousarray(X[lo : lo + _WIDE_STATS_ROWS, col_lo:col_hi])
+            part = np.zeros_like(stats)
+            column_stats(
+                _as_fptr(block),
+                _as_ptr(part, ctypes.c_double),
+                _params(block.shape[0], block.shape[1], 0),
+            )
+            stats = merge_column_stats(stats, part)
+    return stats
+
+
+def _task_wide_sketch(
+    spec,
+    col_lo: int,
+    col_hi: int,
+    mean: Optional[np.ndarray],
+    Q: Optional[np.ndarray],
+    width: int,
+    random_state: int,
+    gram: bool,
+):
+    from .lib_dimreduce4cpu import _load_wide_sketch_block_cpu_lib
+
+    with _mapped_rows(spec) as X:
+        n, m = X.shape
+        Y = None if gram else np.zeros((width, n), dtype=np.float32)  # column-major n x l
+        G = np.zeros((width, width), dtype=np.float64) if gram else None
+        p = _params(n, m, width)
+        p.random_state = random_state
+        _load_wide_sketch_block_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(mean) if mean is not None else None,
+            _as_fptr(Q) if Q is not None else None,
+            col_lo,
+            col_hi,
+            _as_fptr(Y) if Y is not None else None,
+            _as_ptr(G, ctypes.c_double) if G is not None else None,
+            p,
+        )
+    return G if gram else Y
+
+
+def _task_wide_components(
+    spec,
+    col_lo: int,
+    col_hi: int,
+    mean: Optional[np.ndarray],
+    Q: np.ndarray,
+    W_scaled: np.ndarray,
+) -> np.ndarray:
+    from .lib_dimreduce4cpu import _load_wide_components_block_cpu_lib
+
+    width, k = W_scaled.shape[1], W_scaled.shape[0]
+    with _mapped_rows(spec) as X:
+        n, m = X.shape
+        C = np.empty((k, col_hi - col_lo), dtype=np.float32)
+        _load_wide_components_block_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(mean) if mean is not None else None,
+            _as_fptr(Q),
+            _as_fptr(W_scaled),
+            width,
+            col_lo,
+            col_hi,
+            _as_fptr(C),
+            _params(n, m, k),
+        )
+    return C
+
+
+def _orthonormalize(Y: np.ndarray) -> np.ndarray:
+    # Y is column-major n x l, i.e. a C-ordered l x n array; so is the returned basis.
+    return np.ascontiguousarray(np.linalg.qr(Y.T)[0].T, dtype=np.float32)
+
+
+def wide_fit(
+    X,
+    n_components: int,
+    n_iter: int,
+    random_state: int,
+    center: bool,
+    n_jobs: Optional[int] = None,
+    executor: Optional[Executor] = None,
+):
+    """Column-partitioned randomized SVD for matrices with far more columns than rows.
+
+    Each worker owns a range of columns X_J and returns its n x l contribution X_J Omega_J (first
+    pass) or X_J X_J^T Q (power iterations), so the coordinator only orthonormalizes an n x l
+    sketch. The Gaussian test matrix is generated inside the workers from the column index and
+    is never materialized. The Ritz step uses the summed l x l Gram matrix Q^T X X^T Q, and the
+    components are then assembled column block by column block. Returns the same tuple as
+    :func:`tsqr_fit`.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    from .lib_dimreduce4cpu import _load_wide_finalize_cpu_lib
+
+    n, m = X.shape
+    width = min(n_components + 10, n, m)
+    k = min(n_components, width)
+    n_workers = n_jobs if n_jobs is not None else (os.cpu_count() or 1)
+    n_parts = max(1, min(n_workers if n_workers > 0 else (os.cpu_count() or 1), m // width))
+    bounds = np.linspace(0, m, n_parts + 1).astype(int)
+    col_ranges = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    col_lo = [lo for lo, _ in col_ranges]
+    col_hi = [hi for _, hi in col_ranges]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=n_parts)
+    try:
+        in_process = isinstance(executor, ThreadPoolExecutor)
+        with _partition_specs(X, 1, in_process) as (spec,):
+            specs = [spec] * n_parts
+            stats = list(executor.map(_task_wide_stats, specs, col_lo, col_hi))
+            means = [
+                s[1 : 1 + (hi - lo)].astype(np.float32) for s, (lo, hi) in zip(stats, col_ranges)
+            ]
+            total_m2 = float(
+                sum(s[1 + (hi - lo) :].sum() for s, (lo, hi) in zip(stats, col_ranges))
+            )
+            block_means = means if center else [None] * n_parts
+
+            def _sketch(Q, gram: bool):
+                parts = executor.map(
+                    _task_wide_sketch,
+                    specs,
+                    col_lo,
+                    col_hi,
+                    block_means,
+                    [Q] * n_parts,
+                    [width] * n_parts,
+                    [random_state] * n_parts,
+                    [gram] * n_parts,
+                )
+                return np.sum([part.astype(np.float64) for part in parts], axis=0)
+
+            Q = _orthonormalize(_sketch(None, gram=False))
+            for _ in range(max(0, n_iter)):
+                Q = _orthonormalize(_sketch(Q, gram=False))
+            G = np.ascontiguousarray(_sketch(Q, gram=True))
+
+            w = np.zeros((k,), dtype=np.float32)
+            U = np.zeros((n, k), dtype=np.float32)
+            W_scaled = np.zeros((k, width), dtype=np.float32)  # column-major l x k
+            explained_variance = np.zeros((k,), dtype=np.float32)
+            explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+            info = fit_info()
+            _load_wide_finalize_cpu_lib()(
+                _as_fptr(Q),
+                _as_ptr(G, ctypes.c_double),
+                total_m2 / max(1.0, n - 1.0),
+                _as_fptr(w),
+                _as_fptr(U),
+                _as_fptr(W_scaled),
+                _as_fptr(explained_variance),
+                _as_fptr(explained_variance_ratio),
+                _params(n, width, k, info),
+            )
+            if int(info.k) != k:
+                raise RuntimeError("Wide finalize failed.")
+            blocks = executor.map(
+                _task_wide_components,
+                specs,
+                col_lo,
+                col_hi,
+                block_means,
+                [Q] * n_parts,
+                [W_scaled] * n_parts,
+            )
+            components = np.concatenate(list(blocks), axis=1)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    info.n_iter = max(0, n_iter)
+    info.n_matvecs = width * (2 * max(0, n_iter) + 3)
+    mean_out = np.concatenate(means) if center else None
+    return components, w, U, explained_variance, explained_variance_ratio, mean_out, info
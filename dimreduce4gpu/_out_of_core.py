@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import ctypes
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from .lib_dimreduce4gpu import fit_info, params
+from .truncated_svd import _as_fptr, _as_ptr
+
+# Target size of one streamed row chunk when the caller does not pick chunk_size.
+_DEFAULT_CHUNK_BYTES = 64 << 20
+
+
+def is_out_of_core_source(X, chunk_size: Optional[int] = None) -> bool:
+    """True for inputs that fit() streams instead of loading: paths and chunk iterables.
+
+    An ``np.memmap`` is an ndarray the in-memory solvers read in place, so it is streamed only
+    when the caller asks for it with ``chunk_size``.
+    """
+    import scipy.sparse
+
+    if isinstance(X, (str, os.PathLike)):
+        return True
+    if isinstance(X, np.memmap):
+        return chunk_size is not None
+    if isinstance(X, np.ndarray) or scipy.sparse.issparse(X):
+        return False
+    return callable(X) or (hasattr(X, "__iter__") and not hasattr(X, "shape"))
+
+
+def _chunk_source(X, chunk_size: Optional[int]) -> Callable[[], Iterator]:
+    """Return a factory that yields the row chunks of X afresh for every pass."""
+    if isinstance(X, (str, os.PathLike)):
+        X = np.load(os.fspath(X), mmap_mode="r")
+    if isinstance(X, np.ndarray):
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got shape {X.shape}.")
+        rows = chunk_size or max(1, _DEFAULT_CHUNK_BYTES // max(1, 4 * X.shape[1]))
+        return lambda: (X[i : i + rows] for i in range(0, X.shape[0], rows))
+    if callable(X):
+        return X
+    if iter(X) is X:
+        raise ValueError(
+            "Out-of-core fitting reads the data several times; pass a re-iterable (e.g. a list) "
+            "or a callable returning a fresh iterator of row chunks. Use StreamingSVD for data "
+            "that can only be read once."
+        )
+    return lambda: iter(X)
+
+
+def streamed_transform(transform: Callable, X, chunk_size: Optional[int]) -> np.ndarray:
+    """Apply ``transform`` to every row chunk of an out-of-core X and stack the results."""
+    return np.concatenate([transform(chunk) for chunk in _chunk_source(X, chunk_size)()], axis=0)
+
+
+def _as_chunk(chunk) -> np.ndarray:
+    import scipy.sparse
+
+    if scipy.sparse.issparse(chunk):
+        chunk = chunk.toarray()
+    chunk = np.ascontiguousarray(chunk, dtype=np.float32)
+    if chunk.ndim != 2:
+        raise ValueError(f"Row chunks must be 2D, got shape {chunk.shape}.")
+    return chunk
+
+
+def _next_chunk(it: Iterator) -> Optional[np.ndarray]:
+    chunk = next(it, None)
+    return None if chunk is None else _as_chunk(chunk)
+
+
+def _prefetched(chunks: Iterable) -> Iterator[np.ndarray]:
+    """Yield contiguous float32 chunks while the next one is read on a background thread.
+
+    The native calls release the GIL, so reading (e.g. paging in a memmap slice) overlaps
+    with the GEMMs on the current chunk.
+    """
+    it = iter(chunks)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(_next_chunk, it)
+        while True:
+            chunk = pending.result()
+            if chunk is None:
+                return
+            pending = pool.submit(_next_chunk, it)
+            yield chunk
+
+
+def streamed_fit(
+    X,
+    n_components: int,
+    n_iter: int,
+    random_state: int,
+    center: bool,
+    chunk_size: Optional[int] = None,
+):
+    """Randomized SVD over row chunks with memory bounded by one chunk plus O(m * l).
+
+    The first pass sketches the row space with Z = X^T X Omega, each of the n_iter power passes
+    refines it, and the last pass projects onto it (Rayleigh-Ritz). The data is read
+    n_iter + 2 times. Chunks are multiplied relative to the first chunk's mean, and the native
+    code corrects the sums in double, so large column offsets do not cost float32 precision. Returns (components, singular_values, explained_variance,
+    explained_variance_ratio, mean, info); mean is None unless `center`.
+    """
+    from .lib_dimreduce4cpu import (
+        _load_streamed_accumulate_cpu_lib,
+        _load_streamed_finalize_cpu_lib,
+        _load_streamed_range_cpu_lib,
+    )
+
+    source = _chunk_source(X, chunk_size)
+    accumulate = _load_streamed_accumulate_cpu_lib()
+    range_update = _load_streamed_range_cpu_lib()
+    finalize = _load_streamed_finalize_cpu_lib()
+
+    info = fit_info()
+    stats: Optional[np.ndarray] = None
+    V: Optional[np.ndarray] = None
+    shift: Optional[np.ndarray] = None
+    m = width = 0  # width is the sketch size l
+    n_passes = max(0, n_iter) + 2
+    for pass_idx in range(n_passes):
+        Z: Optional[np.ndarray] = None
+        G: Optional[np.ndarray] = None
+        for chunk in _prefetched(source()):
+            if V is None:
+                m = chunk.shape[1]
+                width = min(n_components + 10, m)
+                rng = np.random.default_rng(random_state)
+                # (l, m) in C order is the column-major m x l basis the native code expects.
+                V = rng.standard_normal((width, m)).astype(np.float32)
+                stats = np.zeros(2 * m + 1, dtype=np.float64)
+                shift = chunk.mean(axis=0, dtype=np.float64).astype(np.float32)
+            if chunk.shape[1] != m:
+                raise ValueError(f"Row chunk has {chunk.shape[1]} features, expected {m}.")
+            if Z is None:
+                Z = np.zeros((width, m), dtype=np.float64)
+                G = np.zeros((width, width), dtype=np.float64)
+            p = _streamed_params(chunk.shape[0], m, width, random_state, info)
+            accumulate(
+                _as_fptr(chunk),
+                _as_fptr(shift),
+                _as_fptr(V),
+                _as_ptr(Z, ctypes.c_double),
+                _as_ptr(G, ctypes.c_double),
+                _as_ptr(stats, ctypes.c_double) if pass_idx == 0 else None,
+                p,
+            )
+        if Z is None:
+            raise ValueError("The out-of-core input produced no rows.")
+
+        if pass_idx + 1 < n_passes:
+            V_next = np.empty_like(V)
+            p = _streamed_params(0, m, width, random_state, info)
+            range_update(
+                _as_ptr(Z, ctypes.c_double),
+                _as_fptr(V),
+                _as_ptr(stats, ctypes.c_double),
+                _as_fptr(shift),
+                1 if center else 0,
+                _as_fptr(V_next),
+                p,
+            )
+            if int(info.k) != width:
+                raise RuntimeError("Out-of-core CPU solver failed to orthonormalize its basis.")
+            V = V_next
+
+    n = int(stats[0])
+    k = min(n_components, m, n)
+    Q = np.zeros((k, m), dtype=np.float32)
+    w = np.zeros((k,), dtype=np.float32)
+    explained_variance = np.zeros((k,), dtype=np.float32)
+    explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+    mean = np.zeros((m,), dtype=np.float32) if center else None
+
+    info.k = 0
+    p = _streamed_params(width, m, k, random_state, info)
+    finalize(
+        _as_ptr(G, ctypes.c_double),
+        _as_fptr(V),
+        _as_ptr(stats, ctypes.c_double),
+        _as_fptr(shift),
+        1 if center else 0,
+        _as_fptr(Q),
+        _as_fptr(w),
+        _as_fptr(explained_variance),
+        _as_fptr(explained_variance_ratio),
+        _as_fptr(mean) if mean is not None else None,
+        p,
+    )
+    if int(info.k) != k:
+        raise RuntimeError("Out-of-core CPU solver failed.")
+    info.n_iter = max(0, n_iter)
+    return Q, w, explained_variance, explained_variance_ratio, mean, info
+
+
+def _streamed_params(n: int, m: int, k: int, random_state: int, info: fit_info) -> params:
+    p = params()
+    p.set_shape(n, m)
+    p.k = k
+    p.algorithm = b"power"
+    p.random_state = random_state
+    p.info = ctypes.pointer(info)
+    return p
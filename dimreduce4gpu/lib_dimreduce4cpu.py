@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import ctypes
+import functools
 import os
 import sys
+import threading
+from typing import Optional
 
 from .lib_dimreduce4gpu import params
 
@@ -27,41 +30,89 @@ def _candidate_paths() -> list[str]:
     return out
 
 
+# Process-wide cache of the probe result: (path, CDLL handle, load error). The handle and the
+# function pointers resolved from it stay valid in forked children, so only the lock is
+# recreated after fork. `reset_cpu_lib_cache` forces a re-probe (e.g. after changing
+# DIMREDUCE4GPU_CPU_LIB_PATH).
+_probe: Optional[tuple[Optional[str], Optional[ctypes.CDLL], Optional[str]]] = None
+_probe_lock = threading.Lock()
+_loaders: list = []
+
+
+def _cached_loader(fn):
+    """Resolve a symbol and set its argtypes once per process."""
+    cached = functools.cache(fn)
+    _loaders.append(cached)
+    return cached
+
+
+def _probe_cpu_lib() -> tuple[Optional[str], Optional[ctypes.CDLL], Optional[str]]:
+    global _probe
+    probe = _probe
+    if probe is not None:
+        return probe
+    with _probe_lock:
+        if _probe is None:
+            result: tuple[Optional[str], Optional[ctypes.CDLL], Optional[str]] = (None, None, None)
+            for p in _candidate_paths():
+                if os.path.isfile(p):
+                    try:
+                        result = (p, ctypes.CDLL(p), None)
+                    except OSError as e:
+                        result = (p, None, str(e))
+                    break
+            _probe = result
+        return _probe
+
+
+def reset_cpu_lib_cache() -> None:
+    """Forget the probed library and every cached function pointer."""
+    global _probe
+    with _probe_lock:
+        _probe = None
+        for loader in _loaders:
+            loader.cache_clear()
+
+
+def _reinit_lock_after_fork() -> None:
+    global _probe_lock
+    _probe_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_lock_after_fork)
+
+
 def cpu_built() -> bool:
-    for p in _candidate_paths():
-        if os.path.isfile(p):
-            try:
-                ctypes.CDLL(p)
-                return True
-            except OSError:
-                return False
-    return False
+    return _probe_cpu_lib()[1] is not None
 
 
 def require_cpu_built() -> str:
-    paths = _candidate_paths()
-    for p in paths:
-        if os.path.isfile(p):
-            try:
-                ctypes.CDLL(p)
-                return p
-            except OSError as e:
-                raise RuntimeError(
-                    f"CPU native library was found but could not be loaded. Path={p}. Error={e}"
-                ) from e
-    raise RuntimeError(
-        "CPU native library (libdimreduce4cpu.so) not found. "
-        "Build it with:\n"
-        "  cmake -S . -B build -DDIMREDUCE4GPU_BUILD_CPU=ON -DDIMREDUCE4GPU_BUILD_CUDA=OFF\n"
-        "  cmake --build build -j\n"
-        "Or set DIMREDUCE4GPU_CPU_LIB_PATH to the full path of libdimreduce4cpu.so.\n"
-        f"Searched: {paths}"
-    )
+    path, _handle, error = _probe_cpu_lib()
+    if path is not None and error is not None:
+        raise RuntimeError(
+            f"CPU native library was found but could not be loaded. Path={path}. Error={error}"
+        )
+    if path is None:
+        raise RuntimeError(
+            "CPU native library (libdimreduce4cpu.so) not found. "
+            "Build it with:\n"
+            "  cmake -S . -B build -DDIMREDUCE4GPU_BUILD_CPU=ON -DDIMREDUCE4GPU_BUILD_CUDA=OFF\n"
+            "  cmake --build build -j\n"
+            "Or set DIMREDUCE4GPU_CPU_LIB_PATH to the full path of libdimreduce4cpu.so.\n"
+            f"Searched: {_candidate_paths()}"
+        )
+    return path
+
 
+def _cpu_lib() -> ctypes.CDLL:
+    require_cpu_built()
+    return _probe_cpu_lib()[1]
 
+
+@_cached_loader
 def _load_tsvd_cpu_lib():
-    lib_path = require_cpu_built()
-    mod = ctypes.cdll.LoadLibrary(lib_path)
+    mod = _cpu_lib()
     fn = mod.truncated_svd_float
     fn.argtypes = [
         ctypes.POINTER(ctypes.c_float),
@@ -76,9 +127,9 @@ def _load_tsvd_cpu_lib():
     return fn
 
 
+@_cached_loader
 def _load_pca_cpu_lib():
-    lib_path = require_cpu_built()
-    mod = ctypes.cdll.LoadLibrary(lib_path)
+    mod = _cpu_lib()
     fn = mod.pca_float
     fn.argtypes = [
         ctypes.POINTER(ctypes.c_float),
@@ -92,3 +143,704 @@ def _load_pca_cpu_lib():
         params,
     ]
     return fn
+
+
+@_cached_loader
+def _load_tsvd_strided_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.truncated_svd_strided_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_pca_strided_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.pca_strided_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsvd_strided_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.truncated_svd_strided_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_pca_strided_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.pca_strided_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsvd_inplace_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.truncated_svd_inplace_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_pca_inplace_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.pca_inplace_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsvd_inplace_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.truncated_svd_inplace_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_pca_inplace_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.pca_inplace_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_transform_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.transform_strided_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_transform_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.transform_strided_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_reconstruction_error_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.reconstruction_error_strided_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_reconstruction_error_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.reconstruction_error_strided_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_inverse_transform_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.inverse_transform_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_inverse_transform_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.inverse_transform_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsvd_sparse_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.truncated_svd_sparse_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_pca_sparse_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.pca_sparse_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_svd_strided_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    fn.restype = ctypes.c_void_p
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_svd_strided_double
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    fn.restype = ctypes.c_void_p
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_sparse_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_svd_sparse_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_int64),
+        ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    fn.restype = ctypes.c_void_p
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_result_copy_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_result_copy_float
+    fn.argtypes = [
+        ctypes.c_void_p,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_result_copy_double_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_result_copy_double
+    fn.argtypes = [
+        ctypes.c_void_p,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_adaptive_result_destroy_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.adaptive_result_destroy
+    fn.argtypes = [ctypes.c_void_p]
+    fn.restype = None
+    return fn
+
+
+@_cached_loader
+def _load_incremental_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.incremental_svd_update_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int64,
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_streamed_accumulate_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.streamed_gram_accumulate_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_streamed_range_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.streamed_range_update_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_streamed_finalize_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.streamed_svd_finalize_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_sketch_update_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.sketch_update_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_sketch_finalize_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.sketch_finalize_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_int32,
+        ctypes.c_int32,
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_fd_update_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.frequent_directions_update_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_int32),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_fd_finalize_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.frequent_directions_finalize_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_column_stats_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.column_stats_float
+    fn.argtypes = [ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_double), params]
+    return fn
+
+
+@_cached_loader
+def _load_tsqr_local_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.tsqr_local_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsqr_combine_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.tsqr_combine_float
+    fn.argtypes = [ctypes.POINTER(ctypes.c_float), ctypes.POINTER(ctypes.c_float), params]
+    return fn
+
+
+@_cached_loader
+def _load_tsqr_apply_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.tsqr_apply_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_tsqr_finalize_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.tsqr_finalize_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_wide_sketch_block_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.wide_sketch_block_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int64,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_wide_finalize_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.wide_finalize_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_double),
+        ctypes.c_double,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_wide_components_block_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.wide_components_block_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int64,
+        ctypes.c_int64,
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_svd_plan_create_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.svd_plan_create
+    fn.argtypes = [params]
+    fn.restype = ctypes.c_void_p
+    return fn
+
+
+@_cached_loader
+def _load_svd_plan_destroy_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.svd_plan_destroy
+    fn.argtypes = [ctypes.c_void_p]
+    fn.restype = None
+    return fn
+
+
+@_cached_loader
+def _load_svd_plan_execute_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.svd_plan_execute_float
+    fn.argtypes = [
+        ctypes.c_void_p,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        params,
+    ]
+    return fn
+
+
+@_cached_loader
+def _load_fit_many_cpu_lib():
+    mod = _cpu_lib()
+    fn = mod.fit_many_float
+    fn.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_int32),
+        params,
+    ]
+    return fn
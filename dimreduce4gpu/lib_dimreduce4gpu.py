@@ -1,8 +1,24 @@
 import ctypes
+import functools
 import os
 import sys
 
 
+class fit_info(ctypes.Structure):
+    """Solver diagnostics written by the CPU backend (see include/cpu_backend.h)."""
+
+    _fields_ = [
+        ("n_iter", ctypes.c_int32),
+        ("n_matvecs", ctypes.c_int64),
+        ("k", ctypes.c_int32),
+    ]
+
+
+# X_n, X_m and k are C ints: each dimension must fit in 32 bits, while the element count of X
+# (X_n * X_m) may exceed 2**31 on the CPU backend, which indexes with 64-bit offsets.
+_INT32_MAX = 2**31 - 1
+
+
 class params(ctypes.Structure):
     _fields_ = [
         ("X_n", ctypes.c_int),
@@ -15,9 +31,23 @@ class params(ctypes.Structure):
         ("verbose", ctypes.c_int),
         ("gpu_id", ctypes.c_int),
         ("whiten", ctypes.c_bool),
+        ("info", ctypes.POINTER(fit_info)),
+        ("init", ctypes.c_void_p),
+        ("init_k", ctypes.c_int),
     ]
 
+    def set_shape(self, n: int, m: int) -> None:
+        """Set X_n/X_m, rejecting dimensions that the 32-bit fields would silently wrap."""
+        if not (0 <= n <= _INT32_MAX and 0 <= m <= _INT32_MAX):
+            raise ValueError(
+                f"X has shape ({n}, {m}); each dimension must be at most {_INT32_MAX} "
+                "(the element count itself may exceed 2**31)."
+            )
+        self.X_n = n
+        self.X_m = m
+
 
+@functools.cache
 def _load_tsvd_lib():
     curr_path = os.path.dirname(os.path.abspath(os.path.expanduser(__file__)))
     dll_path = [
@@ -61,6 +91,7 @@ def _load_tsvd_lib():
     return _tsvd_code
 
 
+@functools.cache
 def _load_pca_lib():
     curr_path = os.path.dirname(os.path.abspath(os.path.expanduser(__file__)))
     dll_path = [
@@ -103,3 +134,9 @@ def _load_pca_lib():
     ]
 
     return _pca_code
+
+
+def reset_gpu_lib_cache() -> None:
+    """Forget the cached CUDA entry points so the next load searches the library again."""
+    _load_tsvd_lib.cache_clear()
+    _load_pca_lib.cache_clear()
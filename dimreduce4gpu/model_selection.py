@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import copy
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .pca import PCA
+from .truncated_svd import TruncatedSVD
+
+_CRITERIA = ("explained_variance", "reconstruction", "mle")
+
+
+class RankSelection(NamedTuple):
+    """Result of ``select_rank``; ``scores`` is aligned with the sorted ``candidates``."""
+
+    rank: int
+    candidates: np.ndarray  # sorted, unique
+    scores: np.ndarray
+    model: TruncatedSVD  # fitted at max(candidates); model.truncate(rank) is the selection
+
+
+def _assess_dimension(ev: np.ndarray, total: float, rank: int, n: int, m: int) -> float:
+    """Minka's log-evidence of a rank-``rank`` PCA model, as scikit-learn's ``_assess_dimension``.
+
+    ``ev`` holds only the fitted eigenvalues. The variances of the unfitted directions enter
+    through their sum (``total - sum(ev)``) and, in the pairwise term, through their mean, which is
+    exact when all ``m`` components were fitted.
+    """
+    from scipy.special import gammaln
+
+    eps = 1e-15
+    if ev[rank - 1] < eps:
+        return -np.inf
+    i = np.arange(1, rank + 1)
+    pu = -rank * np.log(2.0) + np.sum(
+        gammaln((m - i + 1) / 2.0) - np.log(np.pi) * (m - i + 1) / 2.0
+    )
+    pl = -np.sum(np.log(ev[:rank])) * n / 2.0
+    v = max(eps, (total - ev[:rank].sum()) / (m - rank))
+    pv = -np.log(v) * n * (m - rank) / 2.0
+    dof = m * rank - rank * (rank + 1.0) / 2.0
+    pp = np.log(2.0 * np.pi) * (dof + rank) / 2.0
+
+    K = ev.size
+    lam_ = np.concatenate([ev[:rank], np.full(K - rank, v)])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.log(
+            (ev[:rank, None] - ev[None, :]) * (1.0 / lam_[None, :] - 1.0 / lam_[:rank, None])
+        )
+        pa = np.sum(np.triu(terms, 1)[:, :K]) + np.log(n) * np.sum(K - i)
+        if K < m:
+            v_tail = max(eps, (total - ev.sum()) / (m - K))
+            tail = np.log((ev[:rank] - v_tail) * (1.0 / v - 1.0 / ev[:rank]))
+            pa += (m - K) * (np.sum(tail) + rank * np.log(n))
+    ll = pu + pl + pv + pp - pa / 2.0 - rank * np.log(n) / 2.0
+    return float(ll) if np.isfinite(ll) else -np.inf
+
+
+def select_rank(
+    X,
+    candidates,
+    criterion: str = "mle",
+    *,
+    estimator: Optional[TruncatedSVD] = None,
+    threshold: float = 0.95,
+    holdout: float = 0.2,
+    random_state: Optional[int] = None,
+) -> RankSelection:
+    """Score every candidate rank from one fit at the largest and pick one.
+
+    ``estimator`` (default ``PCA()``) is copied and fitted once with
+    ``n_components=max(candidates)``; the candidates are then its truncations. Criteria:
+
+    - ``"explained_variance"``: score is the cumulative ``explained_variance_ratio_``; picks the
+      smallest rank whose score exceeds ``threshold``.
+    - ``"reconstruction"``: fits on all but a random ``holdout`` fraction of the rows; score is
+      the mean squared reconstruction error of the held-out rows. Picks the smallest rank whose
+      error is at most ``1 - threshold`` of the held-out energy.
+    - ``"mle"`` (``PCA`` only): Minka's Bayesian evidence, as ``PCA(n_components="mle")`` in
+      scikit-learn; picks the best-scoring rank. Candidates must be below ``n_features``.
+
+    When no rank reaches ``threshold``, the largest candidate is picked.
+    """
+    if criterion not in _CRITERIA:
+        raise ValueError(f"criterion must be one of {_CRITERIA}, got {criterion!r}.")
+    ranks = np.unique(np.asarray(candidates, dtype=np.int64).ravel())
+    if ranks.size == 0 or ranks[0] < 1:
+        raise ValueError("candidates must be a non-empty sequence of positive ranks.")
+    model = copy.copy(estimator) if estimator is not None else PCA()
+    if criterion == "mle" and not isinstance(model, PCA):
+        raise ValueError("criterion='mle' requires a PCA estimator.")
+    model.n_components = int(ranks[-1])
+    n, m = X.shape
+
+    if criterion == "reconstruction":
+        if not 0.0 < holdout < 1.0:
+            raise ValueError(f"holdout must be in (0, 1), got {holdout}.")
+        n_test = int(round(holdout * n))
+        if not 0 < n_test < n:
+            raise ValueError(f"holdout={holdout} leaves no rows to fit or to score.")
+        perm = np.random.default_rng(random_state).permutation(n)
+        X_test = X[np.sort(perm[:n_test])]
+        model.fit(X[np.sort(perm[n_test:])])
+    else:
+        model.fit(X)
+    K = model.n_components_
+    if ranks[-1] > K:
+        raise ValueError(f"candidates exceed the {K} components X supports.")
+
+    if criterion == "explained_variance":
+        scores = np.cumsum(model.explained_variance_ratio_, dtype=np.float64)[ranks - 1]
+        reached = np.flatnonzero(scores > threshold)
+    elif criterion == "reconstruction":
+        # err_k = err_K + sum_{c >= k} z_c^2: one transform and one residual pass for all ranks.
+        Z = np.asarray(model.transform(X_test), dtype=np.float64)
+        scale = model._score_scale()
+        if scale is not None:
+            Z /= np.where(scale > 0, scale, 1.0)
+        tail = np.cumsum((Z * Z)[:, ::-1], axis=1)[:, ::-1].mean(axis=0)
+        err_K = float(np.mean(model.reconstruction_error(X_test), dtype=np.float64))
+        scores = err_K + np.append(tail, 0.0)[ranks]
+        reached = np.flatnonzero(scores <= (1.0 - threshold) * (err_K + tail[0]))
+    else:
+        if ranks[-1] >= min(n, m):
+            raise ValueError("criterion='mle' needs candidates below min(n_samples, n_features).")
+        ev = np.asarray(model.explained_variance_, dtype=np.float64)
+        total = ev.sum() / float(np.sum(model.explained_variance_ratio_, dtype=np.float64))
+        # scikit-learn counts min(n_samples, n_features) directions, the length of its spectrum.
+        d = min(n, m)
+        scores = np.array([_assess_dimension(ev, total, int(r), n, d) for r in ranks])
+        reached = np.array([int(np.argmax(scores))])
+
+    index = int(reached[0]) if reached.size else ranks.size - 1
+    return RankSelection(int(ranks[index]), ranks, scores, model)
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from typing import Literal, Optional
+from typing import Literal, Optional, Union
 
 import numpy as np
 
-from ._backend import select_backend
-from .lib_dimreduce4cpu import _load_pca_cpu_lib
-from .lib_dimreduce4gpu import _load_pca_lib, params
-from .truncated_svd import TruncatedSVD, _as_fptr
+from .lib_dimreduce4gpu import fit_info, params
+from .truncated_svd import TruncatedSVD
 
 Backend = Literal["auto", "gpu", "cpu"]
 
@@ -15,9 +13,11 @@ Backend = Literal["auto", "gpu", "cpu"]
 class PCA(TruncatedSVD):
     """PCA implemented via SVD with native GPU or CPU backend."""
 
+    _centered = True
+
     def __init__(
         self,
-        n_components: int = 2,
+        n_components: Union[int, float] = 2,
         algorithm: str = "cusolver",
         n_iter: int = 5,
         random_state: Optional[int] = None,
@@ -26,6 +26,10 @@ class PCA(TruncatedSVD):
         gpu_id: int = 0,
         whiten: bool = False,
         backend: Backend = "auto",
+        plan=None,
+        dtype=None,
+        copy: bool = True,
+        warm_start: bool = False,
     ) -> None:
         super().__init__(
             n_components=n_components,
@@ -36,59 +40,71 @@ class PCA(TruncatedSVD):
             verbose=verbose,
             gpu_id=gpu_id,
             backend=backend,
+            plan=plan,
+            dtype=dtype,
+            copy=copy,
+            warm_start=warm_start,
         )
         self.whiten = bool(whiten)
         self.mean_: Optional[np.ndarray] = None
 
-    def fit_transform(self, X: np.ndarray) -> np.ndarray:
-        import scipy
-
-        if isinstance(X, scipy.sparse.csr_matrix):
-            X = X.toarray()
-
-        X = np.ascontiguousarray(X, dtype=np.float32)
-        n, m = X.shape
-        k = min(self.n_components, n, m)
-
-        Q = np.zeros((k, m), dtype=np.float32)
-        w = np.zeros((k,), dtype=np.float32)
-        U = np.zeros((n, k), dtype=np.float32)
-        X_transformed = np.zeros((n, k), dtype=np.float32)
-        explained_variance = np.zeros((k,), dtype=np.float32)
-        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
-        mean = np.zeros((m,), dtype=np.float32)
-
-        p = params()
-        p.X_n = n
-        p.X_m = m
-        p.k = k
-        p.algorithm = self.algorithm.encode("utf-8")
-        p.n_iter = self.n_iter
-        p.random_state = self.random_state
-        p.tol = float(self.tol)
-        p.verbose = 1 if self.verbose else 0
-        p.gpu_id = self.gpu_id
-        p.whiten = bool(self.whiten)
-
-        backend = select_backend(self.backend)
-        fn = _load_pca_cpu_lib() if backend == "cpu" else _load_pca_lib()
-
-        fn(
-            _as_fptr(X),
-            _as_fptr(Q),
-            _as_fptr(w),
-            _as_fptr(U),
-            _as_fptr(X_transformed),
-            _as_fptr(explained_variance),
-            _as_fptr(explained_variance_ratio),
-            _as_fptr(mean),
-            p,
-        )
+    def _build_params(self, n: int, m: int, k: int, info: Optional[fit_info] = None) -> params:
+        p = super()._build_params(n, m, k, info)
+        p.whiten = self.whiten
+        return p
+
+    def _score_mean(self) -> Optional[np.ndarray]:
+        return self.mean_
+
+    def _score_scale(self) -> Optional[np.ndarray]:
+        """1 / sqrt(explained_variance_) when whitening; zero-variance components score 0."""
+        if not self.whiten:
+            return None
+        ev = np.asarray(self.explained_variance_)
+        with np.errstate(divide="ignore"):
+            return np.where(ev > 0, 1.0 / np.sqrt(ev), 0.0).astype(ev.dtype)
+
+    @property
+    def noise_variance_(self) -> float:
+        """Average variance of the directions left out of the model.
+
+        ``(total variance - sum(explained_variance_)) / (n_features - n_components_)``; zero when
+        every direction is kept.
+        """
+        ev = np.asarray(self.explained_variance_, dtype=np.float64)
+        ratio = float(np.sum(self.explained_variance_ratio_, dtype=np.float64))
+        k, m = self.components_.shape
+        if k >= m or ratio <= 0.0:
+            return 0.0
+        return max(float(ev.sum()) / ratio - float(ev.sum()), 0.0) / (m - k)
+
+    def score_samples(self, X) -> np.ndarray:
+        """Log-likelihood of each row of X under the probabilistic PCA model.
+
+        The model covariance is ``V^T diag(explained_variance_) V`` plus ``noise_variance_`` on
+        the discarded directions, as in scikit-learn. Its Mahalanobis term splits into
+        ``sum_c z_c^2 / explained_variance_c`` plus the reconstruction error over
+        ``noise_variance_``, so both come from the one blocked pass of ``reconstruction_error``.
+        Variances below ``eps`` times the largest one (a rank-deficient fit) are clamped to that
+        floor, so such fits score finitely instead of dividing by zero.
+        """
+        ev = np.asarray(self.explained_variance_, dtype=np.float64)
+        k, m = self.components_.shape
+        noise = self.noise_variance_ if k < m else 0.0
+        info = np.finfo(np.float64)
+        floor = max(info.eps * max(float(ev.max(initial=0.0)), noise), info.tiny)
+        ev = np.maximum(ev, floor)
+        err, weighted = self._row_residuals(X, 1.0 / ev)
+        quad = weighted.astype(np.float64)
+        logdet = float(np.sum(np.log(ev)))
+        if k < m:
+            noise = max(noise, floor)
+            quad += err.astype(np.float64) / noise
+            logdet += (m - k) * np.log(noise)
+        return -0.5 * (quad + m * np.log(2.0 * np.pi) + logdet)
 
-        self._Q = Q
-        self._w = w
-        self._U = U
-        self.explained_variance_ = explained_variance
-        self.explained_variance_ratio_ = explained_variance_ratio
-        self.mean_ = mean
-        return X_transformed
+    def partial_fit(self, X: np.ndarray, y=None):
+        """Update the fit with one batch of rows (CPU backend), tracking a running mean."""
+        self._partial_fit(X, center=True)
+        self.mean_ = self._running_mean
+        return self
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import ctypes
+from typing import Optional
+
+import numpy as np
+
+from .lib_dimreduce4cpu import (
+    _load_svd_plan_create_cpu_lib,
+    _load_svd_plan_destroy_cpu_lib,
+    _load_svd_plan_execute_cpu_lib,
+)
+from .lib_dimreduce4gpu import fit_info, params
+from .truncated_svd import _as_fptr
+
+
+class SVDPlan:
+    """Reusable CPU solver plan for repeated fits of same-shaped ``(n, m)`` float32 inputs.
+
+    Like an FFTW plan, it is created once per shape and then passed to estimators as
+    ``PCA(plan=...)`` / ``TruncatedSVD(plan=...)``. The plan picks the solver for ``algorithm``
+    up front and owns the native workspaces (with cached LAPACK workspace sizes) together with
+    the output arrays. Fits after the first therefore do no workspace queries and no heap
+    allocation.
+
+    The fitted attributes and the array returned by ``fit_transform`` are the plan's own
+    buffers, so the next fit through the same plan overwrites them. Copy them to keep a result.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        k: int,
+        algorithm: str = "auto",
+        dtype=np.float32,
+    ) -> None:
+        if np.dtype(dtype) != np.float32:
+            raise ValueError(f"SVDPlan supports float32 inputs only, got dtype={dtype!r}.")
+        self.n = int(n)
+        self.m = int(m)
+        self.n_components = min(int(k), self.n, self.m)
+        self.algorithm = str(algorithm)
+        self.dtype = np.dtype(np.float32)
+        if self.n <= 0 or self.m <= 0 or self.n_components <= 0:
+            raise ValueError(f"Invalid plan shape n={n}, m={m}, k={k}.")
+
+        self._info = fit_info()
+        self._params = params()
+        self._params.set_shape(self.n, self.m)
+        self._params.k = self.n_components
+        self._algorithm = self.algorithm.encode("utf-8")
+        self._params.algorithm = self._algorithm
+        self._params.info = ctypes.pointer(self._info)
+
+        self._destroy = _load_svd_plan_destroy_cpu_lib()
+        self._execute = _load_svd_plan_execute_cpu_lib()
+        self._handle: Optional[int] = _load_svd_plan_create_cpu_lib()(self._params)
+        if not self._handle:
+            raise ValueError(f"algorithm={self.algorithm!r} cannot be run through an SVDPlan.")
+
+        k = self.n_components
+        self.components = np.zeros((k, self.m), dtype=np.float32)
+        self.singular_values = np.zeros((k,), dtype=np.float32)
+        self.U = np.zeros((self.n, k), dtype=np.float32)
+        self.X_transformed = np.zeros((self.n, k), dtype=np.float32)
+        self.explained_variance = np.zeros((k,), dtype=np.float32)
+        self.explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+        self.mean = np.zeros((self.m,), dtype=np.float32)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.n, self.m
+
+    def execute(
+        self, X: np.ndarray, *, center: bool, n_iter: int, random_state: int, tol: float
+    ) -> fit_info:
+        """Fit X into the plan's output arrays and return the solver diagnostics."""
+        if self._handle is None:
+            raise ValueError("This SVDPlan has been closed.")
+        if X.shape != self.shape or X.dtype != np.float32 or not X.flags.c_contiguous:
+            raise ValueError(
+                f"SVDPlan expects a C-contiguous float32 array of shape {self.shape}, got "
+                f"{X.dtype} {X.shape}."
+            )
+        p = self._params
+        p.n_iter = int(n_iter)
+        p.random_state = int(random_state)
+        p.tol = float(tol)
+        self._execute(
+            self._handle,
+            _as_fptr(X),
+            _as_fptr(self.components),
+            _as_fptr(self.singular_values),
+            _as_fptr(self.U),
+            _as_fptr(self.X_transformed),
+            _as_fptr(self.explained_variance),
+            _as_fptr(self.explained_variance_ratio),
+            _as_fptr(self.mean) if center else None,
+            p,
+        )
+        if int(self._info.k) != self.n_components:
+            raise RuntimeError("Planned CPU solver failed.")
+        return self._info
+
+    def close(self) -> None:
+        """Free the native plan. Arrays already handed out stay valid."""
+        if self._handle is not None:
+            self._destroy(self._handle)
+            self._handle = None
+
+    def __enter__(self) -> SVDPlan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if getattr(self, "_handle", None) is not None:
+            self.close()
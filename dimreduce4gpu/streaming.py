@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import ctypes
+from typing import Optional, Union
+
+import numpy as np
+
+from ._distributed import merge_column_stats
+from .lib_dimreduce4cpu import (
+    _load_fd_finalize_cpu_lib,
+    _load_fd_update_cpu_lib,
+    _load_sketch_finalize_cpu_lib,
+    _load_sketch_update_cpu_lib,
+)
+from .lib_dimreduce4gpu import fit_info, params
+from .pca import PCA
+from .truncated_svd import TruncatedSVD, _as_fptr, _as_ptr
+
+
+class StreamingSVD:
+    """Single-pass truncated SVD / PCA of a row stream that cannot be re-read (CPU backend).
+
+    Every row batch passed to :meth:`update` is folded into a range sketch ``Y = X @ Omega``
+    (n x s) and a co-range sketch ``W = Psi @ X`` (t x m), and then dropped. Of each batch's
+    block of ``Psi`` only the generator state that drew it is kept. :meth:`finalize` redraws
+    ``Psi`` and rebuilds the leading components from the two sketches (Tropp et al., 2017).
+    Between updates memory is O(n * s + m * t); finalize briefly adds the n x t ``Psi``. ``center=True`` gives PCA: the
+    running mean is subtracted from the sketches at finalize time.
+    """
+
+    def __init__(
+        self,
+        n_components: int = 2,
+        center: bool = False,
+        sketch_size: Optional[int] = None,
+        random_state: Optional[int] = None,
+    ) -> None:
+        self.n_components = int(n_components)
+        self.center = bool(center)
+        self.sketch_size = (
+            int(sketch_size) if sketch_size is not None else 2 * self.n_components + 1
+        )
+        if self.sketch_size < self.n_components:
+            raise ValueError("sketch_size must be at least n_components.")
+        self.random_state = (
+            int(random_state) if random_state is not None else int(np.random.randint(0, 2**31 - 1))
+        )
+
+        self._rng = np.random.default_rng(self.random_state)
+        self._omega: Optional[np.ndarray] = None
+        self._shift: Optional[np.ndarray] = None
+        self._W: Optional[np.ndarray] = None
+        self._stats: Optional[np.ndarray] = None
+        self._Y: list[np.ndarray] = []
+        # (generator state, rows) of each batch's block of Psi, redrawn by finalize().
+        self._psi_states: list[tuple[dict, int]] = []
+        self.n_samples_seen_ = 0
+
+    @property
+    def co_range_size(self) -> int:
+        """Rows t of the co-range sketch (2 * sketch_size + 1, as recommended by Tropp et al.)."""
+        return 2 * self.sketch_size + 1
+
+    def update(self, X: np.ndarray) -> StreamingSVD:
+        """Fold one batch of rows into the sketches."""
+        import scipy.sparse
+
+        if scipy.sparse.issparse(X):
+            X = X.toarray()
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n, m = X.shape
+        if self._omega is None:
+            s = min(self.sketch_size, m)
+            # (s, m) in C order is the column-major m x s test matrix the native code expects.
+            self._omega = self._rng.standard_normal((s, m)).astype(np.float32)
+            self._W = np.zeros((m, self.co_range_size), dtype=np.float64)
+            self._stats = np.zeros(2 * m + 1, dtype=np.float64)
+            # Sketch X - shift so large column offsets do not swamp the float32 sketches.
+            self._shift = X.mean(axis=0, dtype=np.float64).astype(np.float32)
+        s, m_fit = self._omega.shape
+        if m != m_fit:
+            raise ValueError(f"X has {m} features, but the stream started with {m_fit}.")
+        if n == 0:
+            return self
+
+        t = self.co_range_size
+        state = self._rng.bit_generator.state
+        psi = self._rng.standard_normal((n, t)).astype(np.float32)  # column-major t x n
+        Y = np.empty((n, s), dtype=np.float32)
+
+        p = params()
+        p.set_shape(n, m)
+        p.k = s
+        _load_sketch_update_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(self._shift),
+            _as_fptr(self._omega),
+            _as_fptr(psi),
+            t,
+            _as_fptr(Y),
+            _as_ptr(self._W, ctypes.c_double),
+            _as_ptr(self._stats, ctypes.c_double),
+            p,
+        )
+        self._Y.append(Y)
+        self._psi_states.append((state, n))
+        self.n_samples_seen_ += n
+        return self
+
+    def _redraw_psi(self) -> np.ndarray:
+        """The n x t co-range test matrix (column-major t x n), redrawn batch by batch."""
+        t = self.co_range_size
+        psi = np.empty((self.n_samples_seen_, t), dtype=np.float32)
+        replay = np.random.default_rng()
+        start = 0
+        for state, rows in self._psi_states:
+            replay.bit_generator.state = state
+            psi[start : start + rows] = replay.standard_normal((rows, t))
+            start += rows
+        return psi
+
+    def finalize(self) -> Union[PCA, TruncatedSVD]:
+        """Return a fitted ``PCA`` (``center=True``) or ``TruncatedSVD`` built from the sketches."""
+        if self._omega is None or self.n_samples_seen_ == 0:
+            raise ValueError("finalize() needs at least one non-empty update().")
+        s, m = self._omega.shape
+        n = self.n_samples_seen_
+        t = self.co_range_size
+        if n < s:
+            raise ValueError(f"The stream has {n} rows; the sketch needs at least {s}.")
+        k = min(self.n_components, s)
+
+        Y = np.concatenate(self._Y, axis=0)
+        psi = self._redraw_psi()
+        Q = np.zeros((k, m), dtype=np.float32)
+        w = np.zeros((k,), dtype=np.float32)
+        U = np.zeros((n, k), dtype=np.float32)
+        explained_variance = np.zeros((k,), dtype=np.float32)
+        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+        mean = np.zeros((m,), dtype=np.float32) if self.center else None
+
+        info = fit_info()
+        p = params()
+        p.set_shape(n, m)
+        p.k = k
+        p.info = ctypes.pointer(info)
+        _load_sketch_finalize_cpu_lib()(
+            _as_fptr(Y),
+            _as_fptr(psi),
+            _as_ptr(self._W, ctypes.c_double),
+            _as_fptr(self._omega),
+            _as_fptr(self._shift),
+            _as_ptr(self._stats, ctypes.c_double),
+            t,
+            s,
+            1 if self.center else 0,
+            _as_fptr(Q),
+            _as_fptr(w),
+            _as_fptr(U),
+            _as_fptr(explained_variance),
+            _as_fptr(explained_variance_ratio),
+            _as_fptr(mean) if mean is not None else None,
+            p,
+        )
+        if int(info.k) != k:
+            raise RuntimeError("Single-pass sketch CPU solver failed.")
+
+        est: Union[PCA, TruncatedSVD]
+        if self.center:
+            est = PCA(n_components=k, random_state=self.random_state, backend="cpu")
+            est.mean_ = mean
+        else:
+            est = TruncatedSVD(n_components=k, random_state=self.random_state, backend="cpu")
+        est._store_fit_info(info, "cpu")
+        est.n_components_ = k
+        est._Q = Q
+        est._w = w
+        est._U = U
+        est.explained_variance_ = explained_variance
+        est.explained_variance_ratio_ = explained_variance_ratio
+        return est
+
+
+class FrequentDirections:
+    """Mergeable Frequent Directions sketch of a row-sharded matrix (CPU backend).
+
+    Keeps an ``sketch_size x m`` matrix B with ``B^T B ~= X^T X``. Rows are added with
+    :meth:`update`, and sketches built on different shards combine with :meth:`merge` without
+    moving raw rows. The guarantee is ``||X^T X - B^T B||_2 <= covariance_error_ <=
+    ||X - X_k||_F^2 / (sketch_size - k)`` for every k < sketch_size (Ghashami et al., 2016).
+    :meth:`to_estimator` turns the sketch into a fitted ``TruncatedSVD``.
+    """
+
+    def __init__(self, n_components: int = 2, sketch_size: Optional[int] = None) -> None:
+        self.n_components = int(n_components)
+        self.sketch_size = int(sketch_size) if sketch_size is not None else 2 * self.n_components
+        if self.sketch_size <= self.n_components:
+            raise ValueError("sketch_size must be larger than n_components.")
+
+        self._B: Optional[np.ndarray] = None
+        self._n_filled = 0
+        self._stats: Optional[np.ndarray] = None
+        self.covariance_error_ = 0.0
+        self.n_samples_seen_ = 0
+
+    @property
+    def sketch_(self) -> np.ndarray:
+        """The current sketch rows (at most 2 * sketch_size of them)."""
+        if self._B is None:
+            raise AttributeError("sketch_ is not available before update().")
+        return self._B[: self._n_filled]
+
+    def _append(self, X: np.ndarray, with_stats: bool) -> None:
+        n, m = X.shape
+        if self._B is None:
+            self._B = np.zeros((2 * self.sketch_size, m), dtype=np.float32)
+            self._stats = np.zeros(2 * m + 1, dtype=np.float64)
+        if m != self._B.shape[1]:
+            raise ValueError(f"X has {m} features, but the sketch has {self._B.shape[1]}.")
+        if n == 0:
+            return
+
+        filled = ctypes.c_int32(self._n_filled)
+        shrunk = ctypes.c_double(self.covariance_error_)
+        info = fit_info()
+        p = params()
+        p.set_shape(n, m)
+        p.k = self.sketch_size
+        p.info = ctypes.pointer(info)
+        _load_fd_update_cpu_lib()(
+            _as_fptr(X),
+            _as_fptr(self._B),
+            ctypes.byref(filled),
+            ctypes.byref(shrunk),
+            _as_ptr(self._stats, ctypes.c_double) if with_stats else None,
+            p,
+        )
+        if int(info.k) <= 0:
+            raise RuntimeError("Frequent Directions CPU update failed.")
+        self._n_filled = int(filled.value)
+        self.covariance_error_ = float(shrunk.value)
+
+    def update(self, X: np.ndarray) -> FrequentDirections:
+        """Add a batch of rows to the sketch."""
+        import scipy.sparse
+
+        if scipy.sparse.issparse(X):
+            X = X.toarray()
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        self._append(X, with_stats=True)
+        self.n_samples_seen_ += X.shape[0]
+        return self
+
+    def merge(self, other: FrequentDirections) -> FrequentDirections:
+        """Fold another sketch (e.g. from a different shard) into this one."""
+        if other._B is None:
+            return self
+        self._append(np.ascontiguousarray(other.sketch_), with_stats=False)
+        self.covariance_error_ += other.covariance_error_
+        self._stats = merge_column_stats(self._stats, other._stats)
+        self.n_samples_seen_ += other.n_samples_seen_
+        return self
+
+    def to_estimator(self) -> TruncatedSVD:
+        """Return a ``TruncatedSVD`` fitted from the sketch.
+
+        ``singular_values_`` are those of the sketch, which under-estimate the data's by at most
+        ``sqrt(covariance_error_)`` in the squared sense.
+        """
+        if self._B is None or self._n_filled == 0:
+            raise ValueError("to_estimator() needs at least one non-empty update().")
+        m = self._B.shape[1]
+        k = min(self.n_components, self._n_filled, m)
+        Q = np.zeros((k, m), dtype=np.float32)
+        w = np.zeros((k,), dtype=np.float32)
+        explained_variance = np.zeros((k,), dtype=np.float32)
+        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+
+        info = fit_info()
+        p = params()
+        p.set_shape(self._n_filled, m)
+        p.k = k
+        p.info = ctypes.pointer(info)
+        _load_fd_finalize_cpu_lib()(
+            _as_fptr(self._B),
+            self._n_filled,
+            _as_ptr(self._stats, ctypes.c_double),
+            _as_fptr(Q),
+            _as_fptr(w),
+            _as_fptr(explained_variance),
+            _as_fptr(explained_variance_ratio),
+            p,
+        )
+        if int(info.k) != k:
+            raise RuntimeError("Frequent Directions CPU solver failed.")
+
+        est = TruncatedSVD(n_components=k, backend="cpu")
+        est.n_components_ = k
+        est._Q = Q
+        est._w = w
+        est.explained_variance_ = explained_variance
+        est.explained_variance_ratio_ = explained_variance_ratio
+        return est
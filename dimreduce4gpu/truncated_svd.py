@@ -1,13 +1,39 @@
 from __future__ import annotations
 
 import ctypes
-from typing import Literal, Optional
+from typing import Literal, NamedTuple, Optional, Union
 
 import numpy as np
 
 from ._backend import select_backend
-from .lib_dimreduce4cpu import _load_tsvd_cpu_lib
-from .lib_dimreduce4gpu import _load_tsvd_lib, params
+from .lib_dimreduce4cpu import (
+    _load_adaptive_cpu_lib,
+    _load_adaptive_double_cpu_lib,
+    _load_adaptive_result_copy_cpu_lib,
+    _load_adaptive_result_copy_double_cpu_lib,
+    _load_adaptive_result_destroy_cpu_lib,
+    _load_adaptive_sparse_cpu_lib,
+    _load_fit_many_cpu_lib,
+    _load_incremental_cpu_lib,
+    _load_inverse_transform_cpu_lib,
+    _load_inverse_transform_double_cpu_lib,
+    _load_pca_inplace_cpu_lib,
+    _load_pca_inplace_double_cpu_lib,
+    _load_pca_sparse_cpu_lib,
+    _load_pca_strided_cpu_lib,
+    _load_pca_strided_double_cpu_lib,
+    _load_reconstruction_error_cpu_lib,
+    _load_reconstruction_error_double_cpu_lib,
+    _load_transform_cpu_lib,
+    _load_transform_double_cpu_lib,
+    _load_tsvd_inplace_cpu_lib,
+    _load_tsvd_inplace_double_cpu_lib,
+    _load_tsvd_sparse_cpu_lib,
+    _load_tsvd_strided_cpu_lib,
+    _load_tsvd_strided_double_cpu_lib,
+    cpu_built,
+)
+from .lib_dimreduce4gpu import _INT32_MAX, _load_pca_lib, _load_tsvd_lib, fit_info, params
 
 Backend = Literal["auto", "gpu", "cpu"]
 
@@ -16,12 +42,144 @@ def _as_fptr(x: np.ndarray):
     return x.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
 
 
+def _as_ptr(x: np.ndarray, ctype):
+    return x.ctypes.data_as(ctypes.POINTER(ctype))
+
+
+def _ctype(dtype) -> type:
+    return ctypes.c_double if dtype == np.float64 else ctypes.c_float
+
+
+def _check_dtype(dtype) -> Optional[np.dtype]:
+    if dtype is None:
+        return None
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype must be None, float32 or float64, got {dtype}.")
+    return dtype
+
+
+def _check_out(out, shape: tuple[int, ...], dtype) -> np.ndarray:
+    """Validate a caller-provided result buffer (``out=``)."""
+    if (
+        not isinstance(out, np.ndarray)
+        or out.shape != shape
+        or out.dtype != dtype
+        or not out.flags.c_contiguous
+        or not out.flags.writeable
+    ):
+        got = f"{out.dtype} {out.shape}" if isinstance(out, np.ndarray) else type(out).__name__
+        raise ValueError(
+            f"out must be a writable C-contiguous {np.dtype(dtype)} array of shape {shape}, "
+            f"got {got}."
+        )
+    return out
+
+
+def _copy_into(out: Optional[np.ndarray], Z: np.ndarray) -> np.ndarray:
+    """Return Z, or copy it into the caller's ``out`` buffer and return that."""
+    if out is None:
+        return Z
+    np.copyto(_check_out(out, Z.shape, Z.dtype), Z)
+    return out
+
+
+def _dense_cpu_entry(center: bool, dtype, overwrite: bool):
+    """Native dense CPU fit for PCA (``center``) or TruncatedSVD in ``dtype``.
+
+    The ``overwrite`` entry points may use X as scratch: the exact solver then centers and factors
+    X in its own storage instead of copying it. With no copy to fall back on, a failed
+    partial-spectrum solve is reported rather than retried on the full SVD.
+    """
+    double = dtype == np.float64
+    if overwrite:
+        if center:
+            return _load_pca_inplace_double_cpu_lib() if double else _load_pca_inplace_cpu_lib()
+        return _load_tsvd_inplace_double_cpu_lib() if double else _load_tsvd_inplace_cpu_lib()
+    if center:
+        return _load_pca_strided_double_cpu_lib() if double else _load_pca_strided_cpu_lib()
+    return _load_tsvd_strided_double_cpu_lib() if double else _load_tsvd_strided_cpu_lib()
+
+
+def _dense_layout(X, c_order: bool = False, dtype=np.float32) -> tuple[np.ndarray, int, int]:
+    """Return ``(X, col_major, ld)`` for a dense 2D input the CPU backend reads in place.
+
+    C-ordered, Fortran-ordered and row-strided arrays of ``dtype`` (``X[::2]``, ``X[:, :50]``)
+    are passed through as they are. Objects exposing ``__dlpack__`` or the array interface
+    (PyTorch CPU tensors, Arrow-backed buffers) are wrapped without a copy. Other dtypes are
+    converted once, keeping the memory order; ``dtype=None`` keeps float64 input in float64 and
+    converts everything else to float32. Layouts BLAS cannot address (``X[:, ::2]``), or any
+    non-C layout when ``c_order`` is set, are copied to C order.
+    """
+    if not isinstance(X, np.ndarray) and hasattr(X, "__dlpack__"):
+        try:
+            X = np.from_dlpack(X)
+        except (BufferError, RuntimeError, TypeError):
+            X = np.asarray(X)
+    X = np.asarray(X)
+    if dtype is None:
+        dtype = np.float64 if X.dtype == np.float64 else np.float32
+    if X.dtype != dtype:
+        X = X.astype(dtype, order="K")
+    if X.ndim != 2:
+        raise ValueError(f"Expected a 2D array, got shape {X.shape}.")
+    n, m = X.shape
+    if X.flags.c_contiguous:
+        return X, 0, max(m, 1)
+    if not c_order and X.flags.aligned:
+        if X.flags.f_contiguous:
+            return X, 1, max(n, 1)
+        row_stride, col_stride = (s // X.itemsize if s % X.itemsize == 0 else -1 for s in X.strides)
+        # BLAS takes the leading dimension as a 32-bit int.
+        if col_stride == 1 and m <= row_stride <= _INT32_MAX:
+            return X, 0, row_stride
+        if row_stride == 1 and n <= col_stride <= _INT32_MAX:
+            return X, 1, col_stride
+    return np.ascontiguousarray(X), 0, max(m, 1)
+
+
+def _sparse_compressed(X):
+    """Return (indptr, indices, data, csc) for a scipy.sparse matrix/array without densifying.
+
+    CSR and CSC inputs (``csr_matrix``/``csr_array``/``csc_matrix``/``csc_array``) are consumed
+    in their own layout; any other sparse format is converted to CSR.
+    """
+    if X.format not in ("csr", "csc"):
+        X = X.tocsr()
+    indptr = np.ascontiguousarray(X.indptr, dtype=np.int64)
+    indices = np.ascontiguousarray(X.indices, dtype=np.int32)
+    data = np.ascontiguousarray(X.data, dtype=np.float32)
+    return indptr, indices, data, X.format == "csc"
+
+
+def _check_n_components(n_components: Union[int, float]) -> Union[int, float]:
+    """Integers are a fixed rank; floats in (0, 1) are a target explained-energy fraction."""
+    if isinstance(n_components, (float, np.floating)):
+        value = float(n_components)
+        if 0.0 < value < 1.0:
+            return value
+        if not (value >= 1.0 and value.is_integer()):
+            raise ValueError(f"n_components as a float must be in (0, 1), got {n_components!r}.")
+    return int(n_components)
+
+
+class FitManyResult(NamedTuple):
+    """Stacked outputs of ``fit_many``; the leading axis indexes the problems."""
+
+    components: np.ndarray  # (batch, k, m)
+    singular_values: np.ndarray  # (batch, k)
+    X_transformed: np.ndarray  # (batch, n, k)
+    explained_variance: np.ndarray  # (batch, k)
+    explained_variance_ratio: np.ndarray  # (batch, k)
+    mean: Optional[np.ndarray]  # (batch, m) for PCA, None for TruncatedSVD
+
+
 class TruncatedSVD:
     """Truncated SVD with GPU (CUDA) or CPU native backend."""
 
     def __init__(
         self,
-        n_components: int = 2,
+        n_components: Union[int, float] = 2,
         algorithm: str = "power",
         n_iter: int = 5,
         random_state: Optional[int] = None,
@@ -29,8 +187,12 @@ class TruncatedSVD:
         verbose: bool = False,
         gpu_id: int = 0,
         backend: Backend = "auto",
+        plan=None,
+        dtype=None,
+        copy: bool = True,
+        warm_start: bool = False,
     ) -> None:
-        self.n_components = int(n_components)
+        self.n_components = _check_n_components(n_components)
         self.algorithm = str(algorithm)
         self.n_iter = int(n_iter)
         self.random_state = (
@@ -40,12 +202,29 @@ class TruncatedSVD:
         self.verbose = bool(verbose)
         self.gpu_id = int(gpu_id)
         self.backend: Backend = backend
+        # An SVDPlan to fit through (CPU backend, dense inputs of the plan's shape).
+        self.plan = plan
+        # Precision of dense CPU fits: None keeps float64 input in float64, anything else runs in
+        # float32. Fitted attributes and transform() outputs use the same dtype.
+        self.dtype = _check_dtype(dtype)
+        # copy=False lets a dense CPU fit overwrite a writable input of the fit dtype: the exact
+        # solver then centers and factors X in place instead of copying it, and raises if that
+        # solve fails, since X is gone.
+        self.copy = bool(copy)
+        # warm_start=True seeds each CPU randomized refit with the components of the previous fit.
+        self.warm_start = bool(warm_start)
 
         self._Q: Optional[np.ndarray] = None
         self._w: Optional[np.ndarray] = None
         self._U: Optional[np.ndarray] = None
         self.explained_variance_: Optional[np.ndarray] = None
         self.explained_variance_ratio_: Optional[np.ndarray] = None
+        self.n_iter_: Optional[int] = None
+        self.n_matvecs_: Optional[int] = None
+        self.n_components_: Optional[int] = None
+        self.n_samples_seen_: Optional[int] = None
+        self._running_mean: Optional[np.ndarray] = None
+        self._total_sq = 0.0
 
     @property
     def components_(self) -> np.ndarray:
@@ -59,30 +238,112 @@ class TruncatedSVD:
             raise AttributeError("singular_values_ is not available before fit/fit_transform.")
         return self._w
 
-    def fit(self, X: np.ndarray, y=None):
-        self.fit_transform(X)
+    # Whether fit() centers the data; PCA overrides this.
+    _centered = False
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y=None,
+        *,
+        chunk_size: Optional[int] = None,
+        n_jobs: Optional[int] = None,
+        executor=None,
+        init=None,
+    ):
+        """Fit on X.
+
+        Besides in-memory arrays, X may be a path to a ``.npy`` file or a re-iterable (or
+        zero-argument callable) of row chunks. Those are streamed through the CPU backend chunk by
+        chunk (``chunk_size`` rows at a time for paths) and never loaded whole. An ``np.memmap``
+        is read in place by the in-memory solvers like any array, and streamed only when
+        ``chunk_size`` is given. The streamed solver is a fixed row-space randomized SVD in
+        float32: it ignores ``algorithm``, ``tol`` and ``dtype``.
+
+        With ``n_jobs`` or ``executor`` (any ``concurrent.futures.Executor``), an array, memmap or
+        ``.npy`` path is instead row-partitioned across workers, with TSQR reductions on the
+        calling process.
+
+        ``init`` warm-starts the CPU randomized solver (``algorithm="power"``): a fitted
+        estimator or a ``(rows, n_features)`` array whose rows seed the range finder, padded
+        with Gaussian columns. ``init="subsample"`` first fits a 10% row sample and refines
+        from its components. Other solvers and fitting modes ignore ``init``.
+        """
+        from ._out_of_core import is_out_of_core_source
+
+        if n_jobs is not None or executor is not None:
+            self._fit_distributed(X, n_jobs, executor)
+            return self
+        if is_out_of_core_source(X, chunk_size):
+            self._fit_out_of_core(X, center=self._centered, chunk_size=chunk_size)
+            return self
+        self._fit_in_memory(X, transform=False, init=init)
         return self
 
-    def fit_transform(self, X: np.ndarray) -> np.ndarray:
-        import scipy
+    def _fit_distributed(self, X, n_jobs: Optional[int], executor) -> None:
+        import os
+
+        import scipy.sparse
+
+        from ._distributed import tsqr_fit, use_wide_partitions, wide_fit
 
-        if isinstance(X, scipy.sparse.csr_matrix):
+        if isinstance(self.n_components, float):
+            raise ValueError("Distributed fitting requires an integer n_components.")
+        if self.backend == "gpu":
+            raise ValueError("Distributed fitting is only supported by the CPU backend.")
+        if isinstance(X, (str, os.PathLike)):
+            X = np.load(os.fspath(X), mmap_mode="r")
+        elif scipy.sparse.issparse(X):
             X = X.toarray()
+        elif not isinstance(X, np.ndarray):
+            raise ValueError("Distributed fitting needs an array, np.memmap or .npy path.")
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got shape {X.shape}.")
 
-        X = np.ascontiguousarray(X, dtype=np.float32)
-        n, m = X.shape
-        k = min(self.n_components, n, m)
+        # Very wide inputs are split by columns, everything else by rows.
+        distributed_fit = wide_fit if use_wide_partitions(self.algorithm, X.shape) else tsqr_fit
+        Q, w, U, explained_variance, explained_variance_ratio, mean, info = distributed_fit(
+            X,
+            self.n_components,
+            self.n_iter,
+            self.random_state,
+            self._centered,
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = Q.shape[0]
+        self._Q = Q
+        self._w = w
+        self._U = U
+        self.explained_variance_ = explained_variance
+        self.explained_variance_ratio_ = explained_variance_ratio
+        if self._centered:
+            self.mean_ = mean
 
-        Q = np.zeros((k, m), dtype=np.float32)
-        w = np.zeros((k,), dtype=np.float32)
-        U = np.zeros((n, k), dtype=np.float32)
-        X_transformed = np.zeros((n, k), dtype=np.float32)
-        explained_variance = np.zeros((k,), dtype=np.float32)
-        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+    def _fit_out_of_core(self, X, center: bool, chunk_size: Optional[int]) -> None:
+        from ._out_of_core import streamed_fit
 
+        if isinstance(self.n_components, float):
+            raise ValueError("Out-of-core fitting requires an integer n_components.")
+        if self.backend == "gpu":
+            raise ValueError("Out-of-core fitting is only supported by the CPU backend.")
+        Q, w, explained_variance, explained_variance_ratio, mean, info = streamed_fit(
+            X, self.n_components, self.n_iter, self.random_state, center, chunk_size
+        )
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = Q.shape[0]
+        self._Q = Q
+        self._w = w
+        self._U = None
+        self.explained_variance_ = explained_variance
+        self.explained_variance_ratio_ = explained_variance_ratio
+        if center:
+            self.mean_ = mean
+
+    def _build_params(self, n: int, m: int, k: int, info: Optional[fit_info] = None) -> params:
         p = params()
-        p.X_n = n
-        p.X_m = m
+        p.set_shape(n, m)
         p.k = k
         p.algorithm = self.algorithm.encode("utf-8")
         p.n_iter = self.n_iter
@@ -91,28 +352,693 @@ class TruncatedSVD:
         p.verbose = 1 if self.verbose else 0
         p.gpu_id = self.gpu_id
         p.whiten = False
+        if info is not None:
+            p.info = ctypes.pointer(info)
+        return p
+
+    def _store_fit_info(self, info: fit_info, backend: str) -> None:
+        """Record solver diagnostics (CPU backend only; the CUDA backend does not report them)."""
+        if backend == "cpu":
+            self.n_iter_ = int(info.n_iter)
+            self.n_matvecs_ = int(info.n_matvecs)
+        else:
+            self.n_iter_ = None
+            self.n_matvecs_ = None
+        # Any fit starts over; partial_fit() re-sets this after its own update.
+        self.n_samples_seen_ = None
+
+    def _fit_dtype(self, backend: str):
+        """Compute dtype of a dense fit; the CUDA entry points are float32 only."""
+        if backend == "cpu":
+            return self.dtype
+        if self.dtype == np.float64:
+            raise ValueError("dtype=float64 is only supported by the CPU backend.")
+        return np.float32
+
+    def _target_fraction(self, backend: str) -> Optional[float]:
+        """The explained-energy target when n_components is a fraction, else None."""
+        if not isinstance(self.n_components, float):
+            return None
+        if backend != "cpu":
+            raise ValueError(
+                "A fractional n_components (adaptive rank) is only supported by the CPU backend."
+            )
+        return self.n_components
+
+    def _fit_adaptive(
+        self, X, target: float, center: bool, transform: bool
+    ) -> Optional[np.ndarray]:
+        """CPU fit that grows the rank until `target` of the (centered if `center`) energy is kept.
+
+        The native solver keeps its result until the chosen rank is known, so only k x m
+        components are allocated here, never a min(n, m) x m capacity buffer.
+        """
+        import scipy.sparse
+
+        sparse = scipy.sparse.issparse(X)
+        if sparse:
+            dtype = np.dtype(np.float32)
+        else:
+            X, col_major, ld = _dense_layout(X, dtype=self._fit_dtype("cpu"))
+            dtype = X.dtype
+        n, m = X.shape
+        ctype = _ctype(dtype)
+        mean = np.zeros((m,), dtype=dtype) if center else None
+        mean_ptr = _as_ptr(mean, ctype) if mean is not None else None
+
+        info = fit_info()
+        p = self._build_params(n, m, min(n, m), info)
+        if sparse:
+            indptr, indices, data, csc = _sparse_compressed(X)
+            result = _load_adaptive_sparse_cpu_lib()(
+                _as_ptr(indptr, ctypes.c_int64),
+                _as_ptr(indices, ctypes.c_int32),
+                _as_fptr(data),
+                1 if csc else 0,
+                target,
+                mean_ptr,
+                p,
+            )
+        else:
+            fn = (
+                _load_adaptive_double_cpu_lib() if dtype == np.float64 else _load_adaptive_cpu_lib()
+            )
+            result = fn(_as_ptr(X, ctype), col_major, ld, target, mean_ptr, p)
+        if not result:
+            raise RuntimeError("Adaptive-rank CPU solver failed.")
+        try:
+            k = int(info.k)
+            Q = np.zeros((k, m), dtype=dtype)
+            w = np.zeros((k,), dtype=dtype)
+            explained_variance = np.zeros((k,), dtype=dtype)
+            explained_variance_ratio = np.zeros((k,), dtype=dtype)
+            copy_fn = (
+                _load_adaptive_result_copy_double_cpu_lib()
+                if dtype == np.float64
+                else _load_adaptive_result_copy_cpu_lib()
+            )
+            copy_fn(
+                result,
+                _as_ptr(Q, ctype),
+                _as_ptr(w, ctype),
+                _as_ptr(explained_variance, ctype),
+                _as_ptr(explained_variance_ratio, ctype),
+            )
+        finally:
+            _load_adaptive_result_destroy_cpu_lib()(result)
+
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = k
+        self._Q = Q
+        self._w = w
+        self._U = None
+        self.explained_variance_ = explained_variance
+        self.explained_variance_ratio_ = explained_variance_ratio
+        if mean is not None:
+            self.mean_ = mean
+        return self.transform(X) if transform else None
+
+    def _fit_transform_planned(self, X, center: bool) -> np.ndarray:
+        """CPU fit through ``self.plan``; the fitted arrays are the plan's buffers."""
+        import scipy.sparse
 
+        plan = self.plan
+        if self.backend == "gpu":
+            raise ValueError("SVDPlan is only supported by the CPU backend.")
+        if isinstance(self.n_components, float):
+            raise ValueError("SVDPlan requires an integer n_components.")
+        if scipy.sparse.issparse(X):
+            raise ValueError("SVDPlan only supports dense inputs.")
+        X, _, _ = _dense_layout(X, c_order=True)
+        if X.shape != plan.shape:
+            raise ValueError(f"X has shape {X.shape}, but the plan was made for {plan.shape}.")
+        if min(self.n_components, *X.shape) != plan.n_components:
+            raise ValueError(
+                f"n_components={self.n_components} does not match the plan's "
+                f"{plan.n_components} components."
+            )
+
+        info = plan.execute(
+            X, center=center, n_iter=self.n_iter, random_state=self.random_state, tol=self.tol
+        )
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = plan.n_components
+        self._Q = plan.components
+        self._w = plan.singular_values
+        self._U = plan.U
+        self.explained_variance_ = plan.explained_variance
+        self.explained_variance_ratio_ = plan.explained_variance_ratio
+        if center:
+            self.mean_ = plan.mean
+        return plan.X_transformed
+
+    def fit_transform(
+        self,
+        X: np.ndarray,
+        *,
+        out: Optional[np.ndarray] = None,
+        init=None,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """Fit on X and return its projection onto the components.
+
+        ``out``, a writable C-contiguous ``(n_samples, n_components_)`` array of the fit dtype,
+        receives the projection instead of a new array. ``init`` and ``chunk_size`` are as for
+        ``fit``, and X is routed the same way: out-of-core sources are fit by streaming and then
+        projected chunk by chunk.
+        """
+        from ._out_of_core import is_out_of_core_source, streamed_transform
+
+        if is_out_of_core_source(X, chunk_size):
+            self._fit_out_of_core(X, center=self._centered, chunk_size=chunk_size)
+            return _copy_into(out, streamed_transform(self.transform, X, chunk_size))
+        return self._fit_in_memory(X, transform=True, out=out, init=init)
+
+    def _warm_start_rows(self, X, init, dtype) -> Optional[np.ndarray]:
+        """Rows seeding the randomized range finder for a CPU fit of X, or None."""
+        if init is None and self.warm_start:
+            init = self._Q
+        if init is None:
+            return None
+        if isinstance(init, str):
+            if init != "subsample":
+                raise ValueError(
+                    f"init must be an estimator, an array or 'subsample', got {init!r}."
+                )
+            init = self._subsample_components(X)
+            if init is None:
+                return None
+        elif isinstance(init, TruncatedSVD):
+            init = init.components_
+        init = np.ascontiguousarray(init, dtype=dtype)
+        if init.ndim != 2 or init.shape[1] != X.shape[1]:
+            raise ValueError(f"init has shape {init.shape}, but X has {X.shape[1]} features.")
+        return init
+
+    def _subsample_components(self, X) -> Optional[np.ndarray]:
+        """Components of a fit on a random 10% of the rows (at least 20 per sketch column)."""
+        import copy
+
+        n = X.shape[0]
+        n_sub = max(n // 10, 20 * (min(self.n_components, *X.shape) + 10))
+        if n_sub >= n:
+            return None
+        rows = np.random.default_rng(self.random_state).choice(n, n_sub, replace=False)
+        coarse = copy.copy(self)
+        coarse.warm_start = False
+        coarse.copy = True
+        coarse._fit_in_memory(X[np.sort(rows)], transform=False)
+        return coarse.components_
+
+    def _fit_in_memory(
+        self, X, transform: bool, out: Optional[np.ndarray] = None, init=None
+    ) -> Optional[np.ndarray]:
+        """Fit an in-memory X; PCA centers it.
+
+        Without ``transform`` the CPU backend computes only the components and spectrum, and
+        nothing of size ``n_samples`` is allocated.
+        """
+        import scipy.sparse
+
+        center = self._centered
+        if self.plan is not None:
+            return _copy_into(out, self._fit_transform_planned(X, center=center))
         backend = select_backend(self.backend)
-        fn = _load_tsvd_cpu_lib() if backend == "cpu" else _load_tsvd_lib()
+        target = self._target_fraction(backend)
+        if target is not None:
+            X_transformed = self._fit_adaptive(X, target, center, transform or out is not None)
+            return _copy_into(out, X_transformed) if transform else None
+        if scipy.sparse.issparse(X):
+            if backend == "cpu":
+                return self._fit_sparse(X, transform, out, init)
+            X = X.toarray()
+
+        X, col_major, ld = _dense_layout(
+            X, c_order=backend != "cpu", dtype=self._fit_dtype(backend)
+        )
+        n, m = X.shape
+        k = min(self.n_components, n, m)
+        dtype = X.dtype
+
+        Q = np.zeros((k, m), dtype=dtype)
+        w = np.zeros((k,), dtype=dtype)
+        explained_variance = np.zeros((k,), dtype=dtype)
+        explained_variance_ratio = np.zeros((k,), dtype=dtype)
+        mean = np.zeros((m,), dtype=dtype) if center else None
+        # The CUDA entry points always write U and X_transformed; the CPU ones skip null outputs.
+        U = np.zeros((n, k), dtype=dtype) if backend != "cpu" else None
+        if out is not None:
+            X_transformed = _check_out(out, (n, k), dtype)
+        elif transform or backend != "cpu":
+            X_transformed = np.zeros((n, k), dtype=dtype)
+        else:
+            X_transformed = None
+
+        info = fit_info()
+        p = self._build_params(n, m, k, info)
+        init_rows = self._warm_start_rows(X, init, dtype) if backend == "cpu" else None
+        if init_rows is not None:
+            p.init = init_rows.ctypes.data
+            p.init_k = init_rows.shape[0]
+        ctype = _ctype(dtype)
+        outputs = tuple(
+            _as_ptr(a, ctype) if a is not None else None
+            for a in (Q, w, U, X_transformed, explained_variance, explained_variance_ratio)
+        )
+        if center:
+            outputs += (_as_ptr(mean, ctype),)
+        if backend == "cpu":
+            overwrite = not self.copy and X.flags.writeable
+            _dense_cpu_entry(center, dtype, overwrite)(
+                _as_ptr(X, ctype), col_major, ld, *outputs, p
+            )
+            if int(info.k) != k:
+                if overwrite:
+                    raise RuntimeError(
+                        "Dense CPU solver failed and X was used as its workspace; "
+                        "refit with copy=True."
+                    )
+                raise RuntimeError("Dense CPU solver failed.")
+        else:
+            (_load_pca_lib if center else _load_tsvd_lib)()(_as_fptr(X), *outputs, p)
+
+        self._store_fit_info(info, backend)
+        self.n_components_ = k
+        self._Q = Q
+        self._w = w
+        self._U = U
+        self.explained_variance_ = explained_variance
+        self.explained_variance_ratio_ = explained_variance_ratio
+        if center:
+            self.mean_ = mean
+        return X_transformed
+
+    def _fit_sparse(
+        self, X, transform: bool, out: Optional[np.ndarray] = None, init=None
+    ) -> Optional[np.ndarray]:
+        """CPU fit on a scipy.sparse input using sparse-times-dense products (no densification).
+
+        PCA centers implicitly inside the products, so no dense or centered copy is formed.
+        """
+        center = self._centered
+        indptr, indices, data, csc = _sparse_compressed(X)
+        n, m = X.shape
+        k = min(self.n_components, n, m)
+
+        Q = np.zeros((k, m), dtype=np.float32)
+        w = np.zeros((k,), dtype=np.float32)
+        explained_variance = np.zeros((k,), dtype=np.float32)
+        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+        mean = np.zeros((m,), dtype=np.float32) if center else None
+        if out is not None:
+            X_transformed = _check_out(out, (n, k), np.float32)
+        else:
+            X_transformed = np.zeros((n, k), dtype=np.float32) if transform else None
+
+        info = fit_info()
+        p = self._build_params(n, m, k, info)
+        init_rows = self._warm_start_rows(X, init, np.float32)
+        if init_rows is not None:
+            p.init = init_rows.ctypes.data
+            p.init_k = init_rows.shape[0]
+        fn = _load_pca_sparse_cpu_lib() if center else _load_tsvd_sparse_cpu_lib()
 
         fn(
-            _as_fptr(X),
+            _as_ptr(indptr, ctypes.c_int64),
+            _as_ptr(indices, ctypes.c_int32),
+            _as_fptr(data),
+            1 if csc else 0,
             _as_fptr(Q),
             _as_fptr(w),
-            _as_fptr(U),
-            _as_fptr(X_transformed),
+            None,
+            _as_fptr(X_transformed) if X_transformed is not None else None,
             _as_fptr(explained_variance),
             _as_fptr(explained_variance_ratio),
+            *((_as_fptr(mean),) if center else ()),
             p,
         )
+        if int(info.k) != k:
+            raise RuntimeError("Sparse CPU solver failed.")
 
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = k
         self._Q = Q
         self._w = w
-        self._U = U
+        self._U = None
         self.explained_variance_ = explained_variance
         self.explained_variance_ratio_ = explained_variance_ratio
+        if center:
+            self.mean_ = mean
         return X_transformed
 
-    def transform(self, X: np.ndarray) -> np.ndarray:
+    def fit_many(self, X_stack) -> FitManyResult:
+        """Fit many independent same-shaped problems in one native call (CPU backend).
+
+        ``X_stack`` is a 3-D array ``(batch, n, m)`` or a sequence of ``(n, m)`` arrays. The
+        problems run in parallel over OpenMP threads with this estimator's settings, and the
+        results come back stacked. The estimator's own fitted attributes are left unchanged.
+        """
+        if self.backend == "gpu":
+            raise ValueError("fit_many is only supported by the CPU backend.")
+        if isinstance(self.n_components, float):
+            raise ValueError("fit_many requires an integer n_components.")
+        if isinstance(X_stack, np.ndarray):
+            X = np.ascontiguousarray(X_stack, dtype=np.float32)
+        else:
+            shapes = {np.shape(X_i) for X_i in X_stack}
+            if len(shapes) > 1:
+                raise ValueError(
+                    f"fit_many needs same-shaped problems, got shapes {sorted(shapes)}."
+                )
+            X = np.ascontiguousarray(np.stack(list(X_stack)), dtype=np.float32)
+        if X.ndim != 3:
+            raise ValueError(f"Expected a 3D stack of problems, got shape {X.shape}.")
+        batch, n, m = X.shape
+        k = min(self.n_components, n, m)
+
+        Q = np.empty((batch, k, m), dtype=np.float32)
+        w = np.empty((batch, k), dtype=np.float32)
+        X_transformed = np.empty((batch, n, k), dtype=np.float32)
+        explained_variance = np.empty((batch, k), dtype=np.float32)
+        explained_variance_ratio = np.empty((batch, k), dtype=np.float32)
+        mean = np.empty((batch, m), dtype=np.float32) if self._centered else None
+        status = np.zeros((batch,), dtype=np.int32)
+        if batch == 0:
+            return FitManyResult(
+                Q, w, X_transformed, explained_variance, explained_variance_ratio, mean
+            )
+
+        info = fit_info()
+        _load_fit_many_cpu_lib()(
+            _as_fptr(X),
+            batch,
+            _as_fptr(Q),
+            _as_fptr(w),
+            None,
+            _as_fptr(X_transformed),
+            _as_fptr(explained_variance),
+            _as_fptr(explained_variance_ratio),
+            _as_fptr(mean) if mean is not None else None,
+            _as_ptr(status, ctypes.c_int32),
+            self._build_params(n, m, k, info),
+        )
+        if int(info.k) != k:
+            failed = np.flatnonzero(status == 0)
+            raise RuntimeError(f"Batched CPU solver failed for problems {failed[:10].tolist()}.")
+        return FitManyResult(
+            Q, w, X_transformed, explained_variance, explained_variance_ratio, mean
+        )
+
+    def truncate(self, k: int):
+        """Return a copy of this fitted model keeping only its leading ``k`` components.
+
+        Singular triplets are ordered, so the first ``k`` of a rank-``K`` fit form a rank-``k``
+        model (for the randomized solvers, one sketched with more oversampling than a fresh
+        rank-``k`` fit). One fit at the largest rank of interest therefore serves every smaller
+        rank without refitting. The copy owns its fitted arrays and has no ``plan``, so refitting
+        either model leaves the other unchanged.
+        """
+        import copy
+
+        if self._Q is None:
+            raise AttributeError("truncate() is not available before fit/fit_transform.")
+        k = int(k)
+        if not 1 <= k <= self.n_components_:
+            raise ValueError(f"k must be between 1 and {self.n_components_}, got {k}.")
+        est = copy.copy(self)
+        est.plan = None
+        est.n_components = k
+        est.n_components_ = k
+        est._Q = self._Q[:k].copy()
+        est._w = self._w[:k].copy()
+        est._U = self._U[:, :k].copy() if self._U is not None else None
+        est.explained_variance_ = self.explained_variance_[:k].copy()
+        est.explained_variance_ratio_ = self.explained_variance_ratio_[:k].copy()
+        if getattr(self, "mean_", None) is not None:
+            est.mean_ = self.mean_.copy()
+        return est
+
+    def components_path(self, ranks=None) -> dict:
+        """``{k: self.truncate(k)}`` for each k in ``ranks`` (default ``1..n_components_``)."""
+        if ranks is None:
+            if self.n_components_ is None:
+                raise AttributeError("components_path() is not available before fit/fit_transform.")
+            ranks = range(1, self.n_components_ + 1)
+        return {int(k): self.truncate(k) for k in ranks}
+
+    def partial_fit(self, X: np.ndarray, y=None):
+        """Update the fit with one batch of rows (CPU backend).
+
+        Each call merges the batch into the current rank-k factor, so the cost per batch does not
+        depend on how many rows were seen before. A call to fit/fit_transform discards the
+        incremental state.
+        """
+        self._partial_fit(X, center=False)
+        return self
+
+    def _partial_fit(self, X, center: bool) -> None:
+        import scipy.sparse
+
+        if isinstance(self.n_components, float):
+            raise ValueError("partial_fit requires an integer n_components.")
+        if self.backend == "gpu":
+            raise ValueError("partial_fit is only supported by the CPU backend.")
+        if scipy.sparse.issparse(X):
+            X = X.toarray()
         X = np.ascontiguousarray(X, dtype=np.float32)
-        return X @ self.components_.T
+        n, m = X.shape
+
+        if self.n_samples_seen_ is None:
+            k = min(self.n_components, m)
+            if n < k:
+                raise ValueError(
+                    f"The first partial_fit batch needs at least n_components={k} rows, got {n}."
+                )
+            Q = np.zeros((k, m), dtype=np.float32)
+            w = np.zeros((k,), dtype=np.float32)
+            mean = np.zeros((m,), dtype=np.float32)
+            n_seen = 0
+            total_sq = ctypes.c_double(0.0)
+        else:
+            k, m_fit = self._Q.shape
+            if m != m_fit:
+                raise ValueError(f"X has {m} features, but the model was fit with {m_fit}.")
+            Q = self._Q.copy()
+            w = self._w.copy()
+            mean = self._running_mean.copy()
+            n_seen = self.n_samples_seen_
+            total_sq = ctypes.c_double(self._total_sq)
+        explained_variance = np.zeros((k,), dtype=np.float32)
+        explained_variance_ratio = np.zeros((k,), dtype=np.float32)
+
+        info = fit_info()
+        p = self._build_params(n, m, k, info)
+        fn = _load_incremental_cpu_lib()
+
+        fn(
+            _as_fptr(X),
+            _as_fptr(Q),
+            _as_fptr(w),
+            k,
+            _as_fptr(mean),
+            ctypes.byref(total_sq),
+            n_seen,
+            1 if center else 0,
+            _as_fptr(explained_variance),
+            _as_fptr(explained_variance_ratio),
+            p,
+        )
+
+        if int(info.k) != k:
+            raise RuntimeError("Incremental CPU update failed.")
+        self._store_fit_info(info, "cpu")
+        self.n_components_ = k
+        self.n_samples_seen_ = n_seen + n
+        self._running_mean = mean
+        self._total_sq = float(total_sq.value)
+        self._Q = Q
+        self._w = w
+        self._U = None
+        self.explained_variance_ = explained_variance
+        self.explained_variance_ratio_ = explained_variance_ratio
+
+    # Centering and per-component scaling applied by transform(); PCA overrides these.
+    def _score_mean(self) -> Optional[np.ndarray]:
+        return None
+
+    def _score_scale(self) -> Optional[np.ndarray]:
+        return None
+
+    def _scoring_layout(self, X) -> tuple[np.ndarray, int, int]:
+        """Dense X for the native scoring kernels, scored in float64 if X or the model is."""
+        Q = self.components_
+        X, col_major, ld = _dense_layout(X, dtype=np.float64 if Q.dtype == np.float64 else None)
+        if X.shape[1] != Q.shape[1]:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the model was fit with {Q.shape[1]}."
+            )
+        return X, col_major, ld
+
+    def transform(self, X: np.ndarray, *, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Project X onto the components (after centering on ``mean_`` for PCA).
+
+        Dense inputs are scored by the CPU library in parallel row blocks, without a centered
+        copy of X. float32 and float64 arrays in C, Fortran or row-strided layout are read in
+        place (a float64 X is scored in float64 against a float32 model); other dtypes are
+        converted once. ``out`` receives the scores as in ``fit_transform``. The result has the
+        components' dtype.
+        """
+        import scipy.sparse
+
+        Q = self.components_
+        dtype = Q.dtype
+        mean = self._score_mean()
+        scale = self._score_scale()
+        if scipy.sparse.issparse(X) or not cpu_built():
+            Z = np.asarray(X @ Q.T, dtype=dtype)
+            if mean is not None:
+                Z -= mean @ Q.T
+            if scale is not None:
+                Z *= scale
+            return _copy_into(out, Z)
+
+        X, col_major, ld = self._scoring_layout(X)
+        n, m = X.shape
+        k = Q.shape[0]
+        Z = _check_out(out, (n, k), dtype) if out is not None else np.empty((n, k), dtype=dtype)
+        if n == 0 or k == 0:
+            return Z
+
+        cdtype = X.dtype
+        ctype = _ctype(cdtype)
+        Z_c = Z if cdtype == dtype else np.empty((n, k), dtype=cdtype)
+        Q_c, mean_c, scale_c = (
+            np.ascontiguousarray(a, dtype=cdtype) if a is not None else None
+            for a in (Q, mean, scale)
+        )
+        fn = _load_transform_double_cpu_lib() if cdtype == np.float64 else _load_transform_cpu_lib()
+        fn(
+            _as_ptr(X, ctype),
+            col_major,
+            ld,
+            _as_ptr(Q_c, ctype),
+            _as_ptr(mean_c, ctype) if mean_c is not None else None,
+            _as_ptr(scale_c, ctype) if scale_c is not None else None,
+            _as_ptr(Z_c, ctype),
+            self._build_params(n, m, k),
+        )
+        if Z_c is not Z:
+            Z[...] = Z_c
+        return Z
+
+    def inverse_transform(self, Z: np.ndarray, *, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Map scores back to feature space: ``Z @ components_`` (plus ``mean_`` for PCA).
+
+        Whitened PCA scores are unscaled first. The CPU library writes the result in parallel row
+        blocks, each seeded with the mean and finished by one GEMM. ``out`` takes a writable
+        C-contiguous ``(n_samples, n_features)`` array of the components' dtype.
+        """
+        Q = self.components_
+        dtype = Q.dtype
+        k, m = Q.shape
+        Z = np.ascontiguousarray(Z, dtype=dtype)
+        if Z.ndim != 2 or Z.shape[1] != k:
+            raise ValueError(f"Z has shape {Z.shape}, expected (n_samples, {k}).")
+        scale = self._score_scale()
+        if scale is not None:
+            with np.errstate(divide="ignore"):
+                Q = (Q * np.where(scale > 0, 1.0 / scale, 0.0)[:, None]).astype(dtype)
+        mean = self._score_mean()
+        n = Z.shape[0]
+        X = _check_out(out, (n, m), dtype) if out is not None else np.empty((n, m), dtype=dtype)
+        if n == 0:
+            return X
+        if not cpu_built():
+            np.matmul(Z, Q, out=X)
+            if mean is not None:
+                X += mean
+            return X
+
+        ctype = _ctype(dtype)
+        Q = np.ascontiguousarray(Q)
+        fn = (
+            _load_inverse_transform_double_cpu_lib()
+            if dtype == np.float64
+            else _load_inverse_transform_cpu_lib()
+        )
+        fn(
+            _as_ptr(Z, ctype),
+            _as_ptr(Q, ctype),
+            _as_ptr(mean, ctype) if mean is not None else None,
+            _as_ptr(X, ctype),
+            self._build_params(n, m, k),
+        )
+        return X
+
+    def reconstruction_error(self, X) -> np.ndarray:
+        """Squared distance of each row of X from its reconstruction from the components.
+
+        Uses ``||x - mean_||^2 - ||(x - mean_) V^T||^2``: the CPU library scores row blocks with
+        one k-wide GEMM each, so no reconstruction or other ``n_samples x n_features`` temporary
+        is formed. Rows lying almost entirely in the component span lose relative accuracy
+        (about ``1e-7`` of ``||x - mean_||^2`` in float32).
+        """
+        return self._row_residuals(X, None)[0]
+
+    def _row_residuals(
+        self, X, weights: Optional[np.ndarray]
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Per-row squared residuals and, with ``weights``, ``sum_c weights_c z_c^2``."""
+        import scipy.sparse
+
+        Q = self.components_
+        dtype = Q.dtype
+        mean = self._score_mean()
+        if scipy.sparse.issparse(X) or not cpu_built():
+            sparse = scipy.sparse.issparse(X)
+            if not sparse:
+                X = np.asarray(X, dtype=np.float64)
+            Z = np.asarray(X @ Q.T, dtype=np.float64)
+            if sparse:
+                sq = np.asarray(X.multiply(X).sum(axis=1), dtype=np.float64).ravel()
+            else:
+                sq = np.einsum("ij,ij->i", X, X)
+            if mean is not None:
+                mu = mean.astype(np.float64)
+                Z -= mu @ Q.T
+                sq += mu @ mu - 2.0 * np.asarray(X @ mu, dtype=np.float64).ravel()
+            Z2 = Z * Z
+            err = np.maximum(sq - Z2.sum(axis=1), 0.0).astype(dtype)
+            return err, (Z2 @ weights).astype(dtype) if weights is not None else None
+
+        X, col_major, ld = self._scoring_layout(X)
+        n, m = X.shape
+        cdtype = X.dtype
+        ctype = _ctype(cdtype)
+        err = np.empty((n,), dtype=cdtype)
+        weighted = np.empty((n,), dtype=cdtype) if weights is not None else None
+        if n == 0:
+            return err.astype(dtype), weighted
+        Q_c, mean_c, weights_c = (
+            np.ascontiguousarray(a, dtype=cdtype) if a is not None else None
+            for a in (Q, mean, weights)
+        )
+        fn = (
+            _load_reconstruction_error_double_cpu_lib()
+            if cdtype == np.float64
+            else _load_reconstruction_error_cpu_lib()
+        )
+        fn(
+            _as_ptr(X, ctype),
+            col_major,
+            ld,
+            _as_ptr(Q_c, ctype),
+            _as_ptr(mean_c, ctype) if mean_c is not None else None,
+            _as_ptr(weights_c, ctype) if weights_c is not None else None,
+            _as_ptr(err, ctype),
+            _as_ptr(weighted, ctype) if weighted is not None else None,
+            self._build_params(n, m, Q.shape[0]),
+        )
+        if weighted is not None:
+            weighted = weighted.astype(dtype, copy=False)
+        return err.astype(dtype, copy=False), weighted
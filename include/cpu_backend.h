@@ -15,7 +15,16 @@
 
 extern "C" {
 
-// Mirror of Python-side params struct (dimreduce4gpu/lib_dimreduce4gpu.py).
+// Solver diagnostics, filled in by the CPU backend when params.info is non-null.
+struct fit_info {
+  int32_t n_iter;     // power iterations / Krylov steps actually run
+  int64_t n_matvecs;  // products of X or X^T with a single vector
+  int32_t k;          // number of components produced (chosen by the adaptive entry points)
+};
+
+// Mirror of Python-side params struct (dimreduce4gpu/lib_dimreduce4gpu.py). X_n and X_m are
+// 32-bit, but the CPU backend indexes X and every output with 64-bit offsets, so X_n * X_m (and
+// X_n * k) may exceed 2^31. BLAS/LAPACK must be LP64.
 struct params {
   int32_t X_n;
   int32_t X_m;
@@ -26,7 +35,13 @@ struct params {
   float tol;
   int32_t verbose;
   int32_t gpu_id;
-  bool whiten;
+  bool whiten;  // PCA: X_transformed holds whitened scores, U * sqrt(X_n - 1)
+  fit_info* info;
+  // Warm start for the randomized solver: init_k rows of length X_m (row-major, in the entry
+  // point's float type) seeding the range finder, typically a previous fit's components. Other
+  // solvers ignore it; null means a purely Gaussian start.
+  const void* init;
+  int32_t init_k;
 };
 
 DIMREDUCE4CPU_API void truncated_svd_float(
@@ -39,6 +54,21 @@ DIMREDUCE4CPU_API void truncated_svd_float(
     float* explained_variance_ratio,
     params p);
 
+// Sparse TruncatedSVD. csc=0: CSR (indptr has X_n+1 entries, indices are column ids);
+// csc=1: CSC (indptr has X_m+1 entries, indices are row ids).
+DIMREDUCE4CPU_API void truncated_svd_sparse_float(
+    const int64_t* indptr,
+    const int32_t* indices,
+    const float* data,
+    int32_t csc,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
 DIMREDUCE4CPU_API void pca_float(
     const float* X,
     float* Q,
@@ -50,4 +80,534 @@ DIMREDUCE4CPU_API void pca_float(
     float* mean,
     params p);
 
+// Dense entry points that read X in place in its own layout. col_major=0: row-major with row
+// stride ld >= X_m (C order, or a view of selected rows); col_major=1: column-major with column
+// stride ld >= X_n (Fortran order). Outputs are as for truncated_svd_float / pca_float. Only the
+// exact solver copies X, and it copies it once. On every dense and sparse entry point U and
+// X_transformed may be null, in which case only the components and spectrum are produced.
+DIMREDUCE4CPU_API void truncated_svd_strided_float(
+    const float* X,
+    int32_t col_major,
+    int64_t ld,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+DIMREDUCE4CPU_API void pca_strided_float(
+    const float* X,
+    int32_t col_major,
+    int64_t ld,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+// float64 counterparts of the dense entry points, with the same layout rules. Every solver
+// computes in double end to end (dgesdd/dgesvdx/dgeqrf/dgemm), so results keep float64
+// accuracy on ill-conditioned inputs.
+DIMREDUCE4CPU_API void truncated_svd_double(
+    const double* X,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    params p);
+
+DIMREDUCE4CPU_API void pca_double(
+    const double* X,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    double* mean,
+    params p);
+
+DIMREDUCE4CPU_API void truncated_svd_strided_double(
+    const double* X,
+    int32_t col_major,
+    int64_t ld,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    params p);
+
+DIMREDUCE4CPU_API void pca_strided_double(
+    const double* X,
+    int32_t col_major,
+    int64_t ld,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    double* mean,
+    params p);
+
+// Dense entry points that may overwrite X (copy=False). Layout rules are those of the strided
+// entry points. The exact solver centers (PCA) and factors X in its own storage instead of
+// copying it; the other solvers only read X.
+DIMREDUCE4CPU_API void truncated_svd_inplace_float(
+    float* X,
+    int32_t col_major,
+    int64_t ld,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+DIMREDUCE4CPU_API void pca_inplace_float(
+    float* X,
+    int32_t col_major,
+    int64_t ld,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+DIMREDUCE4CPU_API void truncated_svd_inplace_double(
+    double* X,
+    int32_t col_major,
+    int64_t ld,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    params p);
+
+DIMREDUCE4CPU_API void pca_inplace_double(
+    double* X,
+    int32_t col_major,
+    int64_t ld,
+    double* Q,
+    double* w,
+    double* U,
+    double* X_transformed,
+    double* explained_variance,
+    double* explained_variance_ratio,
+    double* mean,
+    params p);
+
+// Scores of dense X (layout as for the strided entry points) against fitted components Q
+// (p.k x p.X_m, row-major): out = (X - mean) Q^T diag(scale), row-major p.X_n x p.k. mean and
+// scale may be null. Row blocks are scored in parallel by one GEMM each; centering happens per
+// block, so no centered copy of X is formed.
+DIMREDUCE4CPU_API void transform_strided_float(
+    const float* X,
+    int32_t col_major,
+    int64_t ld,
+    const float* Q,
+    const float* mean,
+    const float* scale,
+    float* out,
+    params p);
+
+DIMREDUCE4CPU_API void transform_strided_double(
+    const double* X,
+    int32_t col_major,
+    int64_t ld,
+    const double* Q,
+    const double* mean,
+    const double* scale,
+    double* out,
+    params p);
+
+// Per-row squared reconstruction error of dense X against the fitted components Q (p.k x p.X_m,
+// row-major) around `mean` (may be null): err = ||x - mean||^2 - ||Q (x - mean)||^2, one k-wide
+// GEMM per row block. When `weights` (p.k) is non-null, weighted = sum_c weights_c z_c^2 is written
+// too (PCA score_samples). err and weighted hold p.X_n values.
+DIMREDUCE4CPU_API void reconstruction_error_strided_float(
+    const float* X,
+    int32_t col_major,
+    int64_t ld,
+    const float* Q,
+    const float* mean,
+    const float* weights,
+    float* err,
+    float* weighted,
+    params p);
+
+DIMREDUCE4CPU_API void reconstruction_error_strided_double(
+    const double* X,
+    int32_t col_major,
+    int64_t ld,
+    const double* Q,
+    const double* mean,
+    const double* weights,
+    double* err,
+    double* weighted,
+    params p);
+
+// out = Z Q + mean (row-major p.X_n x p.X_m) for scores Z (p.X_n x p.k, row-major); mean may be
+// null.
+DIMREDUCE4CPU_API void inverse_transform_float(
+    const float* Z,
+    const float* Q,
+    const float* mean,
+    float* out,
+    params p);
+
+DIMREDUCE4CPU_API void inverse_transform_double(
+    const double* Z,
+    const double* Q,
+    const double* mean,
+    double* out,
+    params p);
+
+// Sparse PCA: centering is applied implicitly inside the randomized products, so no dense or
+// centered copy of X is formed. Same CSR/CSC convention as truncated_svd_sparse_float.
+DIMREDUCE4CPU_API void pca_sparse_float(
+    const int64_t* indptr,
+    const int32_t* indices,
+    const float* data,
+    int32_t csc,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+// Adaptive-rank fit: finds the smallest k whose leading singular values capture more than
+// `target` (0 < target < 1) of the total energy, growing a randomized QB factorization block by
+// block. X is read in place as in truncated_svd_strided_float. mean == nullptr fits a
+// TruncatedSVD (energy ||X||_F^2). Otherwise it fits a PCA: the column means are written to
+// `mean` and the energy is that of the centered matrix. The chosen k (at most p.k) is reported
+// in p.info->k, and the result stays in the library: copy it into k x m components and length-k
+// buffers with adaptive_result_copy_float, then free it with adaptive_result_destroy. Returns
+// nullptr on failure.
+DIMREDUCE4CPU_API void* adaptive_svd_strided_float(
+    const float* X,
+    int32_t col_major,
+    int64_t ld,
+    float target,
+    float* mean,
+    params p);
+
+DIMREDUCE4CPU_API void* adaptive_svd_strided_double(
+    const double* X,
+    int32_t col_major,
+    int64_t ld,
+    float target,
+    double* mean,
+    params p);
+
+DIMREDUCE4CPU_API void* adaptive_svd_sparse_float(
+    const int64_t* indptr,
+    const int32_t* indices,
+    const float* data,
+    int32_t csc,
+    float target,
+    float* mean,
+    params p);
+
+// Writes the first p.info->k triplets of an adaptive result: components (k x m, row-major),
+// singular values and, when non-null, the explained variance. Use the _double variant for
+// results of adaptive_svd_strided_double.
+DIMREDUCE4CPU_API void adaptive_result_copy_float(
+    const void* result,
+    float* Q,
+    float* w,
+    float* explained_variance,
+    float* explained_variance_ratio);
+
+DIMREDUCE4CPU_API void adaptive_result_copy_double(
+    const void* result,
+    double* Q,
+    double* w,
+    double* explained_variance,
+    double* explained_variance_ratio);
+
+DIMREDUCE4CPU_API void adaptive_result_destroy(void* result);
+
+// Incremental fit: merges one batch of rows (p.X_n x p.X_m, row-major) into a running rank-p.k
+// factorization. Q (p.k x m components) and w (p.k singular values) hold the current factor on
+// entry (k_prev valid rows; ignored when n_seen == 0) and the updated factor on exit. mean and
+// total_sq (running sum of squared deviations from the mean) are updated in place. center != 0
+// fits a PCA; otherwise a TruncatedSVD of the uncentered rows. The explained variance covers all
+// n_seen + p.X_n rows.
+DIMREDUCE4CPU_API void incremental_svd_update_float(
+    const float* X_batch,
+    float* Q,
+    float* w,
+    int32_t k_prev,
+    float* mean,
+    double* total_sq,
+    int64_t n_seen,
+    int32_t center,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+// Out-of-core fit over a row-chunked matrix, driven one pass at a time by the caller. V is an
+// orthonormal (or, in the first pass, random) m x l basis, column-major. Each chunk
+// (p.X_n x p.X_m, row-major, p.k = l) is shifted to X_s = X_c - 1 shift^T (no shift when null)
+// and adds Z += X_s^T X_s V (m x l) and the upper triangle of G += V^T X_s^T X_s V (l x l), both in
+// double. col_stats ([count, mean(m), m2(m)], zeroed before the first chunk) collects the column
+// statistics of the unshifted chunks when non-null. Pass the same shift to every call of a fit.
+DIMREDUCE4CPU_API void streamed_gram_accumulate_float(
+    const float* X_chunk,
+    const float* shift,
+    const float* V,
+    double* Z,
+    double* G,
+    double* col_stats,
+    params p);
+
+// Ends a power pass: undoes the shift of Z (and centers it with col_stats when center != 0),
+// then orthonormalizes it into V_out. p.X_m = m, p.k = l. p.info->k is set to l on success and 0
+// on failure.
+DIMREDUCE4CPU_API void streamed_range_update_float(
+    const double* Z,
+    const float* V,
+    const double* col_stats,
+    const float* shift,
+    int32_t center,
+    float* V_out,
+    params p);
+
+// Ends the last pass: Rayleigh-Ritz on G over the basis V (p.X_n = l, p.X_m = m) gives the top
+// p.k components (row-major), singular values and explained variance. The column means go to
+// `mean` when it is non-null. p.info->k receives the number of components written.
+DIMREDUCE4CPU_API void streamed_svd_finalize_float(
+    const double* G,
+    const float* V,
+    const double* col_stats,
+    const float* shift,
+    int32_t center,
+    float* Q,
+    float* w,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+// Single-pass sketch update for one row batch (p.X_n x p.X_m, row-major; p.k = s range-sketch
+// columns). The sketches are taken of the rows minus `shift` (a fixed reference row of length m,
+// e.g. the first batch mean) to keep large offsets out of the float32 products. Omega is the m x s range test matrix and Psi_batch the t x p.X_n slice of the
+// co-range test matrix for these rows (both column-major). Writes the batch's rows of the range
+// sketch Y = X Omega to Y_batch (p.X_n x s, row-major). Adds Psi_batch X_batch to the co-range
+// sketch W (t x m, column-major, double) and merges the column statistics into col_stats
+// ([count, mean(m), m2(m)], zeroed before the first batch).
+DIMREDUCE4CPU_API void sketch_update_float(
+    const float* X_batch,
+    const float* shift,
+    const float* Omega,
+    const float* Psi_batch,
+    int32_t t,
+    float* Y_batch,
+    double* W,
+    double* col_stats,
+    params p);
+
+// Low-rank factorization from the sketches of all p.X_n rows: Y (p.X_n x s, row-major), Psi
+// (t x p.X_n, column-major), W, Omega and shift as above. Writes the top p.k components (row-major),
+// singular values and explained variance. U (p.X_n x p.k, row-major) and mean (centered fit
+// when center != 0) are written when non-null. p.info->k receives the rank produced.
+DIMREDUCE4CPU_API void sketch_finalize_float(
+    const float* Y,
+    const float* Psi,
+    const double* W,
+    const float* Omega,
+    const float* shift,
+    const double* col_stats,
+    int32_t t,
+    int32_t s,
+    int32_t center,
+    float* Q,
+    float* w,
+    float* U,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+// Frequent Directions sketch update. B is a (2 * p.k) x p.X_m row-major buffer whose first
+// *n_filled rows hold the sketch (ell = p.k). The p.X_n rows of X (row-major) are appended, and a
+// shrink (SVD, subtract the ell-th squared singular value) runs whenever the buffer is full. The
+// shrink amounts are added to *shrunk, which bounds ||X^T X - B^T B||_2. Column statistics
+// ([count, mean(m), m2(m)]) are merged into col_stats when it is non-null. Merging two sketches
+// is an update with the other sketch's rows.
+DIMREDUCE4CPU_API void frequent_directions_update_float(
+    const float* X,
+    float* B,
+    int32_t* n_filled,
+    double* shrunk,
+    double* col_stats,
+    params p);
+
+// Top p.k components (row-major), singular values and explained variance of a Frequent
+// Directions sketch B (n_filled x p.X_m, row-major). The explained-variance ratio uses the
+// column statistics of the sketched rows.
+DIMREDUCE4CPU_API void frequent_directions_finalize_float(
+    const float* B,
+    int32_t n_filled,
+    const double* col_stats,
+    float* Q,
+    float* w,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+// Merges the column statistics of X (p.X_n x p.X_m, row-major) into col_stats
+// ([count, mean(m), m2(m)]).
+DIMREDUCE4CPU_API void column_stats_float(const float* X, double* col_stats, params p);
+
+// Row-partitioned randomized SVD with TSQR (communication-avoiding QR) reductions. Each partition
+// X_i (p.X_n x p.X_m rows, row-major; p.k = l) runs tsqr_local_float and tsqr_apply_float, and
+// the coordinator runs tsqr_combine_float and tsqr_finalize_float. `mean` (nullable) centers
+// implicitly for PCA. All dense blocks are column-major.
+//
+// Q = QR factor of X_i Z (p.X_n x l) and R its l x l triangular factor (needs p.X_n >= l).
+// p.info->k is set to l on success and 0 on failure.
+DIMREDUCE4CPU_API void tsqr_local_float(
+    const float* X,
+    const float* Z,
+    const float* mean,
+    float* Q,
+    float* R,
+    params p);
+
+// QR of the stacked local R factors (p.X_n x p.k, in place): R_stack becomes the orthonormal
+// factor whose l-row blocks are broadcast back to the partitions. R receives the global R.
+DIMREDUCE4CPU_API void tsqr_combine_float(float* R_stack, float* R, params p);
+
+// Q <- Q Q_block (this partition's rows of the global Q factor) and Z = X_i^T Q (m x l), this
+// partition's share of the coordinator's sum X^T Q.
+DIMREDUCE4CPU_API void tsqr_apply_float(
+    const float* X,
+    float* Q,
+    const float* Q_block,
+    const float* mean,
+    float* Z,
+    params p);
+
+// Top p.k triplets of B = Z^T (p.X_n = l rows, p.X_m = m): components (row-major), singular
+// values, explained variance from col_stats, and U_small (l x k, row-major) so that the left
+// singular vectors of X are Q U_small.
+DIMREDUCE4CPU_API void tsqr_finalize_float(
+    const float* Z,
+    const double* col_stats,
+    float* Q,
+    float* w,
+    float* U_small,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+// Column-partitioned randomized SVD for very wide matrices. X is the full row-major
+// p.X_n x p.X_m matrix and each call reads only columns [col_lo, col_hi), so workers can split
+// the columns between them. `mean` (nullable) holds the means of columns [col_lo, col_hi) and
+// centers implicitly for PCA. Q and Y are n x l,
+// column-major; G is l x l (upper triangle, accumulated in double).
+//
+// p.k = l. With Q == nullptr this is the first pass, Y += X_J Omega_J, where the Gaussian Omega
+// is generated from (p.random_state, column, sketch index) and never stored. Otherwise
+// Y += X_J X_J^T Q when Y is given and G += Q^T X_J X_J^T Q when G is given.
+DIMREDUCE4CPU_API void wide_sketch_block_float(
+    const float* X,
+    const float* mean,
+    const float* Q,
+    int64_t col_lo,
+    int64_t col_hi,
+    float* Y,
+    double* G,
+    params p);
+
+// Ritz step from the summed G (p.X_n = n, p.X_m = l, p.k = k): singular values w, U (n x k,
+// row-major), W_scaled = W diag(1/w) (l x k, column-major) and explained variance against
+// total_var. p.info->k is set to k on success.
+DIMREDUCE4CPU_API void wide_finalize_float(
+    const float* Q,
+    const double* G,
+    double total_var,
+    float* w,
+    float* U,
+    float* W_scaled,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    params p);
+
+// Components for columns [col_lo, col_hi): W_scaled^T Q^T X_J, written row-major
+// p.k x (col_hi - col_lo).
+DIMREDUCE4CPU_API void wide_components_block_float(
+    const float* X,
+    const float* mean,
+    const float* Q,
+    const float* W_scaled,
+    int32_t l,
+    int64_t col_lo,
+    int64_t col_hi,
+    float* C,
+    params p);
+
+// Reusable solver plan for repeated dense fits of one shape (p.X_n x p.X_m, p.k components).
+// svd_plan_create picks the solver from p.algorithm once and returns nullptr for algorithms a
+// plan cannot run ("lanczos"). The plan owns every scratch buffer and caches LAPACK workspace
+// sizes, so executions after the first do no workspace queries and no heap allocation.
+DIMREDUCE4CPU_API void* svd_plan_create(params p);
+
+DIMREDUCE4CPU_API void svd_plan_destroy(void* plan);
+
+// Same outputs as truncated_svd_float, or as pca_float when `mean` is non-null. p.X_n and p.X_m
+// must match the plan; n_iter, random_state and tol are read from p on every execution.
+// p.info->k is set to the number of components on success and 0 on failure.
+DIMREDUCE4CPU_API void svd_plan_execute_float(
+    void* plan,
+    const float* X,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    params p);
+
+// Fits `batch` independent problems of the same shape in one call. X holds them back to back
+// (batch x p.X_n x p.X_m, row-major), and every output is stacked the same way:
+// Q (batch x k x m), w (batch x k), U (batch x n x k, nullable), X_transformed (batch x n x k),
+// explained variance (batch x k, nullable) and, for PCA, mean (batch x m; nullptr gives
+// TruncatedSVD). Problems are spread over OpenMP threads, and each thread reuses one solver plan.
+// status[b] (nullable) is 1 when problem b succeeded. p.info receives the largest n_iter, the
+// total n_matvecs, and k = components per problem (0 if any problem failed).
+DIMREDUCE4CPU_API void fit_many_float(
+    const float* X,
+    int32_t batch,
+    float* Q,
+    float* w,
+    float* U,
+    float* X_transformed,
+    float* explained_variance,
+    float* explained_variance_ratio,
+    float* mean,
+    int32_t* status,
+    params p);
+
 }  // extern "C"
@@ -32,6 +32,9 @@ extern "C" {
 	  int verbose;
 	  int gpu_id;
 	  bool whiten;
+	  void *info; // CPU-backend fit diagnostics; unused by the CUDA backend
+	  const void *init; // CPU-backend warm start; unused by the CUDA backend
+	  int init_k;
 	} params;
 
 	/**
@@ -3,12 +3,25 @@
 #include <algorithm>
 #include <cmath>
 #include <cstdint>
+#include <limits>
+#include <new>
 #include <random>
 #include <string>
 #include <vector>
 
 #include <cblas.h>
 
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+// Matrix dimensions and LAPACK integers are 32-bit (LP64); element offsets are 64-bit
+// throughout, so only a single dimension is limited to 2^31 - 1. An ILP64 OpenBLAS would read
+// the int arguments of the LAPACK prototypes below as 64-bit, so refuse to build against one.
+#if defined(OPENBLAS_USE64BITINT)
+#error "dimreduce4cpu needs an LP64 BLAS/LAPACK (32-bit integers); rebuild OpenBLAS without INTERFACE64."
+#endif
+
 extern "C" {
 // LAPACK (Fortran) symbols
 void sgesdd_(char* jobz, int* m, int* n, float* a, int* lda, float* s, float* u, int* ldu,
@@ -17,8 +30,32 @@ void sgesdd_(char* jobz, int* m, int* n, float* a, int* lda, float* s, float* u,
 void sgesvd_(char* jobu, char* jobvt, int* m, int* n, float* a, int* lda, float* s, float* u, int* ldu,
             float* vt, int* ldvt, float* work, int* lwork, int* info);
 
+void sgesvdx_(char* jobu, char* jobvt, char* range, int* m, int* n, float* a, int* lda, float* vl,
+              float* vu, int* il, int* iu, int* ns, float* s, float* u, int* ldu, float* vt, int* ldvt,
+              float* work, int* lwork, int* iwork, int* info);
+
+void sgels_(char* trans, int* m, int* n, int* nrhs, float* a, int* lda, float* b, int* ldb,
+            float* work, int* lwork, int* info);
+
 void sgeqrf_(int* m, int* n, float* a, int* lda, float* tau, float* work, int* lwork, int* info);
 void sorgqr_(int* m, int* n, int* k, float* a, int* lda, float* tau, float* work, int* lwork, int* info);
+
+void dgesdd_(char* jobz, int* m, int* n, double* a, int* lda, double* s, double* u, int* ldu,
+             double* vt, int* ldvt, double* work, int* lwork, int* iwork, int* info);
+
+void dgesvd_(char* jobu, char* jobvt, int* m, int* n, double* a, int* lda, double* s, double* u, int* ldu,
+             double* vt, int* ldvt, double* work, int* lwork, int* info);
+
+void dgesvdx_(char* jobu, char* jobvt, char* range, int* m, int* n, double* a, int* lda, double* vl,
+              double* vu, int* il, int* iu, int* ns, double* s, double* u, int* ldu, double* vt, int* ldvt,
+              double* work, int* lwork, int* iwork, int* info);
+
+void dgeqrf_(int* m, int* n, double* a, int* lda, double* tau, double* work, int* lwork, int* info);
+void dorgqr_(int* m, int* n, int* k, double* a, int* lda, double* tau, double* work, int* lwork, int* info);
+
+void dsyevr_(char* jobz, char* range, char* uplo, int* n, double* a, int* lda, double* vl, double* vu,
+             int* il, int* iu, double* abstol, int* m, double* w, double* z, int* ldz, int* isuppz,
+             double* work, int* lwork, int* iwork, int* liwork, int* info);
 }
 
 namespace {
@@ -28,361 +65,2802 @@ inline bool str_eq(const char* a, const char* b) {
   return std::string(a) == std::string(b);
 }
 
-struct SVDResult {
+// Precision-generic BLAS/LAPACK calls. The dense solvers below are templates over the element
+// type T (float or double); these overloads pick the s* or d* routine with the same arguments.
+inline void xgemm(CBLAS_ORDER o, CBLAS_TRANSPOSE ta, CBLAS_TRANSPOSE tb, int m, int n, int k, float alpha,
+                  const float* A, int lda, const float* B, int ldb, float beta, float* C, int ldc) {
+  cblas_sgemm(o, ta, tb, m, n, k, alpha, A, lda, B, ldb, beta, C, ldc);
+}
+inline void xgemm(CBLAS_ORDER o, CBLAS_TRANSPOSE ta, CBLAS_TRANSPOSE tb, int m, int n, int k, double alpha,
+                  const double* A, int lda, const double* B, int ldb, double beta, double* C, int ldc) {
+  cblas_dgemm(o, ta, tb, m, n, k, alpha, A, lda, B, ldb, beta, C, ldc);
+}
+inline void xsyrk(CBLAS_ORDER o, CBLAS_UPLO uplo, CBLAS_TRANSPOSE t, int n, int k, float alpha, const float* A,
+                  int lda, float beta, float* C, int ldc) {
+  cblas_ssyrk(o, uplo, t, n, k, alpha, A, lda, beta, C, ldc);
+}
+inline void xsyrk(CBLAS_ORDER o, CBLAS_UPLO uplo, CBLAS_TRANSPOSE t, int n, int k, double alpha, const double* A,
+                  int lda, double beta, double* C, int ldc) {
+  cblas_dsyrk(o, uplo, t, n, k, alpha, A, lda, beta, C, ldc);
+}
+inline float xdot(int n, const float* x, int incx, const float* y, int incy) { return cblas_sdot(n, x, incx, y, incy); }
+inline double xdot(int n, const double* x, int incx, const double* y, int incy) {
+  return cblas_ddot(n, x, incx, y, incy);
+}
+inline void xaxpy(int n, float a, const float* x, int incx, float* y, int incy) { cblas_saxpy(n, a, x, incx, y, incy); }
+inline void xaxpy(int n, double a, const double* x, int incx, double* y, int incy) {
+  cblas_daxpy(n, a, x, incx, y, incy);
+}
+
+inline void xgesdd(char* jobz, int* m, int* n, float* a, int* lda, float* s, float* u, int* ldu, float* vt,
+                   int* ldvt, float* work, int* lwork, int* iwork, int* info) {
+  sgesdd_(jobz, m, n, a, lda, s, u, ldu, vt, ldvt, work, lwork, iwork, info);
+}
+inline void xgesdd(char* jobz, int* m, int* n, double* a, int* lda, double* s, double* u, int* ldu, double* vt,
+                   int* ldvt, double* work, int* lwork, int* iwork, int* info) {
+  dgesdd_(jobz, m, n, a, lda, s, u, ldu, vt, ldvt, work, lwork, iwork, info);
+}
+inline void xgesvd(char* jobu, char* jobvt, int* m, int* n, float* a, int* lda, float* s, float* u, int* ldu,
+                   float* vt, int* ldvt, float* work, int* lwork, int* info) {
+  sgesvd_(jobu, jobvt, m, n, a, lda, s, u, ldu, vt, ldvt, work, lwork, info);
+}
+inline void xgesvd(char* jobu, char* jobvt, int* m, int* n, double* a, int* lda, double* s, double* u, int* ldu,
+                   double* vt, int* ldvt, double* work, int* lwork, int* info) {
+  dgesvd_(jobu, jobvt, m, n, a, lda, s, u, ldu, vt, ldvt, work, lwork, info);
+}
+inline void xgesvdx(char* jobu, char* jobvt, char* range, int* m, int* n, float* a, int* lda, float* vl,
+                    float* vu, int* il, int* iu, int* ns, float* s, float* u, int* ldu, float* vt, int* ldvt,
+                    float* work, int* lwork, int* iwork, int* info) {
+  sgesvdx_(jobu, jobvt, range, m, n, a, lda, vl, vu, il, iu, ns, s, u, ldu, vt, ldvt, work, lwork, iwork, info);
+}
+inline void xgesvdx(char* jobu, char* jobvt, char* range, int* m, int* n, double* a, int* lda, double* vl,
+                    double* vu, int* il, int* iu, int* ns, double* s, double* u, int* ldu, double* vt, int* ldvt,
+                    double* work, int* lwork, int* iwork, int* info) {
+  dgesvdx_(jobu, jobvt, range, m, n, a, lda, vl, vu, il, iu, ns, s, u, ldu, vt, ldvt, work, lwork, iwork, info);
+}
+inline void xgeqrf(int* m, int* n, float* a, int* lda, float* tau, float* work, int* lwork, int* info) {
+  sgeqrf_(m, n, a, lda, tau, work, lwork, info);
+}
+inline void xgeqrf(int* m, int* n, double* a, int* lda, double* tau, double* work, int* lwork, int* info) {
+  dgeqrf_(m, n, a, lda, tau, work, lwork, info);
+}
+inline void xorgqr(int* m, int* n, int* k, float* a, int* lda, float* tau, float* work, int* lwork, int* info) {
+  sorgqr_(m, n, k, a, lda, tau, work, lwork, info);
+}
+inline void xorgqr(int* m, int* n, int* k, double* a, int* lda, double* tau, double* work, int* lwork, int* info) {
+  dorgqr_(m, n, k, a, lda, tau, work, lwork, info);
+}
+
+// Keeps a parameter out of template argument deduction.
+template <typename T>
+struct NonDeduced {
+  using type = T;
+};
+
+// LAPACK returns the optimal lwork in the floating-point work array. Above 2^24 a float cannot
+// hold every integer, so round the query result up rather than truncating it.
+template <typename T>
+int lwork_from_query(T wkopt) {
+  const double lw = std::ceil(static_cast<double>(wkopt) * (1.0 + std::numeric_limits<T>::epsilon()));
+  return static_cast<int>(std::min(lw, static_cast<double>(std::numeric_limits<int>::max())));
+}
+
+template <typename T>
+struct SVDResultT {
   // Column-major:
   // U: n x k (ldu=n), S: k, VT: k x m (ldvt=k)
-  std::vector<float> U;
-  std::vector<float> S;
-  std::vector<float> VT;
+  std::vector<T> U;
+  std::vector<T> S;
+  std::vector<T> VT;
   int n = 0;
   int m = 0;
   int k = 0;
+  // Solver diagnostics reported through params.info.
+  int n_iter = 0;
+  int64_t n_matvecs = 0;
 };
+using SVDResult = SVDResultT<float>;
 
-std::vector<float> to_col_major(const float* X_row, int n, int m) {
-  std::vector<float> X_col(static_cast<size_t>(n) * static_cast<size_t>(m));
-  for (int i = 0; i < n; ++i) {
+// LAPACK workspace sizes for one routine, cached for the dimensions they were queried with.
+struct LworkSlot {
+  int dims[3] = {-1, -1, -1};
+  int lwork = 0;
+  int liwork = 0;
+
+  bool matches(int a, int b, int c) const { return dims[0] == a && dims[1] == b && dims[2] == c; }
+  void store(int a, int b, int c, int lw, int liw = 0) {
+    dims[0] = a;
+    dims[1] = b;
+    dims[2] = c;
+    lwork = lw;
+    liwork = liw;
+  }
+};
+
+// Scratch buffers and LAPACK workspace sizes for the dense solvers. Buffers are resized in place
+// and never shrink, so once a Workspace has served one fit, later fits of the same shape skip
+// both the workspace queries and all heap allocation. One-off calls use a fresh Workspace;
+// an SVDPlan keeps its own alive between executions.
+template <typename T>
+struct WorkspaceT {
+  // Solver-level buffers.
+  std::vector<T> omega, y, z, b, s, uhat, vt_full, u_full, a, gf, e, vt_col, block;
+  std::vector<double> g, evals, evecs, ritz, prev_ritz, mean, m2, partial;
+  // LAPACK scratch.
+  std::vector<T> tau, work;
+  std::vector<double> dwork, eig_w, eig_z;
+  std::vector<int> iwork, isuppz;
+  LworkSlot geqrf, orgqr, gesdd, gesvdx, syevr;
+};
+using Workspace = WorkspaceT<float>;
+
+// Dense n x m input read in place: row-major with row stride ld >= m (C order, or a view of
+// selected rows), or column-major with column stride ld >= n (Fortran order). As a column-major
+// BLAS operand, data holds X (col_major) or X^T (row-major), with leading dimension ld.
+template <typename T>
+struct DenseViewT {
+  const T* data = nullptr;
+  int n = 0;
+  int m = 0;
+  int64_t ld = 0;
+  bool col_major = false;
+
+  static DenseViewT row_major(const T* X, int rows, int cols) { return {X, rows, cols, cols, false}; }
+
+  T at(int i, int j) const {
+    return col_major ? data[static_cast<size_t>(j) * static_cast<size_t>(ld) + static_cast<size_t>(i)]
+                     : data[static_cast<size_t>(i) * static_cast<size_t>(ld) + static_cast<size_t>(j)];
+  }
+};
+using DenseView = DenseViewT<float>;
+
+// Tiling of the dense preprocessing passes. Row-major X is split into row chunks x column
+// tiles: each task reads its tile row by row and, when it transposes, writes kPassRows-long runs
+// of every destination column. Chunks are fixed by the shape rather than the thread count, and
+// their partial sums are reduced in chunk order, so results do not depend on the thread count.
+constexpr int kPassTileCols = 256;
+constexpr int kPassRows = 32;
+constexpr int kPassMaxChunks = 64;
+constexpr int kPassMinChunkRows = 1024;
+// Upper bound on the chunk partial sums kept by one pass, in doubles.
+constexpr int64_t kPassMaxPartials = int64_t{1} << 21;
+// Passes over fewer elements stay on the calling thread.
+constexpr int64_t kPassMinParallel = int64_t{1} << 16;
+
+inline bool pass_parallel(int rows, int cols) {
+  return static_cast<int64_t>(rows) * static_cast<int64_t>(cols) >= kPassMinParallel;
+}
+
+inline int pass_chunks(int n, int m) {
+  const int64_t by_rows = std::max(1, n / kPassMinChunkRows);
+  const int64_t by_memory = std::max<int64_t>(1, kPassMaxPartials / (2 * static_cast<int64_t>(std::max(1, m))));
+  return static_cast<int>(std::min<int64_t>({kPassMaxChunks, by_rows, by_memory}));
+}
+
+template <typename T>
+void to_col_major(const DenseViewT<T>& X, std::vector<T>& X_col) {
+  const int n = X.n;
+  const int m = X.m;
+  X_col.resize(static_cast<size_t>(n) * static_cast<size_t>(m));
+  T* out = X_col.data();
+  if (X.col_major) {
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(n, m))
+#endif
     for (int j = 0; j < m; ++j) {
-      X_col[static_cast<size_t>(j) * static_cast<size_t>(n) + static_cast<size_t>(i)] = X_row[i * m + j];
+      const T* col = X.data + static_cast<size_t>(j) * static_cast<size_t>(X.ld);
+      std::copy(col, col + n, out + static_cast<size_t>(j) * static_cast<size_t>(n));
     }
+    return;
   }
+  const int row_blocks = (n + kPassRows - 1) / kPassRows;
+  const int tiles = (m + kPassTileCols - 1) / kPassTileCols;
+#ifdef _OPENMP
+#pragma omp parallel for collapse(2) schedule(static) if (pass_parallel(n, m))
+#endif
+  for (int rb = 0; rb < row_blocks; ++rb) {
+    for (int t = 0; t < tiles; ++t) {
+      const int i0 = rb * kPassRows;
+      const int i1 = std::min(n, i0 + kPassRows);
+      const int j1 = std::min(m, (t + 1) * kPassTileCols);
+      for (int j = t * kPassTileCols; j < j1; ++j) {
+        T* dst = out + static_cast<size_t>(j) * static_cast<size_t>(n);
+        for (int i = i0; i < i1; ++i) dst[i] = X.data[static_cast<size_t>(i) * static_cast<size_t>(X.ld) + j];
+      }
+    }
+  }
+}
+
+void to_col_major(const float* X_row, int n, int m, std::vector<float>& X_col) {
+  to_col_major(DenseView::row_major(X_row, n, m), X_col);
+}
+
+std::vector<float> to_col_major(const float* X_row, int n, int m) {
+  std::vector<float> X_col;
+  to_col_major(X_row, n, m, X_col);
   return X_col;
 }
 
-void compute_mean_center_colmajor(const float* X_row, int n, int m, float* mean_out,
-                                 std::vector<float>& Xc_col) {
-  std::vector<double> mean_d(static_cast<size_t>(m), 0.0);
-  for (int j = 0; j < m; ++j) {
-    double acc = 0.0;
-    for (int i = 0; i < n; ++i) acc += static_cast<double>(X_row[i * m + j]);
-    mean_d[j] = acc / static_cast<double>(n);
-    mean_out[j] = static_cast<float>(mean_d[j]);
+// Column means and per-column sums of squared deviations from them (m2) in one pass over X in
+// its storage order, optionally writing the column-major copy X_col (n x m) on the way. Squares
+// are taken around the first row, m2_j = sum_i (x_ij - x_0j)^2 - n (mean_j - x_0j)^2, so a large
+// column offset does not cancel the variance. `partial` is scratch for the chunk sums.
+template <typename T>
+void column_moments(const DenseViewT<T>& X, std::vector<double>& mean_d, std::vector<double>& m2,
+                    std::vector<double>& partial, T* X_col = nullptr) {
+  const int n = X.n;
+  const int m = X.m;
+  mean_d.assign(static_cast<size_t>(m), 0.0);
+  m2.assign(static_cast<size_t>(m), 0.0);
+  if (n <= 0) return;
+  const double inv_n = 1.0 / static_cast<double>(n);
+  if (X.col_major) {
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(n, m))
+#endif
+    for (int j = 0; j < m; ++j) {
+      const T* col = X.data + static_cast<size_t>(j) * static_cast<size_t>(X.ld);
+      if (X_col) std::copy(col, col + n, X_col + static_cast<size_t>(j) * static_cast<size_t>(n));
+      const double x0 = static_cast<double>(col[0]);
+      double s = 0.0;
+      double q = 0.0;
+      for (int i = 0; i < n; ++i) {
+        const double d = static_cast<double>(col[i]) - x0;
+        s += d;
+        q += d * d;
+      }
+      mean_d[j] = x0 + s * inv_n;
+      m2[j] = std::max(0.0, q - s * s * inv_n);
+    }
+    return;
   }
 
-  Xc_col.assign(static_cast<size_t>(n) * static_cast<size_t>(m), 0.0f);
+  const int chunks = pass_chunks(n, m);
+  const int tiles = (m + kPassTileCols - 1) / kPassTileCols;
+  const T* x0 = X.data;
+  partial.assign(static_cast<size_t>(chunks) * 2 * static_cast<size_t>(m), 0.0);
+#ifdef _OPENMP
+#pragma omp parallel for collapse(2) schedule(static) if (pass_parallel(n, m))
+#endif
+  for (int c = 0; c < chunks; ++c) {
+    for (int t = 0; t < tiles; ++t) {
+      const int i_lo = static_cast<int>(static_cast<int64_t>(n) * c / chunks);
+      const int i_hi = static_cast<int>(static_cast<int64_t>(n) * (c + 1) / chunks);
+      const int j0 = t * kPassTileCols;
+      const int j1 = std::min(m, j0 + kPassTileCols);
+      double* s = partial.data() + static_cast<size_t>(c) * 2 * static_cast<size_t>(m);
+      double* q = s + m;
+      for (int i0 = i_lo; i0 < i_hi; i0 += kPassRows) {
+        const int i1 = std::min(i_hi, i0 + kPassRows);
+        for (int i = i0; i < i1; ++i) {
+          const T* row = X.data + static_cast<size_t>(i) * static_cast<size_t>(X.ld);
+          for (int j = j0; j < j1; ++j) {
+            const double d = static_cast<double>(row[j]) - static_cast<double>(x0[j]);
+            s[j] += d;
+            q[j] += d * d;
+          }
+        }
+        if (!X_col) continue;
+        for (int j = j0; j < j1; ++j) {
+          T* dst = X_col + static_cast<size_t>(j) * static_cast<size_t>(n);
+          for (int i = i0; i < i1; ++i) dst[i] = X.data[static_cast<size_t>(i) * static_cast<size_t>(X.ld) + j];
+        }
+      }
+    }
+  }
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(chunks, m))
+#endif
   for (int j = 0; j < m; ++j) {
-    for (int i = 0; i < n; ++i) {
-      Xc_col[static_cast<size_t>(j) * static_cast<size_t>(n) + static_cast<size_t>(i)] =
-          static_cast<float>(static_cast<double>(X_row[i * m + j]) - mean_d[j]);
+    double s = 0.0;
+    double q = 0.0;
+    for (int c = 0; c < chunks; ++c) {
+      const double* part = partial.data() + static_cast<size_t>(c) * 2 * static_cast<size_t>(m);
+      s += part[j];
+      q += part[m + j];
+    }
+    mean_d[j] = static_cast<double>(x0[j]) + s * inv_n;
+    m2[j] = std::max(0.0, q - s * s * inv_n);
+  }
+}
+
+template <typename T>
+void column_moments(const DenseViewT<T>& X, std::vector<double>& mean_d, std::vector<double>& m2) {
+  std::vector<double> partial;
+  column_moments(X, mean_d, m2, partial);
+}
+
+// Total variance (ddof=1) from the m2 of column_moments.
+inline double total_variance(const std::vector<double>& m2, int n) {
+  double acc = 0.0;
+  for (double v : m2) acc += v;
+  return acc / static_cast<double>(std::max(1, n - 1));
+}
+
+// X[:, j] -= mean[j] for X (n x m) stored at A in the layout of `view`, in double before rounding
+// back to T. Only the exact (LAPACK) path centers explicitly: randomized solvers center through
+// CenteredOperator.
+template <typename T>
+void center_in_place(T* A, const DenseViewT<T>& view, const std::vector<double>& mean_d) {
+  const int n = view.n;
+  const int m = view.m;
+  const size_t ld = static_cast<size_t>(view.ld);
+  if (view.col_major) {
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(n, m))
+#endif
+    for (int j = 0; j < m; ++j) {
+      T* col = A + static_cast<size_t>(j) * ld;
+      const double mu = mean_d[j];
+      for (int i = 0; i < n; ++i) col[i] = static_cast<T>(static_cast<double>(col[i]) - mu);
     }
+    return;
+  }
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(n, m))
+#endif
+  for (int i = 0; i < n; ++i) {
+    T* row = A + static_cast<size_t>(i) * ld;
+    for (int j = 0; j < m; ++j) row[j] = static_cast<T>(static_cast<double>(row[j]) - mean_d[j]);
   }
 }
 
-// Exact SVD on X_col (column-major, lda=n). Returns top-k.
-SVDResult exact_svd_topk_colmajor(const float* X_col_in, int n, int m, int k) {
+// The exact solver asks LAPACK for only the leading triplets (sgesvdx) while
+// k * kPartialSvdMaxFraction <= min(n, m); closer to a full spectrum, sgesdd is faster.
+constexpr int kPartialSvdMaxFraction = 4;
+
+// Top-k SVD of A (column-major, lda >= n) with sgesvdx over the index range 1..k. U (n x k) and VT
+// (k x m) are written straight into their final layout, so workspace scales with k.
+template <typename T>
+bool partial_svd_topk_into(T* A, int n, int m, int lda, int kk, WorkspaceT<T>& ws, SVDResultT<T>& out) {
   const int min_nm = std::min(n, m);
-  const int kk = std::min(k, min_nm);
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.U.assign(static_cast<size_t>(n) * static_cast<size_t>(kk), 0.0f);
+  out.VT.assign(static_cast<size_t>(kk) * static_cast<size_t>(m), 0.0f);
+  // When the bidiagonal splits on exact zeros (exactly rank-deficient input), sbdsvdx in
+  // reference LAPACK 3.11 / OpenBLAS 0.3.21 writes up to 2 * min(n, m) values to S and runs past
+  // the queried workspace by up to about 2 * min(n, m)^2, so both get that much headroom.
+  ws.s.resize(static_cast<size_t>(2) * static_cast<size_t>(min_nm) + 1);
+  const int64_t split_pad = 2 * static_cast<int64_t>(min_nm) * (min_nm + 1) + 14 * static_cast<int64_t>(min_nm);
 
-  std::vector<float> A(static_cast<size_t>(n) * static_cast<size_t>(m));
-  std::copy(X_col_in, X_col_in + static_cast<size_t>(n) * static_cast<size_t>(m), A.begin());
+  char jobu = 'V';
+  char jobvt = 'V';
+  char range = 'I';
+  int M = n, N = m, il = 1, iu = kk, ns = 0, ldu = n, ldvt = kk, info = 0;
+  T vl = 0.0f, vu = 0.0f;
+  ws.iwork.resize(static_cast<size_t>(12) * static_cast<size_t>(min_nm));
+  if (!ws.gesvdx.matches(n, m, kk)) {
+    int lwork = -1;
+    T wkopt = 0.0f;
+    xgesvdx(&jobu, &jobvt, &range, &M, &N, A, &lda, &vl, &vu, &il, &iu, &ns, ws.s.data(),
+             out.U.data(), &ldu, out.VT.data(), &ldvt, &wkopt, &lwork, ws.iwork.data(), &info);
+    if (info != 0) return false;
+    ws.gesvdx.store(n, m, kk, lwork_from_query(wkopt));
+  }
+  const int64_t padded = static_cast<int64_t>(std::max(1, ws.gesvdx.lwork)) + split_pad;
+  if (padded > std::numeric_limits<int>::max()) return false;
+  int lwork = static_cast<int>(padded);
+  ws.work.resize(static_cast<size_t>(lwork));
+  xgesvdx(&jobu, &jobvt, &range, &M, &N, A, &lda, &vl, &vu, &il, &iu, &ns, ws.s.data(),
+           out.U.data(), &ldu, out.VT.data(), &ldvt, ws.work.data(), &lwork, ws.iwork.data(), &info);
+  if (info != 0 || ns != kk) return false;
+
+  out.S.assign(ws.s.begin(), ws.s.begin() + kk);
+  return true;
+}
+
+template <typename T>
+bool full_svd_topk_into(T* A, int n, int m, int lda, int kk, WorkspaceT<T>& ws, SVDResultT<T>& out);
+
+// Exact SVD on A (column-major, lda >= n). A is consumed as LAPACK workspace. Writes the top-k.
+// sgesvdx overwrites A, so when it fails (or finds fewer than k values) `refill(A)` rewrites A from
+// the caller's source before the full sgesdd/sgesvd path; nothing is copied up front. A refill
+// that returns false (A was the only copy) reports the failure instead.
+template <typename T, typename Refill>
+bool exact_svd_topk_into(T* A, int n, int m, int lda, int k, WorkspaceT<T>& ws, SVDResultT<T>& out,
+                         Refill&& refill) {
+  const int min_nm = std::min(n, m);
+  const int kk = std::min(k, min_nm);
+  if (kk * kPartialSvdMaxFraction > min_nm) return full_svd_topk_into(A, n, m, lda, kk, ws, out);
+  if (partial_svd_topk_into(A, n, m, lda, kk, ws, out)) return true;
+  return refill(A) && full_svd_topk_into(A, n, m, lda, kk, ws, out);
+}
 
-  std::vector<float> s(static_cast<size_t>(min_nm));
-  std::vector<float> Ufull(static_cast<size_t>(n) * static_cast<size_t>(min_nm));
-  std::vector<float> VTfull(static_cast<size_t>(min_nm) * static_cast<size_t>(m));
+// Top-k of a full-spectrum sgesdd (sgesvd if that fails) of A (column-major, lda >= n).
+template <typename T>
+bool full_svd_topk_into(T* A, int n, int m, int lda, int kk, WorkspaceT<T>& ws, SVDResultT<T>& out) {
+  const int min_nm = std::min(n, m);
+  ws.s.resize(static_cast<size_t>(min_nm));
+  ws.u_full.resize(static_cast<size_t>(n) * static_cast<size_t>(min_nm));
+  ws.vt_full.resize(static_cast<size_t>(min_nm) * static_cast<size_t>(m));
 
-  // Workspace query for sgesdd
+  // Workspace query for gesdd
   char jobz = 'S';
-  int M = n, N = m, lda = n, ldu = n, ldvt = min_nm, info = 0;
-  int lwork = -1;
-  float wkopt = 0.0f;
-  std::vector<int> iwork(static_cast<size_t>(8) * static_cast<size_t>(min_nm));
-  sgesdd_(&jobz, &M, &N, A.data(), &lda, s.data(), Ufull.data(), &ldu, VTfull.data(), &ldvt,
-          &wkopt, &lwork, iwork.data(), &info);
-  lwork = static_cast<int>(wkopt);
-  std::vector<float> work(static_cast<size_t>(std::max(1, lwork)));
+  int M = n, N = m, ldu = n, ldvt = min_nm, info = 0;
+  ws.iwork.resize(static_cast<size_t>(8) * static_cast<size_t>(min_nm));
+  if (!ws.gesdd.matches(n, m, 0)) {
+    int lwork = -1;
+    T wkopt = 0.0f;
+    xgesdd(&jobz, &M, &N, A, &lda, ws.s.data(), ws.u_full.data(), &ldu, ws.vt_full.data(),
+            &ldvt, &wkopt, &lwork, ws.iwork.data(), &info);
+    ws.gesdd.store(n, m, 0, lwork_from_query(wkopt));
+  }
+  int lwork = std::max(1, ws.gesdd.lwork);
+  ws.work.resize(static_cast<size_t>(lwork));
 
-  sgesdd_(&jobz, &M, &N, A.data(), &lda, s.data(), Ufull.data(), &ldu, VTfull.data(), &ldvt,
-          work.data(), &lwork, iwork.data(), &info);
+  xgesdd(&jobz, &M, &N, A, &lda, ws.s.data(), ws.u_full.data(), &ldu, ws.vt_full.data(),
+          &ldvt, ws.work.data(), &lwork, ws.iwork.data(), &info);
 
   if (info != 0) {
     // Fall back to sgesvd
     char jobu = 'S';
     char jobvt = 'S';
     int lwork2 = -1;
-    float wkopt2 = 0.0f;
-    sgesvd_(&jobu, &jobvt, &M, &N, A.data(), &lda, s.data(), Ufull.data(), &ldu, VTfull.data(),
-            &ldvt, &wkopt2, &lwork2, &info);
-    lwork2 = static_cast<int>(wkopt2);
-    std::vector<float> work2(static_cast<size_t>(std::max(1, lwork2)));
-    sgesvd_(&jobu, &jobvt, &M, &N, A.data(), &lda, s.data(), Ufull.data(), &ldu, VTfull.data(),
-            &ldvt, work2.data(), &lwork2, &info);
-    if (info != 0) return {};
+    T wkopt2 = 0.0f;
+    xgesvd(&jobu, &jobvt, &M, &N, A, &lda, ws.s.data(), ws.u_full.data(), &ldu,
+            ws.vt_full.data(), &ldvt, &wkopt2, &lwork2, &info);
+    lwork2 = lwork_from_query(wkopt2);
+    ws.work.resize(static_cast<size_t>(std::max(1, lwork2)));
+    xgesvd(&jobu, &jobvt, &M, &N, A, &lda, ws.s.data(), ws.u_full.data(), &ldu,
+            ws.vt_full.data(), &ldvt, ws.work.data(), &lwork2, &info);
+    if (info != 0) return false;
   }
 
-  SVDResult out;
   out.n = n;
   out.m = m;
   out.k = kk;
-  out.S.assign(s.begin(), s.begin() + kk);
+  out.S.assign(ws.s.begin(), ws.s.begin() + kk);
 
-  // Copy U (n x kk) column-major (ldu=n)
-  out.U.assign(static_cast<size_t>(n) * static_cast<size_t>(kk), 0.0f);
-  for (int j = 0; j < kk; ++j) {
-    std::copy(Ufull.begin() + static_cast<size_t>(j) * static_cast<size_t>(n),
-              Ufull.begin() + static_cast<size_t>(j + 1) * static_cast<size_t>(n),
-              out.U.begin() + static_cast<size_t>(j) * static_cast<size_t>(n));
-  }
+  // U (n x kk) is the leading block of Ufull (ldu=n)
+  out.U.assign(ws.u_full.begin(), ws.u_full.begin() + static_cast<size_t>(n) * static_cast<size_t>(kk));
 
   // Copy VT (kk x m) column-major (ldvt=min_nm)
-  out.VT.assign(static_cast<size_t>(kk) * static_cast<size_t>(m), 0.0f);
+  out.VT.resize(static_cast<size_t>(kk) * static_cast<size_t>(m));
   for (int j = 0; j < m; ++j) {
     for (int i = 0; i < kk; ++i) {
       out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + static_cast<size_t>(i)] =
-          VTfull[static_cast<size_t>(j) * static_cast<size_t>(min_nm) + static_cast<size_t>(i)];
+          ws.vt_full[static_cast<size_t>(j) * static_cast<size_t>(min_nm) + static_cast<size_t>(i)];
     }
   }
-  return out;
+  return true;
+}
+
+template <typename T, typename Refill>
+bool exact_svd_topk_into(std::vector<T>& A, int n, int m, int k, WorkspaceT<T>& ws, SVDResultT<T>& out,
+                         Refill&& refill) {
+  return exact_svd_topk_into(A.data(), n, m, n, k, ws, out, refill);
+}
+
+// Exact top-k SVD of X factored in its own storage, which LAPACK overwrites. Row-major X is the
+// column-major m x n matrix X^T, whose factors are transposed back. No copy of X exists to fall
+// back on, so a failed partial-spectrum solve is reported rather than retried.
+template <typename T>
+bool exact_svd_topk_in_place(T* A, const DenseViewT<T>& X, int k, WorkspaceT<T>& ws, SVDResultT<T>& out) {
+  const int ld = static_cast<int>(X.ld);
+  const auto no_refill = [](T*) { return false; };
+  if (X.col_major) return exact_svd_topk_into(A, X.n, X.m, ld, k, ws, out, no_refill);
+  SVDResultT<T> t;
+  if (!exact_svd_topk_into(A, X.m, X.n, ld, k, ws, t, no_refill)) return false;
+  const int n = X.n;
+  const int m = X.m;
+  const int kk = t.k;
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.S = std::move(t.S);
+  // X = V_t S U_t^T: U = VT_t^T (n x kk) and VT = U_t^T (kk x m), both column-major.
+  out.U.resize(static_cast<size_t>(n) * static_cast<size_t>(kk));
+  for (int j = 0; j < kk; ++j) {
+    for (int i = 0; i < n; ++i) {
+      out.U[static_cast<size_t>(j) * static_cast<size_t>(n) + i] = t.VT[static_cast<size_t>(i) * static_cast<size_t>(kk) + j];
+    }
+  }
+  out.VT.resize(static_cast<size_t>(kk) * static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) {
+    for (int i = 0; i < kk; ++i) {
+      out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + i] = t.U[static_cast<size_t>(i) * static_cast<size_t>(m) + j];
+    }
+  }
+  return true;
 }
 
-// Randomized SVD on X_col (column-major, lda=n). Returns top-k.
+// Exact top-k SVD of a column-major A, which is left intact. The callers pass k-sized sketches, so
+// LAPACK works on a copy and a failed partial solve re-copies A for the full path.
+SVDResult exact_svd_topk_colmajor(const std::vector<float>& A, int n, int m, int k) {
+  Workspace ws;
+  SVDResult out;
+  ws.a = A;
+  const auto refill = [&](float*) {
+    std::copy(A.begin(), A.end(), ws.a.begin());
+    return true;
+  };
+  if (!exact_svd_topk_into(ws.a, n, m, k, ws, out, refill)) return {};
+  return out;
+}
 
-static bool ortho_qr_inplace(std::vector<float>& A, int n, int l) {
-  // Orthonormalize A (n x l, column-major) in-place using QR.
+template <typename T>
+static bool ortho_qr_inplace(T* A, int n, int l, typename NonDeduced<T>::type* R = nullptr,
+                             WorkspaceT<T>* ws = nullptr) {
+  // Orthonormalize A (n x l, column-major) in-place using QR. When R is given, the l x l
+  // upper-triangular factor (column-major) is written to it (requires n >= l).
+  WorkspaceT<T> local;
+  WorkspaceT<T>& w = ws ? *ws : local;
   int M = n;
   int N = l;
   int K = std::min(M, N);
   int lda = n;
   int info = 0;
-  std::vector<float> tau(static_cast<size_t>(std::max(1, K)));
-  int lwork = -1;
-  float wkopt = 0.0f;
-  sgeqrf_(&M, &N, A.data(), &lda, tau.data(), &wkopt, &lwork, &info);
-  if (info != 0) return false;
-  lwork = static_cast<int>(wkopt);
-  std::vector<float> work(static_cast<size_t>(std::max(1, lwork)));
-  sgeqrf_(&M, &N, A.data(), &lda, tau.data(), work.data(), &lwork, &info);
+  w.tau.resize(static_cast<size_t>(std::max(1, K)));
+  if (!w.geqrf.matches(n, l, 0)) {
+    int lwork = -1;
+    T wkopt = 0.0f;
+    xgeqrf(&M, &N, A, &lda, w.tau.data(), &wkopt, &lwork, &info);
+    if (info != 0) return false;
+    w.geqrf.store(n, l, 0, lwork_from_query(wkopt));
+  }
+  int lwork = std::max(1, w.geqrf.lwork);
+  w.work.resize(static_cast<size_t>(lwork));
+  xgeqrf(&M, &N, A, &lda, w.tau.data(), w.work.data(), &lwork, &info);
   if (info != 0) return false;
+  if (R) {
+    for (int c = 0; c < l; ++c) {
+      for (int r = 0; r < l; ++r) {
+        R[static_cast<size_t>(c) * static_cast<size_t>(l) + r] = r <= c ? A[static_cast<size_t>(c) * static_cast<size_t>(n) + r] : 0.0f;
+      }
+    }
+  }
 
-  int lwork2 = -1;
-  float wkopt2 = 0.0f;
-  sorgqr_(&M, &N, &K, A.data(), &lda, tau.data(), &wkopt2, &lwork2, &info);
-  if (info != 0) return false;
-  lwork2 = static_cast<int>(wkopt2);
-  work.assign(static_cast<size_t>(std::max(1, lwork2)), 0.0f);
-  sorgqr_(&M, &N, &K, A.data(), &lda, tau.data(), work.data(), &lwork2, &info);
+  if (!w.orgqr.matches(n, l, 0)) {
+    int lwork2 = -1;
+    T wkopt2 = 0.0f;
+    xorgqr(&M, &N, &K, A, &lda, w.tau.data(), &wkopt2, &lwork2, &info);
+    if (info != 0) return false;
+    w.orgqr.store(n, l, 0, lwork_from_query(wkopt2));
+  }
+  int lwork2 = std::max(1, w.orgqr.lwork);
+  w.work.resize(static_cast<size_t>(lwork2));
+  xorgqr(&M, &N, &K, A, &lda, w.tau.data(), w.work.data(), &lwork2, &info);
   if (info != 0) return false;
   return true;
 }
 
-SVDResult randomized_svd_topk_colmajor(const float* X_col, int n, int m, int k, int n_iter, int random_state) {
-  const int min_nm = std::min(n, m);
-  const int kk = std::min(k, min_nm);
-  const int oversample = 10;
-  const int l = std::min(kk + oversample, min_nm);
-
-  std::mt19937 rng(static_cast<uint32_t>(random_state <= 0 ? 12345 : random_state));
-  std::normal_distribution<float> nd(0.0f, 1.0f);
-
-  // Omega: m x l (column-major, ld=m)
-  std::vector<float> Omega(static_cast<size_t>(m) * static_cast<size_t>(l));
-  for (auto& v : Omega) v = nd(rng);
+// Linear operator seen by the randomized range finder. Dense blocks exchanged with the
+// operator are column-major: apply() computes Y = A * B (B: m x l, Y: n x l) and apply_t()
+// computes Z = A^T * Y (Y: n x l, Z: m x l).
+template <typename T>
+struct LinearOperatorT {
+  int n = 0;
+  int m = 0;
+  virtual ~LinearOperatorT() = default;
+  virtual void apply(const T* B, int l, T* Y) const = 0;
+  virtual void apply_t(const T* Y, int l, T* Z) const = 0;
+};
+using LinearOperator = LinearOperatorT<float>;
 
-  // Y = X * Omega => n x l (column-major, ld=n)
-  std::vector<float> Y(static_cast<size_t>(n) * static_cast<size_t>(l), 0.0f);
-  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, l, m, 1.0f, X_col, n, Omega.data(), m, 0.0f, Y.data(), n);
+// Dense input read in place through its view, in either storage order.
+template <typename T>
+struct DenseViewOperator final : LinearOperatorT<T> {
+  DenseViewT<T> X;
 
-  // Power iterations: Y = (X X^T)^q X Omega
-  for (int it = 0; it < std::max(0, n_iter); ++it) {
-    // Z = X^T Y => m x l
-    std::vector<float> Z(static_cast<size_t>(m) * static_cast<size_t>(l), 0.0f);
-    cblas_sgemm(CblasColMajor, CblasTrans, CblasNoTrans, m, l, n, 1.0f, X_col, n, Y.data(), n, 0.0f, Z.data(), m);
-    // Y = X Z => n x l
-    std::fill(Y.begin(), Y.end(), 0.0f);
-    cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, l, m, 1.0f, X_col, n, Z.data(), m, 0.0f, Y.data(), n);
-  
-    // Normalize to improve numerical stability (similar to sklearn's power_iteration_normalizer).
-    if (!ortho_qr_inplace(Y, n, l)) return {};
-}
+  explicit DenseViewOperator(const DenseViewT<T>& view) : X(view) {
+    this->n = view.n;
+    this->m = view.m;
+  }
 
-  // QR factorization of Y to get Q (n x l) in Y
-  std::vector<float> tau(static_cast<size_t>(l));
-  int M = n, N = l, lda = n, info = 0;
-  int lwork = -1;
-  float wkopt = 0.0f;
-  sgeqrf_(&M, &N, Y.data(), &lda, tau.data(), &wkopt, &lwork, &info);
-  lwork = static_cast<int>(wkopt);
-  std::vector<float> work(static_cast<size_t>(std::max(1, lwork)));
-  sgeqrf_(&M, &N, Y.data(), &lda, tau.data(), work.data(), &lwork, &info);
-  if (info != 0) return {};
+  void apply(const T* B, int l, T* Y) const override {
+    const int n = this->n, m = this->m;
+    xgemm(CblasColMajor, X.col_major ? CblasNoTrans : CblasTrans, CblasNoTrans, n, l, m, T(1), X.data,
+          static_cast<int>(X.ld), B, m, T(0), Y, n);
+  }
 
-  int K = l;
-  lwork = -1;
-  wkopt = 0.0f;
-  sorgqr_(&M, &N, &K, Y.data(), &lda, tau.data(), &wkopt, &lwork, &info);
-  lwork = static_cast<int>(wkopt);
-  work.assign(static_cast<size_t>(std::max(1, lwork)), 0.0f);
-  sorgqr_(&M, &N, &K, Y.data(), &lda, tau.data(), work.data(), &lwork, &info);
-  if (info != 0) return {};
-  // Q is now in Y (n x l), ld=n
-
-  // B = Q^T X => l x m (column-major, ld=l)
-  std::vector<float> B(static_cast<size_t>(l) * static_cast<size_t>(m), 0.0f);
-  cblas_sgemm(CblasColMajor, CblasTrans, CblasNoTrans, l, m, n, 1.0f, Y.data(), n, X_col, n, 0.0f, B.data(), l);
+  void apply_t(const T* Y, int l, T* Z) const override {
+    const int n = this->n, m = this->m;
+    xgemm(CblasColMajor, X.col_major ? CblasTrans : CblasNoTrans, CblasNoTrans, m, l, n, T(1), X.data,
+          static_cast<int>(X.ld), Y, n, T(0), Z, m);
+  }
+};
 
-  // SVD of B (l x m), get Uhat (l x l), VT (l x m)
-  std::vector<float> s(static_cast<size_t>(l));
-  std::vector<float> Uhat(static_cast<size_t>(l) * static_cast<size_t>(l));
-  std::vector<float> VTfull(static_cast<size_t>(l) * static_cast<size_t>(m));
+// (A - 1 mean^T) applied implicitly as a rank-one correction, so no centered copy of A is
+// ever formed:
+//   (A - 1 mean^T) B = A B - 1 (mean^T B)
+//   (A - 1 mean^T)^T Y = A^T Y - mean (1^T Y)
+template <typename T>
+struct CenteredOperator final : LinearOperatorT<T> {
+  const LinearOperatorT<T>& base;
+  const T* mean = nullptr;  // length m
 
-  char jobz = 'S';
-  int Mb = l, Nb = m, ldab = l, ldu = l, ldvt = l, info2 = 0;
-  int lwork2 = -1;
-  float wkopt2 = 0.0f;
-  std::vector<int> iwork(static_cast<size_t>(8) * static_cast<size_t>(l));
-  sgesdd_(&jobz, &Mb, &Nb, B.data(), &ldab, s.data(), Uhat.data(), &ldu, VTfull.data(), &ldvt,
-          &wkopt2, &lwork2, iwork.data(), &info2);
-  lwork2 = static_cast<int>(wkopt2);
-  std::vector<float> work2(static_cast<size_t>(std::max(1, lwork2)));
-  sgesdd_(&jobz, &Mb, &Nb, B.data(), &ldab, s.data(), Uhat.data(), &ldu, VTfull.data(), &ldvt,
-          work2.data(), &lwork2, iwork.data(), &info2);
-
-  if (info2 != 0) {
-    // fall back to sgesvd
-    char jobu = 'S';
-    char jobvt = 'S';
-    int lwork3 = -1;
-    float wkopt3 = 0.0f;
-    sgesvd_(&jobu, &jobvt, &Mb, &Nb, B.data(), &ldab, s.data(), Uhat.data(), &ldu, VTfull.data(),
-            &ldvt, &wkopt3, &lwork3, &info2);
-    lwork3 = static_cast<int>(wkopt3);
-    std::vector<float> work3(static_cast<size_t>(std::max(1, lwork3)));
-    sgesvd_(&jobu, &jobvt, &Mb, &Nb, B.data(), &ldab, s.data(), Uhat.data(), &ldu, VTfull.data(),
-            &ldvt, work3.data(), &lwork3, &info2);
-    if (info2 != 0) return {};
+  CenteredOperator(const LinearOperatorT<T>& A, const T* mu) : base(A), mean(mu) {
+    this->n = A.n;
+    this->m = A.m;
   }
 
-  // Uapprox = Q * Uhat_k => n x kk
-  std::vector<float> Uapprox(static_cast<size_t>(n) * static_cast<size_t>(kk), 0.0f);
-  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, kk, l, 1.0f, Y.data(), n, Uhat.data(), l, 0.0f, Uapprox.data(), n);
-
-  SVDResult out;
-  out.n = n;
-  out.m = m;
-  out.k = kk;
-  out.U = std::move(Uapprox);
-  out.S.assign(s.begin(), s.begin() + kk);
+  void apply(const T* B, int l, T* Y) const override {
+    const int n = this->n, m = this->m;
+    base.apply(B, l, Y);
+    for (int c = 0; c < l; ++c) {
+      const T* b = B + static_cast<size_t>(c) * static_cast<size_t>(m);
+      double mb = 0.0;
+      for (int j = 0; j < m; ++j) mb += static_cast<double>(mean[j]) * static_cast<double>(b[j]);
+      T* y = Y + static_cast<size_t>(c) * static_cast<size_t>(n);
+      const T shift = static_cast<T>(mb);
+      for (int i = 0; i < n; ++i) y[i] -= shift;
+    }
+  }
 
-  // VTfull is l x m (ldvt=l). Copy first kk rows into out.VT (kk x m, ldvt=kk)
-  out.VT.assign(static_cast<size_t>(kk) * static_cast<size_t>(m), 0.0f);
-  for (int j = 0; j < m; ++j) {
-    for (int i = 0; i < kk; ++i) {
-      out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + static_cast<size_t>(i)] =
-          VTfull[static_cast<size_t>(j) * static_cast<size_t>(l) + static_cast<size_t>(i)];
+  void apply_t(const T* Y, int l, T* Z) const override {
+    const int n = this->n, m = this->m;
+    base.apply_t(Y, l, Z);
+    for (int c = 0; c < l; ++c) {
+      const T* y = Y + static_cast<size_t>(c) * static_cast<size_t>(n);
+      double sy = 0.0;
+      for (int i = 0; i < n; ++i) sy += static_cast<double>(y[i]);
+      T* z = Z + static_cast<size_t>(c) * static_cast<size_t>(m);
+      const T colsum = static_cast<T>(sy);
+      for (int j = 0; j < m; ++j) z[j] -= mean[j] * colsum;
     }
   }
+};
 
-  return out;
+template <typename T>
+void colmajor_to_rowmajor(const T* A_col, int rows, int cols, T* A_row) {
+  for (int j = 0; j < cols; ++j) {
+    for (int i = 0; i < rows; ++i) {
+      A_row[static_cast<size_t>(i) * static_cast<size_t>(cols) + static_cast<size_t>(j)] =
+          A_col[static_cast<size_t>(j) * static_cast<size_t>(rows) + static_cast<size_t>(i)];
+    }
+  }
 }
 
-void compute_explained_variance_rowmajor(const float* X_row, int n, int m, const float* s, int k,
-                                        float* explained_variance, float* explained_variance_ratio) {
-  const double denom = std::max(1, n - 1);
-  for (int i = 0; i < k; ++i) {
-    explained_variance[i] = static_cast<float>((static_cast<double>(s[i]) * static_cast<double>(s[i])) / denom);
-  }
-  double total_var = 0.0;
-  for (int j = 0; j < m; ++j) {
-    double mean = 0.0;
-    for (int i = 0; i < n; ++i) mean += static_cast<double>(X_row[i * m + j]);
-    mean /= static_cast<double>(n);
-    double var = 0.0;
-    for (int i = 0; i < n; ++i) {
-      const double d = static_cast<double>(X_row[i * m + j]) - mean;
-      var += d * d;
+template <typename T>
+void rowmajor_to_colmajor(const T* A_row, int rows, int cols, T* A_col) {
+  for (int i = 0; i < rows; ++i) {
+    for (int j = 0; j < cols; ++j) {
+      A_col[static_cast<size_t>(j) * static_cast<size_t>(rows) + static_cast<size_t>(i)] =
+          A_row[static_cast<size_t>(i) * static_cast<size_t>(cols) + static_cast<size_t>(j)];
     }
-    var /= denom;
-    total_var += var;
   }
-  if (total_var <= 0.0) total_var = 1.0;
-  for (int i = 0; i < k; ++i) {
-    explained_variance_ratio[i] = static_cast<float>(static_cast<double>(explained_variance[i]) / total_var);
+}
+
+// Out[r, :] = sum_p data[p] * In[indices[p], :] for every compressed slice r (row-major, width l).
+void sparse_gather_rowmajor(const int64_t* indptr, const int32_t* indices, const float* data,
+                            int n_major, const float* In, int l, float* Out) {
+  for (int r = 0; r < n_major; ++r) {
+    float* out = Out + static_cast<size_t>(r) * static_cast<size_t>(l);
+    std::fill(out, out + l, 0.0f);
+    for (int64_t p = indptr[r]; p < indptr[r + 1]; ++p) {
+      const float v = data[p];
+      const float* in = In + static_cast<size_t>(indices[p]) * static_cast<size_t>(l);
+      for (int c = 0; c < l; ++c) out[c] += v * in[c];
+    }
   }
 }
 
-void fill_outputs_rowmajor(const SVDResult& svd, float* Q_row, float* w_out, float* U_row, float* X_transformed_row) {
-  const int n = svd.n;
-  const int m = svd.m;
-  const int k = svd.k;
+// Out[indices[p], :] += data[p] * In[r, :] for every compressed slice r (row-major, width l).
+void sparse_scatter_rowmajor(const int64_t* indptr, const int32_t* indices, const float* data,
+                             int n_major, int n_minor, const float* In, int l, float* Out) {
+  std::fill(Out, Out + static_cast<size_t>(n_minor) * static_cast<size_t>(l), 0.0f);
+  for (int r = 0; r < n_major; ++r) {
+    const float* in = In + static_cast<size_t>(r) * static_cast<size_t>(l);
+    for (int64_t p = indptr[r]; p < indptr[r + 1]; ++p) {
+      const float v = data[p];
+      float* out = Out + static_cast<size_t>(indices[p]) * static_cast<size_t>(l);
+      for (int c = 0; c < l; ++c) out[c] += v * in[c];
+    }
+  }
+}
 
-  // w
-  std::copy(svd.S.begin(), svd.S.end(), w_out);
+// CSR (csc=false: indptr has n+1 entries, indices are column ids) or CSC (csc=true: indptr has
+// m+1 entries, indices are row ids) matrix. Products are computed straight from the nonzeros,
+// so cost scales with nnz and the matrix is never densified.
+struct SparseCompressedOperator final : LinearOperator {
+  const int64_t* indptr = nullptr;
+  const int32_t* indices = nullptr;
+  const float* data = nullptr;
+  bool csc = false;
 
-  // Q (components) in row-major: k x m.
-  // svd.VT is column-major (ldvt=k), shape k x m.
-  for (int i = 0; i < k; ++i) {
-    for (int j = 0; j < m; ++j) {
-      Q_row[i * m + j] = svd.VT[static_cast<size_t>(j) * static_cast<size_t>(k) + static_cast<size_t>(i)];
-    }
+  SparseCompressedOperator(const int64_t* ip, const int32_t* ix, const float* d, int rows, int cols,
+                           bool is_csc)
+      : indptr(ip), indices(ix), data(d), csc(is_csc) {
+    n = rows;
+    m = cols;
   }
 
-  // U in row-major: n x k.
-  // svd.U is column-major (ldu=n), shape n x k.
-  for (int i = 0; i < n; ++i) {
-    for (int j = 0; j < k; ++j) {
-      U_row[i * k + j] = svd.U[static_cast<size_t>(j) * static_cast<size_t>(n) + static_cast<size_t>(i)];
+  void apply(const float* B, int l, float* Y) const override {
+    std::vector<float> B_row(static_cast<size_t>(m) * static_cast<size_t>(l));
+    std::vector<float> Y_row(static_cast<size_t>(n) * static_cast<size_t>(l));
+    colmajor_to_rowmajor(B, m, l, B_row.data());
+    if (csc) {
+      sparse_scatter_rowmajor(indptr, indices, data, m, n, B_row.data(), l, Y_row.data());
+    } else {
+      sparse_gather_rowmajor(indptr, indices, data, n, B_row.data(), l, Y_row.data());
     }
+    rowmajor_to_colmajor(Y_row.data(), n, l, Y);
   }
 
-  // X_transformed = U * diag(w) (row-major n x k)
-  for (int i = 0; i < n; ++i) {
-    for (int j = 0; j < k; ++j) {
-      X_transformed_row[i * k + j] = U_row[i * k + j] * w_out[j];
+  void apply_t(const float* Y, int l, float* Z) const override {
+    std::vector<float> Y_row(static_cast<size_t>(n) * static_cast<size_t>(l));
+    std::vector<float> Z_row(static_cast<size_t>(m) * static_cast<size_t>(l));
+    colmajor_to_rowmajor(Y, n, l, Y_row.data());
+    if (csc) {
+      sparse_gather_rowmajor(indptr, indices, data, m, Y_row.data(), l, Z_row.data());
+    } else {
+      sparse_scatter_rowmajor(indptr, indices, data, n, m, Y_row.data(), l, Z_row.data());
     }
+    rowmajor_to_colmajor(Z_row.data(), m, l, Z);
   }
-}
-
-}  // namespace
+};
 
-extern "C" {
+// Thin SVD of A (rows x cols, column-major, lda=rows) via sgesdd with an sgesvd fallback.
+// A is overwritten. U: rows x min(rows, cols) (ldu=rows), VT: min(rows, cols) x cols.
+template <typename T>
+bool thin_svd_colmajor(std::vector<T>& A, int rows, int cols, std::vector<T>& s,
+                       std::vector<T>& U, std::vector<T>& VT, WorkspaceT<T>* ws = nullptr) {
+  WorkspaceT<T> local;
+  WorkspaceT<T>& w = ws ? *ws : local;
+  const int min_rc = std::min(rows, cols);
+  s.assign(static_cast<size_t>(min_rc), 0.0f);
+  U.assign(static_cast<size_t>(rows) * static_cast<size_t>(min_rc), 0.0f);
+  VT.assign(static_cast<size_t>(min_rc) * static_cast<size_t>(cols), 0.0f);
 
-void truncated_svd_float(const float* X, float* Q, float* w, float* U, float* X_transformed,
-                         float* explained_variance, float* explained_variance_ratio, params p) {
-  const int n = p.X_n;
-  const int m = p.X_m;
-  const int k = std::min(p.k, std::min(n, m));
-  if (!X || !Q || !w || !U || !X_transformed) return;
+  char jobz = 'S';
+  int M = rows, N = cols, lda = rows, ldu = rows, ldvt = min_rc, info = 0;
+  w.iwork.resize(static_cast<size_t>(8) * static_cast<size_t>(min_rc));
+  if (!w.gesdd.matches(rows, cols, 0)) {
+    int lwork = -1;
+    T wkopt = 0.0f;
+    xgesdd(&jobz, &M, &N, A.data(), &lda, s.data(), U.data(), &ldu, VT.data(), &ldvt, &wkopt,
+            &lwork, w.iwork.data(), &info);
+    w.gesdd.store(rows, cols, 0, lwork_from_query(wkopt));
+  }
+  int lwork = std::max(1, w.gesdd.lwork);
+  w.work.resize(static_cast<size_t>(lwork));
+  xgesdd(&jobz, &M, &N, A.data(), &lda, s.data(), U.data(), &ldu, VT.data(), &ldvt, w.work.data(),
+          &lwork, w.iwork.data(), &info);
+  if (info == 0) return true;
 
-  std::vector<float> X_col = to_col_major(X, n, m);
+  // fall back to sgesvd
+  char jobu = 'S';
+  char jobvt = 'S';
+  lwork = -1;
+  T wkopt = 0.0f;
+  xgesvd(&jobu, &jobvt, &M, &N, A.data(), &lda, s.data(), U.data(), &ldu, VT.data(), &ldvt,
+          &wkopt, &lwork, &info);
+  lwork = lwork_from_query(wkopt);
+  w.work.assign(static_cast<size_t>(std::max(1, lwork)), 0.0f);
+  xgesvd(&jobu, &jobvt, &M, &N, A.data(), &lda, s.data(), U.data(), &ldu, VT.data(), &ldvt,
+          w.work.data(), &lwork, &info);
+  return info == 0;
+}
 
-  const bool use_exact = str_eq(p.algorithm, "cusolver") || (std::min(n, m) <= 256);
-  SVDResult svd = use_exact ? exact_svd_topk_colmajor(X_col.data(), n, m, k)
-                            : randomized_svd_topk_colmajor(X_col.data(), n, m, k, p.n_iter, p.random_state);
-  if (svd.U.empty() || svd.S.empty() || svd.VT.empty()) return;
+// Top-k eigenpairs of a symmetric matrix (upper triangle of G, dim x dim, column-major) via
+// dsyevr. Returns eigenvalues in descending order and the matching eigenvectors (dim x kk).
+template <typename T = float>
+bool top_eigenpairs(std::vector<double>& G, int dim, int kk, std::vector<double>& evals,
+                    std::vector<double>& evecs, WorkspaceT<T>* ws = nullptr) {
+  WorkspaceT<T> local;
+  WorkspaceT<T>& wsp = ws ? *ws : local;
+  char jobz = 'V';
+  char range = 'I';
+  char uplo = 'U';
+  int N = dim, lda = dim, il = dim - kk + 1, iu = dim, found = 0, ldz = dim, info = 0;
+  double vl = 0.0, vu = 0.0, abstol = 0.0;
+  std::vector<double>& w = wsp.eig_w;
+  std::vector<double>& Z = wsp.eig_z;
+  w.resize(static_cast<size_t>(dim));
+  Z.resize(static_cast<size_t>(dim) * static_cast<size_t>(kk));
+  wsp.isuppz.resize(static_cast<size_t>(2) * static_cast<size_t>(std::max(1, kk)));
 
-  fill_outputs_rowmajor(svd, Q, w, U, X_transformed);
+  if (!wsp.syevr.matches(dim, kk, 0)) {
+    int lwork = -1, liwork = -1, iwkopt = 0;
+    double wkopt = 0.0;
+    dsyevr_(&jobz, &range, &uplo, &N, G.data(), &lda, &vl, &vu, &il, &iu, &abstol, &found, w.data(),
+            Z.data(), &ldz, wsp.isuppz.data(), &wkopt, &lwork, &iwkopt, &liwork, &info);
+    if (info != 0) return false;
+    wsp.syevr.store(dim, kk, 0, lwork_from_query(wkopt), iwkopt);
+  }
+  int lwork = std::max(1, wsp.syevr.lwork);
+  int liwork = std::max(1, wsp.syevr.liwork);
+  wsp.dwork.resize(static_cast<size_t>(lwork));
+  wsp.iwork.resize(static_cast<size_t>(liwork));
+  dsyevr_(&jobz, &range, &uplo, &N, G.data(), &lda, &vl, &vu, &il, &iu, &abstol, &found, w.data(),
+          Z.data(), &ldz, wsp.isuppz.data(), wsp.dwork.data(), &lwork, wsp.iwork.data(), &liwork, &info);
+  if (info != 0 || found != kk) return false;
 
-  if (explained_variance && explained_variance_ratio) {
-    compute_explained_variance_rowmajor(X, n, m, w, k, explained_variance, explained_variance_ratio);
+  // dsyevr returns ascending eigenvalues; flip to descending.
+  evals.resize(static_cast<size_t>(kk));
+  evecs.resize(static_cast<size_t>(dim) * static_cast<size_t>(kk));
+  for (int c = 0; c < kk; ++c) {
+    const int src = kk - 1 - c;
+    evals[c] = w[src];
+    std::copy(Z.begin() + static_cast<size_t>(src) * static_cast<size_t>(dim),
+              Z.begin() + static_cast<size_t>(src + 1) * static_cast<size_t>(dim),
+              evecs.begin() + static_cast<size_t>(c) * static_cast<size_t>(dim));
   }
+  return true;
 }
 
-void pca_float(const float* X, float* Q, float* w, float* U, float* X_transformed,
-               float* explained_variance, float* explained_variance_ratio, float* mean, params p) {
-  const int n = p.X_n;
-  const int m = p.X_m;
-  const int k = std::min(p.k, std::min(n, m));
-  if (!X || !Q || !w || !U || !X_transformed || !mean) return;
+// Rayleigh-Ritz extraction of the top-kk triplets from an orthonormal basis Qb (n x l) and
+// Z = A^T Qb (m x l): B = Z^T = Qb^T A is decomposed as Uhat S VT, and U = Qb Uhat.
+template <typename T>
+bool rayleigh_ritz_into(const T* Qb, const T* Z, int n, int m, int l, int kk, WorkspaceT<T>& ws,
+                        SVDResultT<T>& out) {
+  ws.b.resize(static_cast<size_t>(l) * static_cast<size_t>(m));
+  colmajor_to_rowmajor(Z, m, l, ws.b.data());
 
-  std::vector<float> Xc_col;
-  compute_mean_center_colmajor(X, n, m, mean, Xc_col);
+  // SVD of B (l x m), get Uhat (l x l), VT (l x m)
+  if (!thin_svd_colmajor(ws.b, l, m, ws.s, ws.uhat, ws.vt_full, &ws)) return false;
 
-  const bool use_exact = str_eq(p.algorithm, "cusolver") || (std::min(n, m) <= 256);
-  SVDResult svd = use_exact ? exact_svd_topk_colmajor(Xc_col.data(), n, m, k)
-                            : randomized_svd_topk_colmajor(Xc_col.data(), n, m, k, p.n_iter, p.random_state);
-  if (svd.U.empty() || svd.S.empty() || svd.VT.empty()) return;
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.S.assign(ws.s.begin(), ws.s.begin() + kk);
 
-  fill_outputs_rowmajor(svd, Q, w, U, X_transformed);
+  // U = Q * Uhat_k => n x kk
+  out.U.resize(static_cast<size_t>(n) * static_cast<size_t>(kk));
+  xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, kk, l, 1.0f, Qb, n, ws.uhat.data(), l, 0.0f, out.U.data(), n);
 
-  if (explained_variance && explained_variance_ratio) {
-    // PCA uses centered data for variance
-    // Build a centered row-major view on the fly for total variance calculation
-    std::vector<float> Xc_row(static_cast<size_t>(n) * static_cast<size_t>(m));
-    for (int i = 0; i < n; ++i) {
-      for (int j = 0; j < m; ++j) {
-        Xc_row[i * m + j] = X[i * m + j] - mean[j];
-      }
+  // VTfull is l x m (ldvt=l). Copy first kk rows into out.VT (kk x m, ldvt=kk)
+  out.VT.resize(static_cast<size_t>(kk) * static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) {
+    for (int i = 0; i < kk; ++i) {
+      out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + static_cast<size_t>(i)] =
+          ws.vt_full[static_cast<size_t>(j) * static_cast<size_t>(l) + static_cast<size_t>(i)];
     }
-    compute_explained_variance_rowmajor(Xc_row.data(), n, m, w, k, explained_variance, explained_variance_ratio);
+  }
+  return true;
+}
+
+template <typename T>
+SVDResultT<T> rayleigh_ritz(const T* Qb, const T* Z, int n, int m, int l, int kk) {
+  WorkspaceT<T> ws;
+  SVDResultT<T> out;
+  if (!rayleigh_ritz_into(Qb, Z, n, m, l, kk, ws, out)) return {};
+  return out;
+}
+
+// Squared Ritz values (descending, top kk) of the orthonormal basis behind Z = A^T Q (m x l):
+// the eigenvalues of Z^T Z = Q^T A A^T Q.
+template <typename T>
+bool ritz_values_sq(const T* Z, int m, int l, int kk, std::vector<double>& evals,
+                    WorkspaceT<T>* ws = nullptr) {
+  WorkspaceT<T> local;
+  WorkspaceT<T>& w = ws ? *ws : local;
+  w.gf.resize(static_cast<size_t>(l) * static_cast<size_t>(l));
+  xsyrk(CblasColMajor, CblasUpper, CblasTrans, l, m, 1.0f, Z, m, 0.0f, w.gf.data(), l);
+  w.g.assign(w.gf.begin(), w.gf.end());
+  return top_eigenpairs(w.g, l, kk, evals, w.evecs, &w);
+}
+
+// Randomized SVD of the operator A (n x m). Returns top-k.
+//
+// With tol > 0, subspace iteration stops once every one of the top-k squared Ritz values
+// changes by at most tol (relative) between consecutive iterations, the same criterion the
+// CUDA power solver uses. The Ritz values come from Z = A^T Q, which each iteration computes
+// anyway. So the check costs only an l x l eigensolve, and the last Z doubles as the final
+// projection B = Q^T A.
+//
+// init (init_k x m, row-major), when given, warm-starts the range finder: its rows become the
+// leading columns of Omega and only the remaining columns are Gaussian. Seeded with a previous
+// fit's components, a refit on slowly drifting data then converges in one or two iterations.
+template <typename T>
+bool randomized_svd_topk_into(const LinearOperatorT<T>& A, int k, int n_iter, int random_state, float tol,
+                              WorkspaceT<T>& ws, SVDResultT<T>& out,
+                              typename NonDeduced<const T*>::type init = nullptr, int init_k = 0) {
+  const int n = A.n;
+  const int m = A.m;
+  const int min_nm = std::min(n, m);
+  const int kk = std::min(k, min_nm);
+  const int oversample = 10;
+  const int l = std::min(kk + oversample, min_nm);
+
+  // Omega is drawn in float for every T, so float32 and float64 fits start from the same sketch.
+  std::mt19937 rng(static_cast<uint32_t>(random_state <= 0 ? 12345 : random_state));
+  std::normal_distribution<float> nd(0.0f, 1.0f);
+
+  // Omega: m x l (column-major, ld=m)
+  std::vector<T>& Omega = ws.omega;
+  Omega.resize(static_cast<size_t>(m) * static_cast<size_t>(l));
+  for (auto& v : Omega) v = nd(rng);
+  // Row c of init is contiguous, exactly column c of Omega.
+  if (init) std::copy(init, init + static_cast<size_t>(std::clamp(init_k, 0, l)) * static_cast<size_t>(m), Omega.begin());
+
+  // Y = X * Omega => n x l (column-major, ld=n), orthonormalized
+  std::vector<T>& Y = ws.y;
+  Y.resize(static_cast<size_t>(n) * static_cast<size_t>(l));
+  A.apply(Omega.data(), l, Y.data());
+  if (!ortho_qr_inplace(Y.data(), n, l, nullptr, &ws)) return false;
+
+  // Power iterations: Y = (X X^T)^q X Omega
+  std::vector<T>& Z = ws.z;
+  Z.resize(static_cast<size_t>(m) * static_cast<size_t>(l));
+  ws.ritz.clear();
+  ws.prev_ritz.clear();
+  bool z_current = false;  // Z == X^T Y for the current Y
+  int it = 0;
+  for (; it < std::max(0, n_iter); ++it) {
+    // Z = X^T Y => m x l
+    A.apply_t(Y.data(), l, Z.data());
+    if (tol > 0.0f) {
+      if (!ritz_values_sq(Z.data(), m, l, kk, ws.ritz, &ws)) return false;
+      bool converged = !ws.prev_ritz.empty();
+      for (int i = 0; converged && i < kk; ++i) {
+        converged = std::abs(ws.ritz[i] - ws.prev_ritz[i]) <= static_cast<double>(tol) * std::abs(ws.prev_ritz[i]);
+      }
+      if (converged) {
+        z_current = true;
+        break;
+      }
+      ws.prev_ritz.swap(ws.ritz);
+    }
+    // Y = X Z => n x l
+    A.apply(Z.data(), l, Y.data());
+
+    // Normalize to improve numerical stability (similar to sklearn's power_iteration_normalizer).
+    if (!ortho_qr_inplace(Y.data(), n, l, nullptr, &ws)) return false;
+  }
+
+  // B = Q^T X => l x m (column-major, ld=l), formed as (X^T Q)^T
+  if (!z_current) A.apply_t(Y.data(), l, Z.data());
+  if (!rayleigh_ritz_into(Y.data(), Z.data(), n, m, l, kk, ws, out)) return false;
+  out.n_iter = it;
+  out.n_matvecs = static_cast<int64_t>(l) * (2 * static_cast<int64_t>(it) + 2);
+  return true;
+}
+
+template <typename T>
+SVDResultT<T> randomized_svd_topk(const LinearOperatorT<T>& A, int k, int n_iter, int random_state,
+                              float tol, typename NonDeduced<const T*>::type init = nullptr, int init_k = 0) {
+  WorkspaceT<T> ws;
+  SVDResultT<T> out;
+  if (!randomized_svd_topk_into(A, k, n_iter, random_state, tol, ws, out, init, init_k)) return {};
+  return out;
+}
+
+// Rows (or columns) folded into each ssyrk call when accumulating a Gram matrix. Each block is
+// reduced in float by BLAS and then added into a double-precision accumulator.
+constexpr int kGramBlock = 512;
+// Largest Gram side (min(n, m)) the solver picks automatically.
+constexpr int kGramMaxDim = 4096;
+// Aspect ratio max(n, m) / min(n, m) from which the Gram path is picked automatically.
+constexpr int kGramMinAspect = 4;
+
+// Gram-matrix SVD of X (centered by `mean` when it is non-null).
+// Forms X^T X (m <= n) or X X^T (m > n) in one streaming pass of blocked ssyrk calls with double
+// accumulation, takes the top-k eigenpairs of that small matrix, and recovers the other factor
+// with one GEMM against X. Work is O(n m min(n, m)) with O(min(n, m)^2) extra memory.
+template <typename T>
+bool gram_svd_topk_into(const DenseViewT<T>& X, int k, const T* mean, WorkspaceT<T>& ws, SVDResultT<T>& out) {
+  const int n = X.n;
+  const int m = X.m;
+  const bool tall = m <= n;
+  const int dim = tall ? m : n;
+  const int kk = std::min(k, std::min(n, m));
+
+  std::vector<double>& Gd = ws.g;
+  std::vector<T>& Gf = ws.gf;
+  std::vector<T>& buf = ws.block;
+  Gd.assign(static_cast<size_t>(dim) * static_cast<size_t>(dim), 0.0);
+  Gf.assign(static_cast<size_t>(dim) * static_cast<size_t>(dim), 0.0f);
+  if (mean) buf.resize(static_cast<size_t>(kGramBlock) * static_cast<size_t>(dim));
+
+  const int extent = tall ? n : m;
+  for (int b0 = 0; b0 < extent; b0 += kGramBlock) {
+    const int b = std::min(kGramBlock, extent - b0);
+    // The block X_b (rows b0..b0+b when tall, columns otherwise) as a column-major operand A:
+    // X_b^T for row-major storage and for the centered row-major copy, X_b itself when X is
+    // column-major.
+    const T* A = nullptr;
+    int lda = static_cast<int>(X.ld);
+    bool holds_transpose = !X.col_major;
+    if (mean) {
+      if (tall) {
+        for (int i = 0; i < b; ++i) {
+          T* dst = buf.data() + static_cast<size_t>(i) * static_cast<size_t>(m);
+          for (int j = 0; j < m; ++j) dst[j] = X.at(b0 + i, j) - mean[j];
+        }
+      } else {
+        for (int i = 0; i < n; ++i) {
+          T* dst = buf.data() + static_cast<size_t>(i) * static_cast<size_t>(b);
+          for (int j = 0; j < b; ++j) dst[j] = X.at(i, b0 + j) - mean[b0 + j];
+        }
+      }
+      A = buf.data();
+      lda = tall ? m : b;
+      holds_transpose = true;
+    } else if (tall) {
+      A = X.col_major ? X.data + b0 : X.data + static_cast<size_t>(b0) * static_cast<size_t>(X.ld);
+    } else {
+      A = X.col_major ? X.data + static_cast<size_t>(b0) * static_cast<size_t>(X.ld) : X.data + b0;
+    }
+    if (tall) {
+      // G += X_b^T X_b
+      xsyrk(CblasColMajor, CblasUpper, holds_transpose ? CblasNoTrans : CblasTrans, m, b, 1.0f, A, lda,
+                  0.0f, Gf.data(), m);
+    } else {
+      // G += X_b X_b^T
+      xsyrk(CblasColMajor, CblasUpper, holds_transpose ? CblasTrans : CblasNoTrans, n, b, 1.0f, A, lda,
+                  0.0f, Gf.data(), n);
+    }
+    for (int c = 0; c < dim; ++c) {
+      for (int r = 0; r <= c; ++r) {
+        const size_t idx = static_cast<size_t>(c) * static_cast<size_t>(dim) + static_cast<size_t>(r);
+        Gd[idx] += static_cast<double>(Gf[idx]);
+      }
+    }
+  }
+
+  if (!top_eigenpairs(Gd, dim, kk, ws.evals, ws.evecs, &ws)) return false;
+
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.n_iter = 0;
+  out.S.resize(static_cast<size_t>(kk));
+  for (int c = 0; c < kk; ++c) out.S[c] = static_cast<T>(std::sqrt(std::max(0.0, ws.evals[c])));
+  out.n_matvecs = kk;  // the recovery GEMM; the Gram pass itself is a single sweep over X
+
+  std::vector<T>& E = ws.e;  // dim x kk, in T for the recovery GEMM
+  E.assign(ws.evecs.begin(), ws.evecs.end());
+  const DenseViewOperator Xop(X);
+  out.VT.assign(static_cast<size_t>(kk) * static_cast<size_t>(m), 0.0f);
+  out.U.assign(static_cast<size_t>(n) * static_cast<size_t>(kk), 0.0f);
+
+  if (tall) {
+    // Eigenvectors are V. U = Xc V / sigma.
+    for (int c = 0; c < kk; ++c) {
+      for (int j = 0; j < m; ++j) {
+        out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + static_cast<size_t>(c)] =
+            E[static_cast<size_t>(c) * static_cast<size_t>(m) + static_cast<size_t>(j)];
+      }
+    }
+    if (mean) {
+      CenteredOperator(Xop, mean).apply(E.data(), kk, out.U.data());
+    } else {
+      Xop.apply(E.data(), kk, out.U.data());
+    }
+    for (int c = 0; c < kk; ++c) {
+      const T inv = out.S[c] > 0.0f ? 1.0f / out.S[c] : 0.0f;
+      T* u = out.U.data() + static_cast<size_t>(c) * static_cast<size_t>(n);
+      for (int i = 0; i < n; ++i) u[i] *= inv;
+    }
+  } else {
+    // Eigenvectors are U. V = Xc^T U / sigma.
+    std::copy(E.begin(), E.end(), out.U.begin());
+    std::vector<T>& Vt_col = ws.vt_col;
+    Vt_col.resize(static_cast<size_t>(m) * static_cast<size_t>(kk));
+    if (mean) {
+      CenteredOperator(Xop, mean).apply_t(E.data(), kk, Vt_col.data());
+    } else {
+      Xop.apply_t(E.data(), kk, Vt_col.data());
+    }
+    for (int c = 0; c < kk; ++c) {
+      const T inv = out.S[c] > 0.0f ? 1.0f / out.S[c] : 0.0f;
+      for (int j = 0; j < m; ++j) {
+        out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + static_cast<size_t>(c)] =
+            Vt_col[static_cast<size_t>(c) * static_cast<size_t>(m) + static_cast<size_t>(j)] * inv;
+      }
+    }
+  }
+  return true;
+}
+
+// "auto" routes shapes with m >= kWideMinAspect * n to the wide solver when Gram does not apply.
+constexpr int kWideMinAspect = 16;
+
+enum class Solver { Exact, Randomized, Gram, Lanczos, Wide };
+
+// "cusolver" -> exact LAPACK SVD, "gram" -> Gram eigensolver, "lanczos" -> block Krylov,
+// "wide" -> column-partitioned randomized, "power" -> randomized, and "auto" picks by shape.
+// Small problems never go through the randomized path, and very wide ones that Gram cannot take
+// use the column-partitioned variant.
+Solver choose_solver(const char* algorithm, int n, int m) {
+  const int lo = std::min(n, m);
+  const int hi = std::max(n, m);
+  const bool gram_shape = lo <= kGramMaxDim && hi >= kGramMinAspect * lo;
+  if (str_eq(algorithm, "cusolver")) return Solver::Exact;
+  if (str_eq(algorithm, "gram")) return Solver::Gram;
+  if (str_eq(algorithm, "lanczos")) return Solver::Lanczos;
+  if (str_eq(algorithm, "wide")) return Solver::Wide;
+  if (gram_shape && str_eq(algorithm, "auto")) return Solver::Gram;
+  if (lo <= 256) return Solver::Exact;
+  if (str_eq(algorithm, "auto") && m >= kWideMinAspect * static_cast<int64_t>(n)) return Solver::Wide;
+  return Solver::Randomized;
+}
+
+// Block Krylov solver: blocks of Krylov expansion kept before an explicit restart.
+constexpr int kKrylovMaxBlocks = 8;
+
+// W -= K (K^T W) for an orthonormal basis K (n x w) and a block W (n x b).
+template <typename T>
+void project_out(const T* K, int n, int w, T* W, int b, std::vector<T>& tmp) {
+  tmp.resize(static_cast<size_t>(w) * static_cast<size_t>(b));
+  xgemm(CblasColMajor, CblasTrans, CblasNoTrans, w, b, n, 1.0f, K, n, W, n, 0.0f, tmp.data(), w);
+  xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, b, w, -1.0f, K, n, tmp.data(), w, 1.0f, W, n);
+}
+
+// Restarted block Krylov (block Lanczos) SVD of A. The basis
+//   K = [X Omega, (X X^T) X Omega, (X X^T)^2 X Omega, ...]
+// is built with block size k and full reorthogonalization. Its top-k Ritz triplets converge in
+// far fewer passes than subspace iteration on slowly decaying spectra. n_iter counts Krylov
+// expansion steps. When the basis reaches kKrylovMaxBlocks blocks, the solver restarts from
+// the current leading Ritz vectors.
+template <typename T>
+SVDResultT<T> block_krylov_svd_topk(const LinearOperatorT<T>& A, int k, int n_iter, int random_state) {
+  const int n = A.n;
+  const int m = A.m;
+  const int min_nm = std::min(n, m);
+  const int kk = std::min(k, min_nm);
+  const int b = kk;
+  const int max_w = std::min(min_nm, b * kKrylovMaxBlocks);
+  // Not enough room for even one expansion step: the oversampled range finder is exact here.
+  if (2 * b > max_w) return randomized_svd_topk(A, k, n_iter, random_state, 0.0f);
+
+  std::mt19937 rng(static_cast<uint32_t>(random_state <= 0 ? 12345 : random_state));
+  std::normal_distribution<float> nd(0.0f, 1.0f);
+
+  std::vector<T> Omega(static_cast<size_t>(m) * static_cast<size_t>(b));
+  for (auto& v : Omega) v = nd(rng);
+
+  std::vector<T> K(static_cast<size_t>(n) * static_cast<size_t>(max_w), 0.0f);
+  std::vector<T> Z(static_cast<size_t>(m) * static_cast<size_t>(max_w), 0.0f);
+  std::vector<T> W(static_cast<size_t>(n) * static_cast<size_t>(b), 0.0f);
+  std::vector<T> tmp;
+
+  A.apply(Omega.data(), b, K.data());
+  int64_t matvecs = b;
+  if (!ortho_qr_inplace(K.data(), n, b)) return {};
+
+  int w = b;
+  int steps = 0;
+  const int target = std::max(0, n_iter);
+  while (true) {
+    while (steps < target && w + b <= max_w) {
+      const T* last = K.data() + static_cast<size_t>(w - b) * static_cast<size_t>(n);
+      A.apply_t(last, b, Z.data());
+      A.apply(Z.data(), b, W.data());
+      matvecs += 2 * static_cast<int64_t>(b);
+
+      // Two rounds of block Gram-Schmidt against K, each followed by QR. A second round also
+      // repairs columns that collapsed into span(K).
+      project_out(K.data(), n, w, W.data(), b, tmp);
+      project_out(K.data(), n, w, W.data(), b, tmp);
+      if (!ortho_qr_inplace(W.data(), n, b)) return {};
+      project_out(K.data(), n, w, W.data(), b, tmp);
+      if (!ortho_qr_inplace(W.data(), n, b)) return {};
+
+      std::copy(W.begin(), W.end(), K.begin() + static_cast<size_t>(w) * static_cast<size_t>(n));
+      w += b;
+      ++steps;
+    }
+
+    A.apply_t(K.data(), w, Z.data());
+    matvecs += w;
+    SVDResultT<T> ritz = rayleigh_ritz(K.data(), Z.data(), n, m, w, kk);
+    if (ritz.S.empty()) return {};
+    if (steps >= target) {
+      ritz.n_iter = steps;
+      ritz.n_matvecs = matvecs;
+      return ritz;
+    }
+
+    // Restart: the leading Ritz vectors (already orthonormal) seed the next Krylov cycle.
+    std::copy(ritz.U.begin(), ritz.U.end(), K.begin());
+    w = b;
+  }
+}
+
+// Column-partitioned randomized SVD for very wide matrices (m >> n). Columns are processed in
+// blocks of kWideBlock, and the Gaussian test matrix Omega is generated block by block from a
+// counter-based hash of (seed, column, sketch index) instead of being stored. Power iterations
+// use Y = sum_J X_J (X_J^T Q), so the only m-sized state is the k x m output.
+constexpr int kWideBlock = 4096;
+
+inline uint64_t splitmix64(uint64_t x) {
+  x += 0x9E3779B97F4A7C15ULL;
+  x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+  x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+  return x ^ (x >> 31);
+}
+
+// Standard normal variate for entry (j, c) of Omega, reproducible from any block partition.
+inline float counter_normal(uint64_t seed, int64_t j, int c) {
+  const uint64_t h1 = splitmix64(seed ^ splitmix64(static_cast<uint64_t>(j) * 0x100000001B3ULL + static_cast<uint64_t>(c)));
+  const uint64_t h2 = splitmix64(h1);
+  const double u1 = (static_cast<double>(h1 >> 11) + 0.5) * 0x1.0p-53;
+  const double u2 = static_cast<double>(h2 >> 11) * 0x1.0p-53;
+  return static_cast<float>(std::sqrt(-2.0 * std::log(u1)) * std::cos(6.283185307179586 * u2));
+}
+
+// Contribution of columns [lo, hi) of the (optionally centered) n x m matrix X;
+// mean_block (nullable) holds the means of those columns.
+// Q == nullptr: Y += X_J Omega_J. Otherwise TJ = X_J^T Q (b x l) and, when given, Y += X_J TJ
+// and G += TJ^T TJ (upper triangle, double). TJ is left in ws.b for callers that need it.
+template <typename T>
+void wide_accumulate(const DenseViewT<T>& X, typename NonDeduced<const T*>::type mean_block,
+                     typename NonDeduced<const T*>::type Q, int64_t lo, int64_t hi,
+                     int l, uint64_t seed, typename NonDeduced<T*>::type Y, double* G, WorkspaceT<T>& ws) {
+  const int n = X.n;
+  const int b = static_cast<int>(hi - lo);
+  std::vector<T>& TJ = ws.b;
+  // As a column-major operand, XJ is X_J^T (b x n) for row-major X and X_J (n x b) otherwise.
+  const T* XJ = X.col_major ? X.data + static_cast<size_t>(lo) * static_cast<size_t>(X.ld) : X.data + lo;
+  const CBLAS_TRANSPOSE to_xjt = X.col_major ? CblasTrans : CblasNoTrans;
+  const CBLAS_TRANSPOSE to_xj = X.col_major ? CblasNoTrans : CblasTrans;
+  const T* meanJ = mean_block;
+  const int ldx = static_cast<int>(X.ld);
+  TJ.resize(static_cast<size_t>(b) * static_cast<size_t>(l));
+
+  if (!Q) {
+    for (int c = 0; c < l; ++c) {
+      for (int j = 0; j < b; ++j) TJ[static_cast<size_t>(c) * static_cast<size_t>(b) + j] = counter_normal(seed, lo + j, c);
+    }
+  } else {
+    xgemm(CblasColMajor, to_xjt, CblasNoTrans, b, l, n, 1.0f, XJ, ldx, Q, n, 0.0f, TJ.data(), b);
+    if (meanJ) {
+      for (int c = 0; c < l; ++c) {
+        double colsum = 0.0;
+        for (int i = 0; i < n; ++i) colsum += static_cast<double>(Q[static_cast<size_t>(c) * static_cast<size_t>(n) + i]);
+        xaxpy(b, static_cast<T>(-colsum), meanJ, 1, TJ.data() + static_cast<size_t>(c) * static_cast<size_t>(b), 1);
+      }
+    }
+    if (G) {
+      std::vector<T>& Gb = ws.gf;
+      Gb.resize(static_cast<size_t>(l) * static_cast<size_t>(l));
+      xsyrk(CblasColMajor, CblasUpper, CblasTrans, l, b, 1.0f, TJ.data(), b, 0.0f, Gb.data(), l);
+      for (int c = 0; c < l; ++c) {
+        for (int r = 0; r <= c; ++r) G[static_cast<size_t>(c) * static_cast<size_t>(l) + r] += static_cast<double>(Gb[static_cast<size_t>(c) * static_cast<size_t>(l) + r]);
+      }
+    }
+  }
+  if (!Y) return;
+  // Y += X_J TJ - 1 (mean_J^T TJ)
+  xgemm(CblasColMajor, to_xj, CblasNoTrans, n, l, b, 1.0f, XJ, ldx, TJ.data(), b, 1.0f, Y, n);
+  if (meanJ) {
+    for (int c = 0; c < l; ++c) {
+      const T shift = xdot(b, meanJ, 1, TJ.data() + static_cast<size_t>(c) * static_cast<size_t>(b), 1);
+      T* col = Y + static_cast<size_t>(c) * static_cast<size_t>(n);
+      for (int i = 0; i < n; ++i) col[i] -= shift;
+    }
+  }
+}
+
+// Ritz step of the wide solver from the l x l Gram matrix G = Q^T X X^T Q = W diag(s^2) W^T:
+// singular values s, left vectors U = Q W (n x kk, column-major) and W diag(1/s) (l x kk), which
+// maps a block T = X_J^T Q to the matching right singular vectors.
+template <typename T>
+bool wide_ritz(const T* Q, std::vector<double>& G, int n, int l, int kk, std::vector<T>& S,
+               std::vector<T>& U, std::vector<T>& Wsc, WorkspaceT<T>& ws) {
+  const std::vector<double>& evals = ws.evals;
+  const std::vector<double>& evecs = ws.evecs;
+  if (!top_eigenpairs(G, l, kk, ws.evals, ws.evecs, &ws)) return false;
+  S.resize(static_cast<size_t>(kk));
+  std::vector<T>& W = ws.uhat;
+  W.resize(static_cast<size_t>(l) * static_cast<size_t>(kk));
+  Wsc.resize(static_cast<size_t>(l) * static_cast<size_t>(kk));
+  for (int i = 0; i < kk; ++i) {
+    const double sv = std::sqrt(std::max(0.0, evals[i]));
+    S[i] = static_cast<T>(sv);
+    for (int c = 0; c < l; ++c) {
+      const double v = evecs[static_cast<size_t>(i) * static_cast<size_t>(l) + c];
+      W[static_cast<size_t>(i) * static_cast<size_t>(l) + c] = static_cast<T>(v);
+      Wsc[static_cast<size_t>(i) * static_cast<size_t>(l) + c] = static_cast<T>(sv > 0.0 ? v / sv : 0.0);
+    }
+  }
+  U.resize(static_cast<size_t>(n) * static_cast<size_t>(kk));
+  xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, kk, l, 1.0f, Q, n, W.data(), l, 0.0f, U.data(), n);
+  return true;
+}
+
+template <typename T>
+bool wide_svd_topk_into(const DenseViewT<T>& X, int k, const T* mean, int n_iter, int random_state,
+                        WorkspaceT<T>& ws, SVDResultT<T>& out) {
+  const int n = X.n;
+  const int m = X.m;
+  const int min_nm = std::min(n, m);
+  const int kk = std::min(k, min_nm);
+  const int l = std::min(kk + 10, min_nm);
+  const uint64_t seed = static_cast<uint64_t>(random_state <= 0 ? 12345 : random_state);
+
+  std::vector<T>& Y = ws.y;
+  std::vector<T>& Q = ws.z;
+  Y.assign(static_cast<size_t>(n) * static_cast<size_t>(l), 0.0f);
+  for (int64_t lo = 0; lo < m; lo += kWideBlock) {
+    const int64_t hi = std::min<int64_t>(m, lo + kWideBlock);
+    wide_accumulate(X, mean ? mean + lo : nullptr, nullptr, lo, hi, l, seed, Y.data(), nullptr, ws);
+  }
+  for (int it = 0; it < std::max(0, n_iter); ++it) {
+    if (!ortho_qr_inplace(Y.data(), n, l, nullptr, &ws)) return false;
+    Q.swap(Y);
+    Y.assign(static_cast<size_t>(n) * static_cast<size_t>(l), 0.0f);
+    for (int64_t lo = 0; lo < m; lo += kWideBlock) {
+      const int64_t hi = std::min<int64_t>(m, lo + kWideBlock);
+      wide_accumulate(X, mean ? mean + lo : nullptr, Q.data(), lo, hi, l, seed, Y.data(), nullptr, ws);
+    }
+  }
+  if (!ortho_qr_inplace(Y.data(), n, l, nullptr, &ws)) return false;
+  Q.swap(Y);
+
+  // Rayleigh-Ritz through the l x l Gram matrix G = Q^T X X^T Q = W diag(s^2) W^T.
+  std::vector<double>& G = ws.g;
+  G.assign(static_cast<size_t>(l) * static_cast<size_t>(l), 0.0);
+  for (int64_t lo = 0; lo < m; lo += kWideBlock) {
+    const int64_t hi = std::min<int64_t>(m, lo + kWideBlock);
+    wide_accumulate(X, mean ? mean + lo : nullptr, Q.data(), lo, hi, l, seed, nullptr, G.data(), ws);
+  }
+  std::vector<T>& Wsc = ws.vt_col;
+  if (!wide_ritz(Q.data(), G, n, l, kk, out.S, out.U, Wsc, ws)) return false;
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.n_iter = std::max(0, n_iter);
+  out.n_matvecs = static_cast<int64_t>(l) * (2 * static_cast<int64_t>(out.n_iter) + 3);
+
+  // V_J = X_J^T Q W diag(1/s), written straight into VT (kk x m, ld = kk).
+  out.VT.resize(static_cast<size_t>(kk) * static_cast<size_t>(m));
+  for (int64_t lo = 0; lo < m; lo += kWideBlock) {
+    const int64_t hi = std::min<int64_t>(m, lo + kWideBlock);
+    const int b = static_cast<int>(hi - lo);
+    wide_accumulate(X, mean ? mean + lo : nullptr, Q.data(), lo, hi, l, seed, nullptr, nullptr, ws);
+    xgemm(CblasColMajor, CblasTrans, CblasTrans, kk, b, l, 1.0f, Wsc.data(), l, ws.b.data(), b, 0.0f,
+                out.VT.data() + static_cast<size_t>(lo) * static_cast<size_t>(kk), kk);
+  }
+  return true;
+}
+
+// Adaptive-rank solver: columns added to the QB factorization per growth step.
+constexpr int kAdaptiveBlock = 16;
+
+// Incremental blocked QB (randQB_b) of A: grows an orthonormal basis Q (n x w) and B = Q^T A
+// (w x m) block by block, with n_iter power iterations per block on the deflated residual
+// A - Q B. It stops as soon as the captured energy ||B||_F^2 exceeds target * total_energy,
+// where total_energy is ||A||_F^2 (computed cheaply up front). The SVD of B then yields the
+// smallest k whose leading singular values meet the target. Returns all w triplets with
+// out.k set to that k.
+template <typename T>
+SVDResultT<T> adaptive_qb_svd(const LinearOperatorT<T>& A, double total_energy, double target, int n_iter,
+                              int random_state) {
+  const int n = A.n;
+  const int m = A.m;
+  const int min_nm = std::min(n, m);
+  const double goal = target * total_energy;
+
+  std::mt19937 rng(static_cast<uint32_t>(random_state <= 0 ? 12345 : random_state));
+  std::normal_distribution<float> nd(0.0f, 1.0f);
+
+  std::vector<T> Qb;  // n x w, column-major
+  std::vector<T> Bt;  // m x w, column-major: B^T, so new rows of B append as columns
+  std::vector<T> Omega;
+  std::vector<T> Y;
+  std::vector<T> Z;
+  std::vector<T> C;
+  std::vector<T> tmp;
+  int w = 0;
+  int64_t matvecs = 0;
+  double captured = 0.0;
+
+  while (w < min_nm && captured <= goal) {
+    const int b = std::min(kAdaptiveBlock, min_nm - w);
+    Omega.resize(static_cast<size_t>(m) * static_cast<size_t>(b));
+    for (auto& v : Omega) v = nd(rng);
+    Y.assign(static_cast<size_t>(n) * static_cast<size_t>(b), T(0));
+    Z.assign(static_cast<size_t>(m) * static_cast<size_t>(b), T(0));
+
+    // Y = (A - Q B) Omega
+    A.apply(Omega.data(), b, Y.data());
+    matvecs += b;
+    if (w > 0) {
+      C.resize(static_cast<size_t>(w) * static_cast<size_t>(b));
+      xgemm(CblasColMajor, CblasTrans, CblasNoTrans, w, b, m, T(1), Bt.data(), m, Omega.data(), m, T(0), C.data(), w);
+      xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, b, w, T(-1), Qb.data(), n, C.data(), w, T(1), Y.data(), n);
+    }
+
+    // Power iterations on the residual. With Y orthogonal to Q, (A - Q B)^T Y = A^T Y.
+    for (int it = 0; it < std::max(0, n_iter); ++it) {
+      if (w > 0) project_out(Qb.data(), n, w, Y.data(), b, tmp);
+      if (!ortho_qr_inplace(Y.data(), n, b)) return {};
+      A.apply_t(Y.data(), b, Z.data());
+      A.apply(Z.data(), b, Y.data());
+      matvecs += 2 * static_cast<int64_t>(b);
+      if (w > 0) {
+        C.resize(static_cast<size_t>(w) * static_cast<size_t>(b));
+        xgemm(CblasColMajor, CblasTrans, CblasNoTrans, w, b, m, T(1), Bt.data(), m, Z.data(), m, T(0), C.data(), w);
+        xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, b, w, T(-1), Qb.data(), n, C.data(), w, T(1), Y.data(), n);
+      }
+    }
+
+    if (w > 0) {
+      project_out(Qb.data(), n, w, Y.data(), b, tmp);
+      project_out(Qb.data(), n, w, Y.data(), b, tmp);
+    }
+    if (!ortho_qr_inplace(Y.data(), n, b)) return {};
+    if (w > 0) {
+      project_out(Qb.data(), n, w, Y.data(), b, tmp);
+      if (!ortho_qr_inplace(Y.data(), n, b)) return {};
+    }
+
+    // B_i = Q_i^T A, stored as its transpose Z = A^T Q_i.
+    A.apply_t(Y.data(), b, Z.data());
+    matvecs += b;
+    double block_energy = 0.0;
+    for (T v : Z) block_energy += static_cast<double>(v) * static_cast<double>(v);
+    captured += block_energy;
+
+    Qb.insert(Qb.end(), Y.begin(), Y.end());
+    Bt.insert(Bt.end(), Z.begin(), Z.end());
+    w += b;
+  }
+
+  SVDResultT<T> out = rayleigh_ritz(Qb.data(), Bt.data(), n, m, w, w);
+  if (out.S.empty()) return {};
+
+  int k = w;
+  double cum = 0.0;
+  for (int i = 0; i < w; ++i) {
+    cum += static_cast<double>(out.S[i]) * static_cast<double>(out.S[i]);
+    if (cum > goal) {
+      k = i + 1;
+      break;
+    }
+  }
+  out.k = k;
+  out.n_iter = std::max(0, n_iter);
+  out.n_matvecs = matvecs;
+  return out;
+}
+
+template <typename T>
+void explained_variance_from_total(const T* s, int n, int k, double total_var,
+                                   T* explained_variance, T* explained_variance_ratio) {
+  const double denom = std::max(1, n - 1);
+  for (int i = 0; i < k; ++i) {
+    explained_variance[i] = static_cast<T>((static_cast<double>(s[i]) * static_cast<double>(s[i])) / denom);
+  }
+  if (total_var <= 0.0) total_var = 1.0;
+  for (int i = 0; i < k; ++i) {
+    explained_variance_ratio[i] = static_cast<T>(static_cast<double>(explained_variance[i]) / total_var);
+  }
+}
+
+// Column means of a CSR/CSC matrix from its nonzeros only.
+std::vector<double> sparse_column_mean(const int64_t* indptr, const int32_t* indices,
+                                       const float* data, int n, int m, bool csc) {
+  std::vector<double> mean_d(static_cast<size_t>(m), 0.0);
+  const int n_major = csc ? m : n;
+  for (int r = 0; r < n_major; ++r) {
+    for (int64_t p = indptr[r]; p < indptr[r + 1]; ++p) {
+      mean_d[csc ? r : indices[p]] += static_cast<double>(data[p]);
+    }
+  }
+  for (int j = 0; j < m; ++j) mean_d[j] /= static_cast<double>(n);
+  return mean_d;
+}
+
+// ||X||_F^2 of a CSR/CSC matrix from its nonzeros only.
+double sparse_frobenius_sq(const int64_t* indptr, const float* data, int n_major) {
+  double acc = 0.0;
+  for (int64_t p = 0; p < indptr[n_major]; ++p) acc += static_cast<double>(data[p]) * static_cast<double>(data[p]);
+  return acc;
+}
+
+// Total (column-wise, ddof=1) variance of a CSR/CSC matrix from its nonzeros only.
+double sparse_total_variance(const int64_t* indptr, const int32_t* indices, const float* data,
+                             int n, int m, bool csc) {
+  std::vector<double> sum(static_cast<size_t>(m), 0.0);
+  std::vector<double> sumsq(static_cast<size_t>(m), 0.0);
+  const int n_major = csc ? m : n;
+  for (int r = 0; r < n_major; ++r) {
+    for (int64_t p = indptr[r]; p < indptr[r + 1]; ++p) {
+      const int j = csc ? r : indices[p];
+      const double v = static_cast<double>(data[p]);
+      sum[j] += v;
+      sumsq[j] += v * v;
+    }
+  }
+  const double denom = std::max(1, n - 1);
+  double total_var = 0.0;
+  for (int j = 0; j < m; ++j) {
+    const double mean = sum[j] / static_cast<double>(n);
+    total_var += std::max(0.0, sumsq[j] - static_cast<double>(n) * mean * mean) / denom;
+  }
+  return total_var;
+}
+
+// Row-major outputs from svd. With `whiten` (PCA), X_transformed holds U * sqrt(n - 1), the scores
+// scaled to unit variance per component, instead of U * diag(w).
+template <typename T>
+void fill_outputs_rowmajor(const SVDResultT<T>& svd, T* Q_row, T* w_out, T* U_row, T* X_transformed_row,
+                           bool whiten = false) {
+  const int n = svd.n;
+  const int m = svd.m;
+  const int k = svd.k;
+
+  // w
+  std::copy(svd.S.begin(), svd.S.end(), w_out);
+
+  // Q (components) in row-major: k x m.
+  // svd.VT is column-major (ldvt=k), shape k x m.
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(k, m))
+#endif
+  for (int i = 0; i < k; ++i) {
+    T* q = Q_row + static_cast<size_t>(i) * static_cast<size_t>(m);
+    for (int j = 0; j < m; ++j) {
+      q[j] = svd.VT[static_cast<size_t>(j) * static_cast<size_t>(k) + static_cast<size_t>(i)];
+    }
+  }
+
+  // U and X_transformed = U * diag(w), both row-major n x k, in one pass over
+  // svd.U (column-major, ldu=n). Either may be null when the caller does not want it.
+  if (!U_row && !X_transformed_row) return;
+  const T unit = static_cast<T>(std::sqrt(static_cast<double>(std::max(0, n - 1))));
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (pass_parallel(n, k))
+#endif
+  for (int i = 0; i < n; ++i) {
+    T* u = U_row ? U_row + static_cast<size_t>(i) * static_cast<size_t>(k) : nullptr;
+    T* xt = X_transformed_row ? X_transformed_row + static_cast<size_t>(i) * static_cast<size_t>(k) : nullptr;
+    for (int j = 0; j < k; ++j) {
+      const T v = svd.U[static_cast<size_t>(j) * static_cast<size_t>(n) + static_cast<size_t>(i)];
+      if (u) u[j] = v;
+      if (xt) xt[j] = v * (whiten ? unit : w_out[j]);
+    }
+  }
+}
+
+// Operator-based solve used by every path that never materializes X (sparse, centered).
+SVDResult iterative_svd_topk(const LinearOperator& A, int k, const params& p) {
+  if (str_eq(p.algorithm, "lanczos")) return block_krylov_svd_topk(A, k, p.n_iter, p.random_state);
+  return randomized_svd_topk(A, k, p.n_iter, p.random_state, p.tol, static_cast<const float*>(p.init), p.init_k);
+}
+
+template <typename T>
+void write_fit_info(const params& p, const SVDResultT<T>& svd) {
+  if (!p.info) return;
+  p.info->n_iter = svd.n_iter;
+  p.info->n_matvecs = svd.n_matvecs;
+  p.info->k = svd.k;
+}
+
+// One incremental (IncrementalPCA-style) update. Stacks the current factor diag(w) * Q (k_prev x m),
+// the batch rows (centered on the batch mean when `center`) and, for PCA, a mean-shift row
+// sqrt(n_seen * n_b / n_total) * (mean_old - mean_batch). The top-k SVD of this small
+// (k_prev + n_b + 1) x m matrix is the factor of all rows seen so far, so the cost per batch does
+// not depend on how many rows came before. mean and total_sq (the running sum of squared
+// deviations from the mean) are updated in place with Chan's pairwise formula.
+SVDResult incremental_svd_merge(const float* X_batch, int n_b, int m, int k, const float* Q,
+                                const float* w, int k_prev, float* mean, double* total_sq,
+                                int64_t n_seen, bool center) {
+  std::vector<double> batch_mean, batch_m2;
+  column_moments(DenseView::row_major(X_batch, n_b, m), batch_mean, batch_m2);
+  const double n_old = static_cast<double>(n_seen);
+  const double n_new = static_cast<double>(n_b);
+  const double n_total = n_old + n_new;
+
+  double batch_sq = 0.0;
+  for (double v : batch_m2) batch_sq += v;
+  double shift_sq = 0.0;
+  std::vector<double> shift(static_cast<size_t>(m), 0.0);
+  for (int j = 0; j < m; ++j) {
+    shift[j] = (n_seen > 0 ? static_cast<double>(mean[j]) : batch_mean[j]) - batch_mean[j];
+    shift_sq += shift[j] * shift[j];
+  }
+  const double shift_scale = n_seen > 0 ? std::sqrt(n_old * n_new / n_total) : 0.0;
+  *total_sq = (n_seen > 0 ? *total_sq : 0.0) + batch_sq + shift_scale * shift_scale * shift_sq;
+
+  const int prev = n_seen > 0 ? k_prev : 0;
+  const int extra = (center && n_seen > 0) ? 1 : 0;
+  const int r = prev + n_b + extra;
+  std::vector<float> M(static_cast<size_t>(r) * static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) {
+    float* col = M.data() + static_cast<size_t>(j) * static_cast<size_t>(r);
+    for (int i = 0; i < prev; ++i) col[i] = w[i] * Q[static_cast<size_t>(i) * static_cast<size_t>(m) + j];
+    const float bm = center ? static_cast<float>(batch_mean[j]) : 0.0f;
+    for (int i = 0; i < n_b; ++i) {
+      col[prev + i] = X_batch[static_cast<size_t>(i) * static_cast<size_t>(m) + j] - bm;
+    }
+    if (extra) col[prev + n_b] = static_cast<float>(shift_scale * shift[j]);
+  }
+
+  for (int j = 0; j < m; ++j) {
+    const double old = n_seen > 0 ? static_cast<double>(mean[j]) : 0.0;
+    mean[j] = static_cast<float>((n_old * old + n_new * batch_mean[j]) / n_total);
+  }
+
+  SVDResult out = exact_svd_topk_colmajor(M, r, m, k);
+  out.n = static_cast<int>(std::min<int64_t>(n_seen + n_b, std::numeric_limits<int>::max()));
+  return out;
+}
+
+// Out-of-core (streamed) fits work in the row space of X, so nothing of size n is kept between
+// chunks. Every pass accumulates Z = X_s^T X_s V and G = V^T X_s^T X_s V one row chunk at a time,
+// where X_s = X - 1 s^T is shifted by a reference row s (the first chunk's mean) so that large
+// column offsets do not swamp the float32 GEMMs. With d = mu - s, the products wanted follow in
+// double once the pass is complete: C^T C = X_s^T X_s - n d d^T for PCA, and
+// X^T X = X_s^T X_s + n (mu mu^T - d d^T) otherwise.
+// col_stats layout: [count, mean(m), m2(m)] with m2 the per-column sum of squared deviations.
+void merge_column_stats(const float* X_chunk, int rows, int m, double* col_stats) {
+  std::vector<double> chunk_mean, chunk_m2;
+  column_moments(DenseView::row_major(X_chunk, rows, m), chunk_mean, chunk_m2);
+  const double n_old = col_stats[0];
+  const double n_new = static_cast<double>(rows);
+  const double n_total = n_old + n_new;
+  double* mean = col_stats + 1;
+  double* m2 = col_stats + 1 + m;
+  for (int j = 0; j < m; ++j) {
+    const double delta = chunk_mean[j] - mean[j];
+    m2[j] += chunk_m2[j] + delta * delta * n_old * n_new / n_total;
+    mean[j] += delta * n_new / n_total;
+  }
+  col_stats[0] = n_total;
+}
+
+// v^T V (1 x l) for V column-major m x l.
+std::vector<double> streamed_projection(const float* V, int m, int l, const std::vector<double>& v) {
+  std::vector<double> vV(static_cast<size_t>(l), 0.0);
+  for (int c = 0; c < l; ++c) {
+    double acc = 0.0;
+    for (int j = 0; j < m; ++j) acc += v[j] * static_cast<double>(V[static_cast<size_t>(c) * static_cast<size_t>(m) + j]);
+    vV[c] = acc;
+  }
+  return vV;
+}
+
+// The rank-two correction from the shifted to the wanted products: Z += n (a a^T - d d^T) V with
+// d = mu - shift and a = mu (a = 0 for PCA). Returns the vectors and their projections on V.
+struct StreamedCorrection {
+  std::vector<double> d, dV, a, aV;
+};
+
+StreamedCorrection streamed_correction(const float* V, int m, int l, const double* col_stats,
+                                       const float* shift, bool center) {
+  StreamedCorrection out;
+  const double* mean = col_stats + 1;
+  out.d.resize(static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) out.d[j] = mean[j] - (shift ? static_cast<double>(shift[j]) : 0.0);
+  out.dV = streamed_projection(V, m, l, out.d);
+  out.a.assign(static_cast<size_t>(m), 0.0);
+  if (!center) std::copy(mean, mean + m, out.a.begin());
+  out.aV = streamed_projection(V, m, l, out.a);
+  return out;
+}
+
+// Least-squares solve min ||A X - B||_F for a full-column-rank A (rows x cols, rows >= cols,
+// column-major) via sgels. A is overwritten; B (rows x nrhs, ldb=rows) holds X in its first cols
+// rows on return.
+bool least_squares_inplace(std::vector<float>& A, int rows, int cols, std::vector<float>& B, int nrhs) {
+  char trans = 'N';
+  int M = rows, N = cols, NRHS = nrhs, lda = rows, ldb = rows, info = 0;
+  int lwork = -1;
+  float wkopt = 0.0f;
+  sgels_(&trans, &M, &N, &NRHS, A.data(), &lda, B.data(), &ldb, &wkopt, &lwork, &info);
+  if (info != 0) return false;
+  lwork = lwork_from_query(wkopt);
+  std::vector<float> work(static_cast<size_t>(std::max(1, lwork)));
+  sgels_(&trans, &M, &N, &NRHS, A.data(), &lda, B.data(), &ldb, work.data(), &lwork, &info);
+  return info == 0;
+}
+
+// Single-pass sketch (Tropp et al., "Practical sketching algorithms for low-rank matrix
+// approximation"): range sketch Y = X Omega (n x s) and co-range sketch W = Psi X (t x m).
+// Centering is applied after the fact because both sketches are linear:
+// (X - 1 mu^T) Omega = Y - 1 (mu^T Omega) and Psi (X - 1 mu^T) = W - (Psi 1) mu^T.
+// Then Q = orth(Y), B = (Psi Q)^+ W and the SVD of B gives the factorization Q B of X.
+// The sketches are taken of X - 1 shift^T (shift: a reference row, e.g. the first batch mean,
+// which keeps large offsets out of the float32 GEMMs). `delta` = target center - shift is
+// removed here, so delta = mean - shift gives PCA and delta = -shift the uncentered SVD.
+SVDResult sketch_reconstruct(const float* Y_row, const float* Psi, const double* W, const float* Omega,
+                             const std::vector<double>& delta, int n, int m, int s, int t, int k) {
+  std::vector<float> Qy = to_col_major(Y_row, n, s);
+  std::vector<float> W_c(static_cast<size_t>(t) * static_cast<size_t>(m));
+  for (size_t i = 0; i < W_c.size(); ++i) W_c[i] = static_cast<float>(W[i]);
+  for (int c = 0; c < s; ++c) {
+    double offset = 0.0;
+    for (int j = 0; j < m; ++j) offset += delta[j] * static_cast<double>(Omega[static_cast<size_t>(c) * static_cast<size_t>(m) + j]);
+    float* col = Qy.data() + static_cast<size_t>(c) * static_cast<size_t>(n);
+    for (int i = 0; i < n; ++i) col[i] -= static_cast<float>(offset);
+  }
+  std::vector<double> psi_sum(static_cast<size_t>(t), 0.0);
+  for (int i = 0; i < n; ++i) {
+    for (int r = 0; r < t; ++r) psi_sum[r] += static_cast<double>(Psi[static_cast<size_t>(i) * static_cast<size_t>(t) + r]);
+  }
+  for (int j = 0; j < m; ++j) {
+    for (int r = 0; r < t; ++r) {
+      W_c[static_cast<size_t>(j) * static_cast<size_t>(t) + r] -= static_cast<float>(psi_sum[r] * delta[j]);
+    }
+  }
+  if (!ortho_qr_inplace(Qy.data(), n, s)) return {};
+
+  // P = Psi Q (t x s); B solves P B = W_c in the least-squares sense.
+  std::vector<float> P(static_cast<size_t>(t) * static_cast<size_t>(s));
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, t, s, n, 1.0f, Psi, t, Qy.data(), n, 0.0f, P.data(), t);
+  if (!least_squares_inplace(P, t, s, W_c, m)) return {};
+  std::vector<float> B(static_cast<size_t>(s) * static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) {
+    std::copy(W_c.begin() + static_cast<size_t>(j) * static_cast<size_t>(t),
+              W_c.begin() + static_cast<size_t>(j) * static_cast<size_t>(t) + s,
+              B.begin() + static_cast<size_t>(j) * static_cast<size_t>(s));
+  }
+
+  std::vector<float> sv;
+  std::vector<float> Ub;
+  std::vector<float> VTb;
+  if (!thin_svd_colmajor(B, s, m, sv, Ub, VTb)) return {};
+  const int min_sm = std::min(s, m);
+  const int kk = std::min(k, min_sm);
+
+  SVDResult out;
+  out.n = n;
+  out.m = m;
+  out.k = kk;
+  out.S.assign(sv.begin(), sv.begin() + kk);
+  out.U.assign(static_cast<size_t>(n) * static_cast<size_t>(kk), 0.0f);
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, n, kk, s, 1.0f, Qy.data(), n, Ub.data(), s, 0.0f, out.U.data(), n);
+  out.VT.assign(static_cast<size_t>(kk) * static_cast<size_t>(m), 0.0f);
+  for (int j = 0; j < m; ++j) {
+    for (int i = 0; i < kk; ++i) {
+      out.VT[static_cast<size_t>(j) * static_cast<size_t>(kk) + i] = VTb[static_cast<size_t>(j) * static_cast<size_t>(min_sm) + i];
+    }
+  }
+  return out;
+}
+
+// Frequent Directions shrink (Liberty 2013; Ghashami et al. 2016): B (rows x m, row-major) is
+// replaced by diag(sqrt(max(s_i^2 - delta, 0))) V^T with delta = s_ell^2 (the ell-th squared singular
+// value), so at most ell - 1 nonzero rows remain. Those rows are written to the top of B and the
+// rest is zeroed. Returns the number of rows kept, or -1 on failure. `delta` is added to *shrunk.
+int frequent_directions_shrink(float* B, int rows, int m, int ell, double* shrunk) {
+  std::vector<float> A = to_col_major(B, rows, m);
+  std::vector<float> sv;
+  std::vector<float> Ub;
+  std::vector<float> VTb;
+  if (!thin_svd_colmajor(A, rows, m, sv, Ub, VTb)) return -1;
+  const int min_rm = std::min(rows, m);
+  const double delta = ell <= min_rm ? static_cast<double>(sv[ell - 1]) * static_cast<double>(sv[ell - 1]) : 0.0;
+
+  std::fill(B, B + static_cast<size_t>(rows) * static_cast<size_t>(m), 0.0f);
+  int kept = 0;
+  for (int i = 0; i < min_rm; ++i) {
+    const double sq = static_cast<double>(sv[i]) * static_cast<double>(sv[i]) - delta;
+    if (sq <= 0.0) break;
+    const float scale = static_cast<float>(std::sqrt(sq));
+    float* row = B + static_cast<size_t>(kept) * static_cast<size_t>(m);
+    for (int j = 0; j < m; ++j) row[j] = scale * VTb[static_cast<size_t>(j) * static_cast<size_t>(min_rm) + i];
+    ++kept;
+  }
+  *shrunk += delta;
+  return kept;
+}
+
+// Writes the first out.k triplets of an adaptive solve: components (k x m, row-major), singular
+// values and explained variance.
+template <typename T>
+void fill_adaptive_outputs(const SVDResultT<T>& svd, int n, double total_var, T* Q, T* w,
+                           T* explained_variance, T* explained_variance_ratio) {
+  const int m = svd.m;
+  const int k = svd.k;
+  const int ld = static_cast<int>(svd.S.size());  // svd.VT is ld x m, column-major
+  for (int i = 0; i < k; ++i) {
+    w[i] = svd.S[i];
+    for (int j = 0; j < m; ++j) {
+      Q[static_cast<size_t>(i) * static_cast<size_t>(m) + static_cast<size_t>(j)] =
+          svd.VT[static_cast<size_t>(j) * static_cast<size_t>(ld) + static_cast<size_t>(i)];
+    }
+  }
+  if (explained_variance && explained_variance_ratio) {
+    explained_variance_from_total(w, n, k, total_var, explained_variance, explained_variance_ratio);
+  }
+}
+
+// A non-empty view whose leading dimension BLAS can take as an int.
+template <typename T>
+bool dense_view_ok(const DenseViewT<T>& X) {
+  return X.data && X.n > 0 && X.m > 0 && X.ld >= (X.col_major ? X.n : X.m) &&
+         X.ld <= std::numeric_limits<int>::max();
+}
+
+// Result of an adaptive-rank solve, owned by the library until adaptive_result_destroy. The caller
+// learns k from fit_info and allocates the k x m outputs only then.
+struct AdaptiveResultBase {
+  virtual ~AdaptiveResultBase() = default;
+};
+
+template <typename T>
+struct AdaptiveResultT final : AdaptiveResultBase {
+  SVDResultT<T> svd;
+  int n = 0;
+  double total_var = 0.0;
+};
+
+// Caps the chosen rank at p.k, reports it and hands ownership of the result to the caller.
+template <typename T>
+void* adaptive_result(SVDResultT<T>&& svd, int n, double total_var, const params& p) {
+  if (svd.S.empty()) return nullptr;
+  svd.k = std::min(svd.k, std::max(1, p.k));
+  auto* result = new (std::nothrow) AdaptiveResultT<T>();
+  if (!result) return nullptr;
+  result->svd = std::move(svd);
+  result->n = n;
+  result->total_var = total_var;
+  write_fit_info(p, result->svd);
+  return static_cast<AdaptiveResultBase*>(result);
+}
+
+template <typename T>
+void* adaptive_fit_dense(const DenseViewT<T>& X, float target, T* mean, const params& p) {
+  if (!dense_view_ok(X) || !(target > 0.0f && target < 1.0f)) return nullptr;
+  std::vector<double> mean_d, m2;
+  column_moments(X, mean_d, m2);
+  const double total_var = total_variance(m2, X.n);
+  const DenseViewOperator Xop(X);
+  if (mean) {
+    for (int j = 0; j < X.m; ++j) mean[j] = static_cast<T>(mean_d[j]);
+    const double energy = total_var * static_cast<double>(std::max(1, X.n - 1));
+    return adaptive_result(adaptive_qb_svd(CenteredOperator(Xop, static_cast<const T*>(mean)), energy, target,
+                                           p.n_iter, p.random_state),
+                           X.n, total_var, p);
+  }
+  // ||X||_F^2 = sum_j (m2_j + n mean_j^2), from the same pass.
+  double energy = 0.0;
+  for (int j = 0; j < X.m; ++j) energy += m2[j] + static_cast<double>(X.n) * mean_d[j] * mean_d[j];
+  return adaptive_result(adaptive_qb_svd(Xop, energy, target, p.n_iter, p.random_state), X.n, total_var, p);
+}
+
+template <typename T>
+void adaptive_result_copy(const void* handle, T* Q, T* w, T* explained_variance, T* explained_variance_ratio) {
+  if (!handle || !Q || !w) return;
+  const auto* result = static_cast<const AdaptiveResultT<T>*>(static_cast<const AdaptiveResultBase*>(handle));
+  fill_adaptive_outputs(result->svd, result->n, result->total_var, Q, w, explained_variance,
+                        explained_variance_ratio);
+}
+
+// A reusable solver plan for dense fits of one shape: the solver is chosen once, and the
+// Workspace and result buffers persist between executions.
+struct SVDPlan {
+  int n = 0;
+  int m = 0;
+  int k = 0;
+  Solver solver = Solver::Randomized;
+  Workspace ws;
+  SVDResult svd;
+};
+
+// Top-k solve of dense X, centered by `mean` (PCA) when it is non-null. The exact solver works on
+// the column-major (and, for PCA, centered) copy fit_dense leaves in ws.a; the others read X in
+// place.
+template <typename T>
+bool solve_dense(Solver solver, const DenseViewT<T>& X, int k, const T* mean, const params& p, WorkspaceT<T>& ws,
+                 SVDResultT<T>& out) {
+  switch (solver) {
+    case Solver::Gram:
+      return gram_svd_topk_into(X, k, mean, ws, out);
+    case Solver::Exact:
+      out.n_iter = 0;
+      out.n_matvecs = 0;
+      // ws.a is rebuilt from X (and re-centered) only if the partial solve fails.
+      return exact_svd_topk_into(ws.a, X.n, X.m, k, ws, out, [&](T*) {
+        to_col_major(X, ws.a);
+        if (mean) center_in_place(ws.a.data(), DenseViewT<T>{ws.a.data(), X.n, X.m, X.n, true}, ws.mean);
+        return true;
+      });
+    case Solver::Wide:
+      return wide_svd_topk_into(X, k, mean, p.n_iter, p.random_state, ws, out);
+    case Solver::Randomized:
+    case Solver::Lanczos: {
+      const DenseViewOperator Xop(X);
+      const T* init = static_cast<const T*>(p.init);
+      if (solver == Solver::Lanczos) {
+        out = mean ? block_krylov_svd_topk(CenteredOperator(Xop, mean), k, p.n_iter, p.random_state)
+                   : block_krylov_svd_topk(Xop, k, p.n_iter, p.random_state);
+        return !out.S.empty();
+      }
+      if (mean) {
+        return randomized_svd_topk_into(CenteredOperator(Xop, mean), k, p.n_iter, p.random_state, p.tol, ws,
+                                        out, init, p.init_k);
+      }
+      return randomized_svd_topk_into(Xop, k, p.n_iter, p.random_state, p.tol, ws, out, init, p.init_k);
+    }
+  }
+  return false;
+}
+
+// One dense fit with the outputs of truncated_svd_float (or pca_float when `mean` is non-null,
+// which then receives the column means). U and X_transformed may be null. When X_mut (the
+// writable storage behind X) is given, the exact solver centers and factors X in place instead
+// of copying it.
+template <typename T>
+bool fit_dense(Solver solver, const DenseViewT<T>& X, int k, T* Q, T* w, T* U, T* X_transformed,
+               T* explained_variance, T* explained_variance_ratio, T* mean, const params& p,
+               WorkspaceT<T>& ws, SVDResultT<T>& svd, typename NonDeduced<T*>::type X_mut = nullptr) {
+  // One pass over X gives the column means, the total variance and, for the exact solver, the
+  // column-major copy LAPACK factors.
+  const bool want_variance = explained_variance && explained_variance_ratio;
+  const bool in_place = solver == Solver::Exact && X_mut;
+  const bool copy = solver == Solver::Exact && !X_mut;
+  if (mean || want_variance) {
+    if (copy) ws.a.resize(static_cast<size_t>(X.n) * static_cast<size_t>(X.m));
+    column_moments(X, ws.mean, ws.m2, ws.partial, copy ? ws.a.data() : nullptr);
+    if (mean) {
+      for (int j = 0; j < X.m; ++j) mean[j] = static_cast<T>(ws.mean[j]);
+      if (copy) center_in_place(ws.a.data(), DenseViewT<T>{ws.a.data(), X.n, X.m, X.n, true}, ws.mean);
+      if (in_place) center_in_place(X_mut, X, ws.mean);
+    }
+  } else if (copy) {
+    to_col_major(X, ws.a);
+  }
+  if (in_place) {
+    svd.n_iter = 0;
+    svd.n_matvecs = 0;
+    if (!exact_svd_topk_in_place(X_mut, X, k, ws, svd)) return false;
+  } else if (!solve_dense(solver, X, k, mean, p, ws, svd)) {
+    return false;
+  }
+  if (svd.U.empty() || svd.S.empty() || svd.VT.empty()) return false;
+
+  fill_outputs_rowmajor(svd, Q, w, U, X_transformed, mean && p.whiten);
+  if (want_variance) {
+    explained_variance_from_total(w, X.n, svd.k, total_variance(ws.m2, X.n), explained_variance,
+                                  explained_variance_ratio);
+  }
+  return true;
+}
+
+bool execute_plan(SVDPlan& plan, const float* X, float* Q, float* w, float* U, float* X_transformed,
+                  float* explained_variance, float* explained_variance_ratio, float* mean,
+                  const params& p) {
+  return fit_dense(plan.solver, DenseView::row_major(X, plan.n, plan.m), plan.k, Q, w, U, X_transformed,
+                   explained_variance, explained_variance_ratio, mean, p, plan.ws, plan.svd);
+}
+
+// Entry-point body for dense X in any supported layout. X_mut, when given, is X's storage and may
+// be overwritten.
+template <typename T>
+void fit_dense_once(const DenseViewT<T>& X, T* Q, T* w, T* U, T* X_transformed, T* explained_variance,
+                    T* explained_variance_ratio, typename NonDeduced<T*>::type mean, const params& p,
+                    typename NonDeduced<T*>::type X_mut = nullptr) {
+  if (!X.data || !Q || !w) return;
+  // BLAS takes the leading dimension as an int.
+  if (X.n <= 0 || X.m <= 0 || X.ld < (X.col_major ? X.n : X.m) || X.ld > std::numeric_limits<int>::max()) {
+    return;
+  }
+  const int k = std::min(p.k, std::min(X.n, X.m));
+  WorkspaceT<T> ws;
+  SVDResultT<T> svd;
+  if (!fit_dense(choose_solver(p.algorithm, X.n, X.m), X, k, Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, mean, p, ws, svd, X_mut)) {
+    return;
+  }
+  write_fit_info(p, svd);
+}
+
+// Rows handled per block by the scoring kernels; a block of X stays within kTransformBlockElements.
+constexpr int kTransformMaxRows = 256;
+constexpr int64_t kTransformBlockElements = int64_t{1} << 18;
+
+inline int scoring_block_rows(int m) {
+  return static_cast<int>(std::clamp<int64_t>(kTransformBlockElements / std::max(1, m), 1, kTransformMaxRows));
+}
+
+// Copies rows [i0, i0 + nb) of X into `block`, packed in X's own storage order, minus `mean` when
+// it is non-null. Returns the leading dimension of the copy: nb (column-major) or m (row-major).
+template <typename T>
+int pack_rows(const DenseViewT<T>& X, int i0, int nb, const T* mean, T* block) {
+  const int m = X.m;
+  if (X.col_major) {
+    for (int j = 0; j < m; ++j) {
+      const T* src = X.data + static_cast<size_t>(j) * static_cast<size_t>(X.ld) + i0;
+      T* dst = block + static_cast<size_t>(j) * static_cast<size_t>(nb);
+      const T mu = mean ? mean[j] : T(0);
+      for (int i = 0; i < nb; ++i) dst[i] = src[i] - mu;
+    }
+    return nb;
+  }
+  for (int i = 0; i < nb; ++i) {
+    const T* src = X.data + static_cast<size_t>(i0 + i) * static_cast<size_t>(X.ld);
+    T* dst = block + static_cast<size_t>(i) * static_cast<size_t>(m);
+    if (mean) {
+      for (int j = 0; j < m; ++j) dst[j] = src[j] - mean[j];
+    } else {
+      std::copy(src, src + m, dst);
+    }
+  }
+  return m;
+}
+
+// Scores of X against fitted components Q (k x m, row-major): out = (X - 1 mean^T) Q^T diag(scale),
+// row-major n x k; mean and scale may be null. Row blocks are scored in parallel, each by one GEMM
+// followed by the scaling. With a mean, each block is first centered into a cache-sized scratch,
+// so no centered copy of X is formed and large offsets do not cancel inside the product.
+template <typename T>
+void transform_dense(const DenseViewT<T>& X, const T* Q, int k, const T* mean, const T* scale, T* out) {
+  const int n = X.n;
+  const int m = X.m;
+  if (!dense_view_ok(X) || !Q || !out || k <= 0) return;
+  const int rows = scoring_block_rows(m);
+  const int blocks = (n + rows - 1) / rows;
+#ifdef _OPENMP
+#pragma omp parallel if (blocks > 1 && pass_parallel(n, m))
+#endif
+  {
+    std::vector<T> centered(mean ? static_cast<size_t>(rows) * static_cast<size_t>(m) : 0);
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+    for (int b = 0; b < blocks; ++b) {
+      const int i0 = b * rows;
+      const int nb = std::min(rows, n - i0);
+      const T* Xb = X.col_major ? X.data + i0 : X.data + static_cast<size_t>(i0) * static_cast<size_t>(X.ld);
+      int ldb = static_cast<int>(X.ld);
+      if (mean) {
+        ldb = pack_rows(X, i0, nb, mean, centered.data());
+        Xb = centered.data();
+      }
+      // out_b^T (k x nb, column-major) = Q (m x k column-major)^T * X_b^T.
+      T* out_b = out + static_cast<size_t>(i0) * static_cast<size_t>(k);
+      xgemm(CblasColMajor, CblasTrans, X.col_major ? CblasTrans : CblasNoTrans, k, nb, m, T(1), Q, m, Xb, ldb,
+            T(0), out_b, k);
+      if (!scale) continue;
+      for (int i = 0; i < nb; ++i) {
+        T* row = out_b + static_cast<size_t>(i) * static_cast<size_t>(k);
+        for (int c = 0; c < k; ++c) row[c] *= scale[c];
+      }
+    }
+  }
+}
+
+// Per-row squared residuals of X against the span of Q (k x m, row-major) around `mean`:
+// err_i = ||x_i - mean||^2 - ||z_i||^2 with z_i = Q (x_i - mean), the identity for an orthonormal
+// Q. Each row block costs one k-wide GEMM instead of an m-wide reconstruction. When `weights` is
+// given, weighted_i = sum_c w_c z_ic^2 as well (the Mahalanobis part of PCA's log-likelihood).
+template <typename T>
+void reconstruction_error_dense(const DenseViewT<T>& X, const T* Q, int k, const T* mean, const T* weights,
+                                T* err, T* weighted) {
+  const int n = X.n;
+  const int m = X.m;
+  if (!dense_view_ok(X) || !Q || !err || k <= 0 || (weights && !weighted)) return;
+  const int rows = scoring_block_rows(m);
+  const int blocks = (n + rows - 1) / rows;
+#ifdef _OPENMP
+#pragma omp parallel if (blocks > 1 && pass_parallel(n, m))
+#endif
+  {
+    std::vector<T> block(static_cast<size_t>(rows) * static_cast<size_t>(m));
+    std::vector<T> scores(static_cast<size_t>(rows) * static_cast<size_t>(k));
+    std::vector<double> sq(static_cast<size_t>(rows));
+#ifdef _OPENMP
+#pragma omp for schedule(static)
+#endif
+    for (int b = 0; b < blocks; ++b) {
+      const int i0 = b * rows;
+      const int nb = std::min(rows, n - i0);
+      const int ldb = pack_rows(X, i0, nb, mean, block.data());
+      std::fill(sq.begin(), sq.begin() + nb, 0.0);
+      if (X.col_major) {
+        for (int j = 0; j < m; ++j) {
+          const T* col = block.data() + static_cast<size_t>(j) * static_cast<size_t>(ldb);
+          for (int i = 0; i < nb; ++i) sq[i] += static_cast<double>(col[i]) * static_cast<double>(col[i]);
+        }
+      } else {
+        for (int i = 0; i < nb; ++i) {
+          const T* row = block.data() + static_cast<size_t>(i) * static_cast<size_t>(ldb);
+          double acc = 0.0;
+          for (int j = 0; j < m; ++j) acc += static_cast<double>(row[j]) * static_cast<double>(row[j]);
+          sq[i] = acc;
+        }
+      }
+      xgemm(CblasColMajor, CblasTrans, X.col_major ? CblasTrans : CblasNoTrans, k, nb, m, T(1), Q, m,
+            block.data(), ldb, T(0), scores.data(), k);
+      for (int i = 0; i < nb; ++i) {
+        const T* z = scores.data() + static_cast<size_t>(i) * static_cast<size_t>(k);
+        double zz = 0.0;
+        double wz = 0.0;
+        for (int c = 0; c < k; ++c) {
+          const double z2 = static_cast<double>(z[c]) * static_cast<double>(z[c]);
+          zz += z2;
+          if (weights) wz += z2 * static_cast<double>(weights[c]);
+        }
+        err[i0 + i] = static_cast<T>(std::max(0.0, sq[i] - zz));
+        if (weights) weighted[i0 + i] = static_cast<T>(wz);
+      }
+    }
+  }
+}
+
+// X_hat = Z Q + 1 mean^T for scores Z (n x k, row-major) and components Q (k x m, row-major), in
+// parallel row blocks. Each output block is seeded with the mean and finished by one GEMM.
+template <typename T>
+void inverse_transform_dense(const T* Z, int n, int k, const T* Q, int m, const T* mean, T* out) {
+  if (!Z || !Q || !out || n <= 0 || m <= 0 || k <= 0) return;
+  const int rows = scoring_block_rows(m);
+  const int blocks = (n + rows - 1) / rows;
+#ifdef _OPENMP
+#pragma omp parallel for schedule(static) if (blocks > 1 && pass_parallel(n, m))
+#endif
+  for (int b = 0; b < blocks; ++b) {
+    const int i0 = b * rows;
+    const int nb = std::min(rows, n - i0);
+    T* out_b = out + static_cast<size_t>(i0) * static_cast<size_t>(m);
+    for (int i = 0; i < nb; ++i) {
+      T* row = out_b + static_cast<size_t>(i) * static_cast<size_t>(m);
+      if (mean) {
+        std::copy(mean, mean + m, row);
+      } else {
+        std::fill(row, row + m, T(0));
+      }
+    }
+    // out_b^T (m x nb, column-major) += Q^T (m x k) * Z_b^T (k x nb).
+    xgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, m, nb, k, T(1), Q, m,
+          Z + static_cast<size_t>(i0) * static_cast<size_t>(k), k, T(1), out_b, m);
+  }
+}
+
+// Plan for one shape, or false when `algorithm` cannot be planned.
+bool init_plan(SVDPlan& plan, const params& p) {
+  if (p.X_n <= 0 || p.X_m <= 0 || p.k <= 0) return false;
+  plan.solver = choose_solver(p.algorithm, p.X_n, p.X_m);
+  if (plan.solver == Solver::Lanczos) return false;
+  plan.n = p.X_n;
+  plan.m = p.X_m;
+  plan.k = std::min(p.k, std::min(p.X_n, p.X_m));
+  return true;
+}
+
+}  // namespace
+
+extern "C" {
+
+void truncated_svd_float(const float* X, float* Q, float* w, float* U, float* X_transformed,
+                         float* explained_variance, float* explained_variance_ratio, params p) {
+  fit_dense_once(DenseView::row_major(X, p.X_n, p.X_m), Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, nullptr, p);
+}
+
+void truncated_svd_strided_float(const float* X, int32_t col_major, int64_t ld, float* Q, float* w, float* U,
+                                 float* X_transformed, float* explained_variance,
+                                 float* explained_variance_ratio, params p) {
+  fit_dense_once(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, nullptr, p);
+}
+
+void truncated_svd_double(const double* X, double* Q, double* w, double* U, double* X_transformed,
+                          double* explained_variance, double* explained_variance_ratio, params p) {
+  fit_dense_once(DenseViewT<double>::row_major(X, p.X_n, p.X_m), Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, nullptr, p);
+}
+
+void truncated_svd_strided_double(const double* X, int32_t col_major, int64_t ld, double* Q, double* w,
+                                  double* U, double* X_transformed, double* explained_variance,
+                                  double* explained_variance_ratio, params p) {
+  fit_dense_once(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed,
+                 explained_variance, explained_variance_ratio, nullptr, p);
+}
+
+void truncated_svd_inplace_float(float* X, int32_t col_major, int64_t ld, float* Q, float* w, float* U,
+                                 float* X_transformed, float* explained_variance,
+                                 float* explained_variance_ratio, params p) {
+  fit_dense_once(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, nullptr, p, X);
+}
+
+void truncated_svd_inplace_double(double* X, int32_t col_major, int64_t ld, double* Q, double* w, double* U,
+                                  double* X_transformed, double* explained_variance,
+                                  double* explained_variance_ratio, params p) {
+  fit_dense_once(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed,
+                 explained_variance, explained_variance_ratio, nullptr, p, X);
+}
+
+void truncated_svd_sparse_float(const int64_t* indptr, const int32_t* indices, const float* data,
+                                int32_t csc, float* Q, float* w, float* U, float* X_transformed,
+                                float* explained_variance, float* explained_variance_ratio,
+                                params p) {
+  const int n = p.X_n;
+  const int m = p.X_m;
+  const int k = std::min(p.k, std::min(n, m));
+  if (!indptr || !indices || !data || !Q || !w) return;
+
+  // Sparse input always goes through an operator-based solver (randomized or block Krylov): an
+  // exact LAPACK SVD would require densifying X.
+  const SparseCompressedOperator A(indptr, indices, data, n, m, csc != 0);
+  SVDResult svd = iterative_svd_topk(A, k, p);
+  if (svd.U.empty() || svd.S.empty() || svd.VT.empty()) return;
+
+  fill_outputs_rowmajor(svd, Q, w, U, X_transformed);
+  write_fit_info(p, svd);
+
+  if (explained_variance && explained_variance_ratio) {
+    const double total_var = sparse_total_variance(indptr, indices, data, n, m, csc != 0);
+    explained_variance_from_total(w, n, k, total_var, explained_variance, explained_variance_ratio);
+  }
+}
+
+void pca_float(const float* X, float* Q, float* w, float* U, float* X_transformed,
+               float* explained_variance, float* explained_variance_ratio, float* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseView::row_major(X, p.X_n, p.X_m), Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, mean, p);
+}
+
+void pca_strided_float(const float* X, int32_t col_major, int64_t ld, float* Q, float* w, float* U,
+                       float* X_transformed, float* explained_variance, float* explained_variance_ratio,
+                       float* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, mean, p);
+}
+
+void pca_double(const double* X, double* Q, double* w, double* U, double* X_transformed,
+                double* explained_variance, double* explained_variance_ratio, double* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseViewT<double>::row_major(X, p.X_n, p.X_m), Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, mean, p);
+}
+
+void pca_strided_double(const double* X, int32_t col_major, int64_t ld, double* Q, double* w, double* U,
+                        double* X_transformed, double* explained_variance, double* explained_variance_ratio,
+                        double* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed,
+                 explained_variance, explained_variance_ratio, mean, p);
+}
+
+void pca_inplace_float(float* X, int32_t col_major, int64_t ld, float* Q, float* w, float* U,
+                       float* X_transformed, float* explained_variance, float* explained_variance_ratio,
+                       float* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed, explained_variance,
+                 explained_variance_ratio, mean, p, X);
+}
+
+void pca_inplace_double(double* X, int32_t col_major, int64_t ld, double* Q, double* w, double* U,
+                        double* X_transformed, double* explained_variance, double* explained_variance_ratio,
+                        double* mean, params p) {
+  if (!mean) return;
+  fit_dense_once(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, w, U, X_transformed,
+                 explained_variance, explained_variance_ratio, mean, p, X);
+}
+
+void transform_strided_float(const float* X, int32_t col_major, int64_t ld, const float* Q, const float* mean,
+                             const float* scale, float* out, params p) {
+  transform_dense(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, p.k, mean, scale, out);
+}
+
+void transform_strided_double(const double* X, int32_t col_major, int64_t ld, const double* Q,
+                              const double* mean, const double* scale, double* out, params p) {
+  transform_dense(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, p.k, mean, scale, out);
+}
+
+void reconstruction_error_strided_float(const float* X, int32_t col_major, int64_t ld, const float* Q,
+                                        const float* mean, const float* weights, float* err, float* weighted,
+                                        params p) {
+  reconstruction_error_dense(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, Q, p.k, mean, weights, err,
+                             weighted);
+}
+
+void reconstruction_error_strided_double(const double* X, int32_t col_major, int64_t ld, const double* Q,
+                                         const double* mean, const double* weights, double* err,
+                                         double* weighted, params p) {
+  reconstruction_error_dense(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, Q, p.k, mean, weights,
+                             err, weighted);
+}
+
+void inverse_transform_float(const float* Z, const float* Q, const float* mean, float* out, params p) {
+  inverse_transform_dense(Z, p.X_n, p.k, Q, p.X_m, mean, out);
+}
+
+void inverse_transform_double(const double* Z, const double* Q, const double* mean, double* out, params p) {
+  inverse_transform_dense(Z, p.X_n, p.k, Q, p.X_m, mean, out);
+}
+
+void pca_sparse_float(const int64_t* indptr, const int32_t* indices, const float* data,
+                      int32_t csc, float* Q, float* w, float* U, float* X_transformed,
+                      float* explained_variance, float* explained_variance_ratio, float* mean,
+                      params p) {
+  const int n = p.X_n;
+  const int m = p.X_m;
+  const int k = std::min(p.k, std::min(n, m));
+  if (!indptr || !indices || !data || !Q || !w || !mean) return;
+
+  const std::vector<double> mean_d = sparse_column_mean(indptr, indices, data, n, m, csc != 0);
+  for (int j = 0; j < m; ++j) mean[j] = static_cast<float>(mean_d[j]);
+
+  const SparseCompressedOperator Xop(indptr, indices, data, n, m, csc != 0);
+  SVDResult svd = iterative_svd_topk(CenteredOperator(Xop, mean), k, p);
+  if (svd.U.empty() || svd.S.empty() || svd.VT.empty()) return;
+
+  fill_outputs_rowmajor(svd, Q, w, U, X_transformed, p.whiten);
+  write_fit_info(p, svd);
+
+  if (explained_variance && explained_variance_ratio) {
+    const double total_var = sparse_total_variance(indptr, indices, data, n, m, csc != 0);
+    explained_variance_from_total(w, n, k, total_var, explained_variance, explained_variance_ratio);
+  }
+}
+
+void* adaptive_svd_strided_float(const float* X, int32_t col_major, int64_t ld, float target, float* mean,
+                                 params p) {
+  return adaptive_fit_dense(DenseView{X, p.X_n, p.X_m, ld, col_major != 0}, target, mean, p);
+}
+
+void* adaptive_svd_strided_double(const double* X, int32_t col_major, int64_t ld, float target, double* mean,
+                                  params p) {
+  return adaptive_fit_dense(DenseViewT<double>{X, p.X_n, p.X_m, ld, col_major != 0}, target, mean, p);
+}
+
+void* adaptive_svd_sparse_float(const int64_t* indptr, const int32_t* indices, const float* data, int32_t csc,
+                                float target, float* mean, params p) {
+  const int n = p.X_n;
+  const int m = p.X_m;
+  if (!indptr || !indices || !data || n <= 0 || m <= 0 || !(target > 0.0f && target < 1.0f)) return nullptr;
+
+  const double total_var = sparse_total_variance(indptr, indices, data, n, m, csc != 0);
+  const SparseCompressedOperator Xop(indptr, indices, data, n, m, csc != 0);
+  if (mean) {
+    const std::vector<double> mean_d = sparse_column_mean(indptr, indices, data, n, m, csc != 0);
+    for (int j = 0; j < m; ++j) mean[j] = static_cast<float>(mean_d[j]);
+    const double energy = total_var * static_cast<double>(std::max(1, n - 1));
+    return adaptive_result(
+        adaptive_qb_svd(CenteredOperator(Xop, static_cast<const float*>(mean)), energy, target, p.n_iter,
+                        p.random_state),
+        n, total_var, p);
+  }
+  const double energy = sparse_frobenius_sq(indptr, data, csc != 0 ? m : n);
+  return adaptive_result(adaptive_qb_svd(Xop, energy, target, p.n_iter, p.random_state), n, total_var, p);
+}
+
+void adaptive_result_copy_float(const void* result, float* Q, float* w, float* explained_variance,
+                                float* explained_variance_ratio) {
+  adaptive_result_copy(result, Q, w, explained_variance, explained_variance_ratio);
+}
+
+void adaptive_result_copy_double(const void* result, double* Q, double* w, double* explained_variance,
+                                 double* explained_variance_ratio) {
+  adaptive_result_copy(result, Q, w, explained_variance, explained_variance_ratio);
+}
+
+void adaptive_result_destroy(void* result) { delete static_cast<AdaptiveResultBase*>(result); }
+
+void incremental_svd_update_float(const float* X_batch, float* Q, float* w, int32_t k_prev,
+                                  float* mean, double* total_sq, int64_t n_seen, int32_t center,
+                                  float* explained_variance, float* explained_variance_ratio,
+                                  params p) {
+  const int n_b = p.X_n;
+  const int m = p.X_m;
+  if (!X_batch || !Q || !w || !mean || !total_sq || n_b <= 0) return;
+
+  SVDResult svd = incremental_svd_merge(X_batch, n_b, m, p.k, Q, w, k_prev, mean, total_sq, n_seen,
+                                        center != 0);
+  if (svd.S.empty()) return;
+
+  const int64_t n_total = n_seen + n_b;
+  const double total_var = *total_sq / static_cast<double>(std::max<int64_t>(1, n_total - 1));
+  fill_adaptive_outputs(svd, svd.n, total_var, Q, w, explained_variance, explained_variance_ratio);
+  write_fit_info(p, svd);
+}
+
+void streamed_gram_accumulate_float(const float* X_chunk, const float* shift, const float* V,
+                                    double* Z, double* G, double* col_stats, params p) {
+  const int rows = p.X_n;
+  const int m = p.X_m;
+  const int l = p.k;
+  if (!X_chunk || !V || !Z || !G || rows <= 0) return;
+
+  const float* Xc = X_chunk;
+  std::vector<float> Xs;
+  if (shift) {
+    Xs.assign(X_chunk, X_chunk + static_cast<size_t>(rows) * static_cast<size_t>(m));
+    for (int i = 0; i < rows; ++i) {
+      float* row = Xs.data() + static_cast<size_t>(i) * static_cast<size_t>(m);
+      for (int j = 0; j < m; ++j) row[j] -= shift[j];
+    }
+    Xc = Xs.data();
+  }
+  // Y = X_c V (rows x l); X_c is row-major, i.e. X_c^T column-major with ld = m.
+  std::vector<float> Y(static_cast<size_t>(rows) * static_cast<size_t>(l));
+  cblas_sgemm(CblasColMajor, CblasTrans, CblasNoTrans, rows, l, m, 1.0f, Xc, m, V, m, 0.0f, Y.data(), rows);
+  std::vector<float> Zc(static_cast<size_t>(m) * static_cast<size_t>(l));
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, m, l, rows, 1.0f, Xc, m, Y.data(), rows, 0.0f, Zc.data(), m);
+  std::vector<float> Gc(static_cast<size_t>(l) * static_cast<size_t>(l), 0.0f);
+  cblas_ssyrk(CblasColMajor, CblasUpper, CblasTrans, l, rows, 1.0f, Y.data(), rows, 0.0f, Gc.data(), l);
+
+  for (size_t i = 0; i < Zc.size(); ++i) Z[i] += static_cast<double>(Zc[i]);
+  for (int c = 0; c < l; ++c) {
+    for (int r = 0; r <= c; ++r) G[static_cast<size_t>(c) * static_cast<size_t>(l) + r] += static_cast<double>(Gc[static_cast<size_t>(c) * static_cast<size_t>(l) + r]);
+  }
+  if (col_stats) merge_column_stats(X_chunk, rows, m, col_stats);
+}
+
+void streamed_range_update_float(const double* Z, const float* V, const double* col_stats,
+                                 const float* shift, int32_t center, float* V_out, params p) {
+  const int m = p.X_m;
+  const int l = p.k;
+  if (!Z || !V || !col_stats || !V_out) return;
+  const double n = col_stats[0];
+
+  const StreamedCorrection corr = streamed_correction(V, m, l, col_stats, shift, center != 0);
+  for (int c = 0; c < l; ++c) {
+    for (int j = 0; j < m; ++j) {
+      const size_t idx = static_cast<size_t>(c) * static_cast<size_t>(m) + j;
+      const double v = Z[idx] + n * (corr.a[j] * corr.aV[c] - corr.d[j] * corr.dV[c]);
+      V_out[idx] = static_cast<float>(v);
+    }
+  }
+  const bool ok = ortho_qr_inplace(V_out, m, l);
+  if (p.info) {
+    p.info->n_matvecs += 2 * static_cast<int64_t>(l);  // the pass that produced Z
+    p.info->k = ok ? l : 0;
+  }
+}
+
+void streamed_svd_finalize_float(const double* G, const float* V, const double* col_stats,
+                                 const float* shift, int32_t center, float* Q, float* w, float* explained_variance,
+                                 float* explained_variance_ratio, float* mean, params p) {
+  const int m = p.X_m;
+  const int l = p.X_n;
+  const int k = std::min(p.k, l);
+  if (!G || !V || !col_stats || !Q || !w) return;
+  const double n = col_stats[0];
+
+  std::vector<double> Gd(G, G + static_cast<size_t>(l) * static_cast<size_t>(l));
+  const StreamedCorrection corr = streamed_correction(V, m, l, col_stats, shift, center != 0);
+  for (int c = 0; c < l; ++c) {
+    for (int r = 0; r <= c; ++r) {
+      Gd[static_cast<size_t>(c) * static_cast<size_t>(l) + r] += n * (corr.aV[r] * corr.aV[c] - corr.dV[r] * corr.dV[c]);
+    }
+  }
+  std::vector<double> evals;
+  std::vector<double> evecs;
+  if (!top_eigenpairs(Gd, l, k, evals, evecs)) return;
+
+  // Components (k x m, row-major) are the rows of (V W)^T.
+  for (int i = 0; i < k; ++i) {
+    w[i] = static_cast<float>(std::sqrt(std::max(0.0, evals[i])));
+    for (int j = 0; j < m; ++j) {
+      double acc = 0.0;
+      for (int c = 0; c < l; ++c) {
+        acc += static_cast<double>(V[static_cast<size_t>(c) * static_cast<size_t>(m) + j]) * evecs[static_cast<size_t>(i) * static_cast<size_t>(l) + c];
+      }
+      Q[static_cast<size_t>(i) * static_cast<size_t>(m) + j] = static_cast<float>(acc);
+    }
+  }
+
+  double total_m2 = 0.0;
+  for (int j = 0; j < m; ++j) total_m2 += col_stats[1 + m + j];
+  const int n_int = static_cast<int>(std::min<double>(n, std::numeric_limits<int>::max()));
+  if (explained_variance && explained_variance_ratio) {
+    explained_variance_from_total(w, n_int, k, total_m2 / std::max(1.0, n - 1.0), explained_variance,
+                                  explained_variance_ratio);
+  }
+  if (mean) {
+    for (int j = 0; j < m; ++j) mean[j] = static_cast<float>(col_stats[1 + j]);
+  }
+  if (p.info) {
+    p.info->n_matvecs += 2 * static_cast<int64_t>(l);
+    p.info->k = k;
+  }
+}
+
+void sketch_update_float(const float* X_batch, const float* shift, const float* Omega,
+                         const float* Psi_batch, int32_t t, float* Y_batch, double* W,
+                         double* col_stats, params p) {
+  const int rows = p.X_n;
+  const int m = p.X_m;
+  const int s = p.k;
+  if (!X_batch || !shift || !Omega || !Psi_batch || !Y_batch || !W || !col_stats || rows <= 0) return;
+
+  std::vector<float> Xs(X_batch, X_batch + static_cast<size_t>(rows) * static_cast<size_t>(m));
+  for (int i = 0; i < rows; ++i) {
+    float* row = Xs.data() + static_cast<size_t>(i) * static_cast<size_t>(m);
+    for (int j = 0; j < m; ++j) row[j] -= shift[j];
+  }
+  // Y_b^T = Omega^T X_b^T (s x rows, column-major), i.e. Y_b row-major.
+  cblas_sgemm(CblasColMajor, CblasTrans, CblasNoTrans, s, rows, m, 1.0f, Omega, m, Xs.data(), m, 0.0f, Y_batch, s);
+  // W += Psi_b X_b (t x m).
+  std::vector<float> Wb(static_cast<size_t>(t) * static_cast<size_t>(m));
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasTrans, t, m, rows, 1.0f, Psi_batch, t, Xs.data(), m, 0.0f, Wb.data(), t);
+  for (size_t i = 0; i < Wb.size(); ++i) W[i] += static_cast<double>(Wb[i]);
+  merge_column_stats(X_batch, rows, m, col_stats);
+}
+
+void sketch_finalize_float(const float* Y, const float* Psi, const double* W, const float* Omega,
+                           const float* shift, const double* col_stats, int32_t t, int32_t s,
+                           int32_t center,
+                           float* Q, float* w, float* U, float* explained_variance,
+                           float* explained_variance_ratio, float* mean, params p) {
+  const int n = p.X_n;
+  const int m = p.X_m;
+  if (!Y || !Psi || !W || !Omega || !shift || !col_stats || !Q || !w) return;
+
+  std::vector<double> delta(static_cast<size_t>(m));
+  for (int j = 0; j < m; ++j) delta[j] = (center ? col_stats[1 + j] : 0.0) - static_cast<double>(shift[j]);
+  SVDResult svd = sketch_reconstruct(Y, Psi, W, Omega, delta, n, m, s, t, p.k);
+  if (svd.S.empty()) return;
+
+  double total_m2 = 0.0;
+  for (int j = 0; j < m; ++j) total_m2 += col_stats[1 + m + j];
+  fill_adaptive_outputs(svd, n, total_m2 / std::max(1.0, col_stats[0] - 1.0), Q, w, explained_variance,
+                        explained_variance_ratio);
+  if (U) {
+    for (int i = 0; i < n; ++i) {
+      for (int j = 0; j < svd.k; ++j) {
+        U[static_cast<size_t>(i) * static_cast<size_t>(svd.k) + j] = svd.U[static_cast<size_t>(j) * static_cast<size_t>(n) + i];
+      }
+    }
+  }
+  if (mean) {
+    for (int j = 0; j < m; ++j) mean[j] = static_cast<float>(col_stats[1 + j]);
+  }
+  if (p.info) {
+    p.info->n_iter = 0;
+    p.info->n_matvecs = static_cast<int64_t>(s) + t;  // one pass: X Omega and Psi X
+    p.info->k = svd.k;
+  }
+}
+
+void frequent_directions_update_float(const float* X, float* B, int32_t* n_filled, double* shrunk,
+                                      double* col_stats, params p) {
+  const int rows = p.X_n;
+  const int m = p.X_m;
+  const int ell = p.k;
+  if (!X || !B || !n_filled || !shrunk || rows <= 0 || ell <= 0) return;
+  const int capacity = 2 * ell;
+
+  int filled = *n_filled;
+  for (int i = 0; i < rows; ++i) {
+    if (filled == capacity) {
+      filled = frequent_directions_shrink(B, capacity, m, ell, shrunk);
+      if (filled < 0) {
+        if (p.info) p.info->k = 0;
+        return;
+      }
+    }
+    std::copy(X + static_cast<size_t>(i) * static_cast<size_t>(m), X + static_cast<size_t>(i + 1) * static_cast<size_t>(m),
+              B + static_cast<size_t>(filled) * static_cast<size_t>(m));
+    ++filled;
+  }
+  *n_filled = filled;
+  if (col_stats) merge_column_stats(X, rows, m, col_stats);
+  if (p.info) p.info->k = filled;
+}
+
+void frequent_directions_finalize_float(const float* B, int32_t n_filled, const double* col_stats,
+                                        float* Q, float* w, float* explained_variance,
+                                        float* explained_variance_ratio, params p) {
+  const int m = p.X_m;
+  if (!B || !col_stats || !Q || !w || n_filled <= 0) return;
+
+  SVDResult svd = exact_svd_topk_colmajor(to_col_major(B, n_filled, m), n_filled, m, p.k);
+  if (svd.S.empty()) return;
+
+  const double n = col_stats[0];
+  double total_m2 = 0.0;
+  for (int j = 0; j < m; ++j) total_m2 += col_stats[1 + m + j];
+  const int n_int = static_cast<int>(std::min<double>(n, std::numeric_limits<int>::max()));
+  fill_adaptive_outputs(svd, n_int, total_m2 / std::max(1.0, n - 1.0), Q, w, explained_variance,
+                        explained_variance_ratio);
+  if (p.info) p.info->k = svd.k;
+}
+
+void column_stats_float(const float* X, double* col_stats, params p) {
+  if (!X || !col_stats || p.X_n <= 0) return;
+  merge_column_stats(X, p.X_n, p.X_m, col_stats);
+}
+
+void tsqr_local_float(const float* X, const float* Z, const float* mean, float* Q, float* R,
+                      params p) {
+  const int rows = p.X_n;
+  const int m = p.X_m;
+  const int l = p.k;
+  if (!X || !Z || !Q || !R || rows < l) return;
+
+  // Q = X_i Z - 1 (mean^T Z), then Q R = QR(Q).
+  cblas_sgemm(CblasColMajor, CblasTrans, CblasNoTrans, rows, l, m, 1.0f, X, m, Z, m, 0.0f, Q, rows);
+  if (mean) {
+    for (int c = 0; c < l; ++c) {
+      const float shift = cblas_sdot(m, mean, 1, Z + static_cast<size_t>(c) * static_cast<size_t>(m), 1);
+      float* col = Q + static_cast<size_t>(c) * static_cast<size_t>(rows);
+      for (int i = 0; i < rows; ++i) col[i] -= shift;
+    }
+  }
+  const bool ok = ortho_qr_inplace(Q, rows, l, R);
+  if (p.info) p.info->k = ok ? l : 0;
+}
+
+void tsqr_combine_float(float* R_stack, float* R, params p) {
+  const int rows = p.X_n;
+  const int l = p.k;
+  if (!R_stack || !R || rows < l) return;
+  const bool ok = ortho_qr_inplace(R_stack, rows, l, R);
+  if (p.info) p.info->k = ok ? l : 0;
+}
+
+void tsqr_apply_float(const float* X, float* Q, const float* Q_block, const float* mean, float* Z,
+                      params p) {
+  const int rows = p.X_n;
+  const int m = p.X_m;
+  const int l = p.k;
+  if (!X || !Q || !Q_block || !Z || rows <= 0) return;
+
+  // Q_i <- Q_i Q_block, the rows of the global orthonormal factor owned by this partition.
+  std::vector<float> Qi(static_cast<size_t>(rows) * static_cast<size_t>(l));
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, rows, l, l, 1.0f, Q, rows, Q_block, l, 0.0f, Qi.data(), rows);
+  std::copy(Qi.begin(), Qi.end(), Q);
+  // Z = X_i^T Q_i - mean (1^T Q_i), this partition's share of (X - 1 mean^T)^T Q.
+  cblas_sgemm(CblasColMajor, CblasNoTrans, CblasNoTrans, m, l, rows, 1.0f, X, m, Q, rows, 0.0f, Z, m);
+  if (mean) {
+    for (int c = 0; c < l; ++c) {
+      const float* col = Q + static_cast<size_t>(c) * static_cast<size_t>(rows);
+      double colsum = 0.0;
+      for (int i = 0; i < rows; ++i) colsum += static_cast<double>(col[i]);
+      cblas_saxpy(m, static_cast<float>(-colsum), mean, 1, Z + static_cast<size_t>(c) * static_cast<size_t>(m), 1);
+    }
+  }
+}
+
+void tsqr_finalize_float(const float* Z, const double* col_stats, float* Q, float* w, float* U_small,
+                         float* explained_variance, float* explained_variance_ratio, params p) {
+  const int m = p.X_m;
+  const int l = p.X_n;
+  if (!Z || !col_stats || !Q || !w || !U_small) return;
+
+  // B = Q^T X (l x m) is Z^T, i.e. Z read as a row-major l x m matrix.
+  SVDResult svd = exact_svd_topk_colmajor(to_col_major(Z, l, m), l, m, p.k);
+  if (svd.S.empty()) return;
+
+  const double n = col_stats[0];
+  double total_m2 = 0.0;
+  for (int j = 0; j < m; ++j) total_m2 += col_stats[1 + m + j];
+  const int n_int = static_cast<int>(std::min<double>(n, std::numeric_limits<int>::max()));
+  fill_adaptive_outputs(svd, n_int, total_m2 / std::max(1.0, n - 1.0), Q, w, explained_variance,
+                        explained_variance_ratio);
+  for (int i = 0; i < l; ++i) {
+    for (int j = 0; j < svd.k; ++j) {
+      U_small[static_cast<size_t>(i) * static_cast<size_t>(svd.k) + j] = svd.U[static_cast<size_t>(j) * static_cast<size_t>(l) + i];
+    }
+  }
+  if (p.info) p.info->k = svd.k;
+}
+
+void wide_sketch_block_float(const float* X, const float* mean, const float* Q, int64_t col_lo,
+                             int64_t col_hi, float* Y, double* G, params p) {
+  const int n = p.X_n;
+  const int64_t m = p.X_m;
+  const int l = p.k;
+  if (!X || col_lo < 0 || col_hi > m || col_lo >= col_hi || l <= 0) return;
+  if (!Q && !Y) return;
+  const uint64_t seed = static_cast<uint64_t>(p.random_state <= 0 ? 12345 : p.random_state);
+  const DenseView Xv = DenseView::row_major(X, n, static_cast<int>(m));
+  Workspace ws;
+  for (int64_t lo = col_lo; lo < col_hi; lo += kWideBlock) {
+    const int64_t hi = std::min<int64_t>(col_hi, lo + kWideBlock);
+    wide_accumulate(Xv, mean ? mean + (lo - col_lo) : nullptr, Q, lo, hi, l, seed, Y, Q ? G : nullptr, ws);
+  }
+}
+
+void wide_finalize_float(const float* Q, const double* G, double total_var, float* w, float* U,
+                         float* W_scaled, float* explained_variance,
+                         float* explained_variance_ratio, params p) {
+  const int n = p.X_n;
+  const int l = p.X_m;
+  const int kk = std::min(p.k, l);
+  if (!Q || !G || !w || !U || !W_scaled) return;
+  std::vector<double> G_vec(G, G + static_cast<size_t>(l) * static_cast<size_t>(l));
+  std::vector<float> S;
+  std::vector<float> U_col;
+  std::vector<float> Wsc;
+  Workspace ws;
+  if (!wide_ritz(Q, G_vec, n, l, kk, S, U_col, Wsc, ws)) return;
+  std::copy(S.begin(), S.end(), w);
+  std::copy(Wsc.begin(), Wsc.end(), W_scaled);
+  for (int i = 0; i < n; ++i) {
+    for (int c = 0; c < kk; ++c) {
+      U[static_cast<size_t>(i) * static_cast<size_t>(kk) + c] = U_col[static_cast<size_t>(c) * static_cast<size_t>(n) + i];
+    }
+  }
+  if (explained_variance && explained_variance_ratio) {
+    explained_variance_from_total(w, n, kk, total_var, explained_variance, explained_variance_ratio);
+  }
+  if (p.info) p.info->k = kk;
+}
+
+void wide_components_block_float(const float* X, const float* mean, const float* Q,
+                                 const float* W_scaled, int32_t l, int64_t col_lo, int64_t col_hi,
+                                 float* C, params p) {
+  const int n = p.X_n;
+  const int64_t m = p.X_m;
+  const int kk = p.k;
+  if (!X || !Q || !W_scaled || !C || col_lo < 0 || col_hi > m || col_lo >= col_hi || kk > l) return;
+  const int64_t width = col_hi - col_lo;
+  const DenseView Xv = DenseView::row_major(X, n, static_cast<int>(m));
+  Workspace ws;
+  for (int64_t lo = col_lo; lo < col_hi; lo += kWideBlock) {
+    const int64_t hi = std::min<int64_t>(col_hi, lo + kWideBlock);
+    const int b = static_cast<int>(hi - lo);
+    wide_accumulate(Xv, mean ? mean + (lo - col_lo) : nullptr, Q, lo, hi, l, 0, nullptr, nullptr, ws);
+    cblas_sgemm(CblasRowMajor, CblasNoTrans, CblasNoTrans, kk, b, l, 1.0f, W_scaled, l, ws.b.data(), b, 0.0f,
+                C + (lo - col_lo), static_cast<int>(width));
+  }
+}
+
+void* svd_plan_create(params p) {
+  SVDPlan* plan = new (std::nothrow) SVDPlan();
+  if (plan && !init_plan(*plan, p)) {
+    delete plan;
+    return nullptr;
+  }
+  return plan;
+}
+
+void svd_plan_destroy(void* plan) { delete static_cast<SVDPlan*>(plan); }
+
+void svd_plan_execute_float(void* handle, const float* X, float* Q, float* w, float* U,
+                            float* X_transformed, float* explained_variance,
+                            float* explained_variance_ratio, float* mean, params p) {
+  SVDPlan* plan = static_cast<SVDPlan*>(handle);
+  if (p.info) p.info->k = 0;
+  if (!plan || !X || !Q || !w) return;
+  if (p.X_n != plan->n || p.X_m != plan->m) return;
+  if (!execute_plan(*plan, X, Q, w, U, X_transformed, explained_variance, explained_variance_ratio,
+                    mean, p)) {
+    return;
+  }
+  write_fit_info(p, plan->svd);
+}
+
+void fit_many_float(const float* X, int32_t batch, float* Q, float* w, float* U,
+                    float* X_transformed, float* explained_variance,
+                    float* explained_variance_ratio, float* mean, int32_t* status, params p) {
+  if (p.info) p.info->k = 0;
+  SVDPlan probe;
+  if (!X || !Q || !w || batch < 0 || !init_plan(probe, p)) return;
+  const int n = probe.n;
+  const int m = probe.m;
+  const int k = probe.k;
+  const size_t x_stride = static_cast<size_t>(n) * static_cast<size_t>(m);
+  const size_t q_stride = static_cast<size_t>(k) * static_cast<size_t>(m);
+  const size_t u_stride = static_cast<size_t>(n) * static_cast<size_t>(k);
+
+#ifdef _OPENMP
+  const int n_threads = std::max(1, std::min<int>(omp_get_max_threads(), batch));
+#else
+  const int n_threads = 1;
+#endif
+  // One plan per thread, reused across that thread's problems.
+  std::vector<SVDPlan> plans(static_cast<size_t>(n_threads), probe);
+  int32_t failed = 0;
+  int32_t max_iter = 0;
+  int64_t matvecs = 0;
+
+#ifdef _OPENMP
+#pragma omp parallel for num_threads(n_threads) schedule(dynamic) reduction(+ : failed, matvecs) reduction(max : max_iter)
+#endif
+  for (int32_t b = 0; b < batch; ++b) {
+#ifdef _OPENMP
+    const int t = omp_get_thread_num();
+#else
+    const int t = 0;
+#endif
+    SVDPlan& plan = plans[static_cast<size_t>(t)];
+    const bool ok = execute_plan(
+        plan, X + static_cast<size_t>(b) * x_stride, Q + static_cast<size_t>(b) * q_stride,
+        w + static_cast<size_t>(b) * static_cast<size_t>(k), U ? U + static_cast<size_t>(b) * u_stride : nullptr,
+        X_transformed ? X_transformed + static_cast<size_t>(b) * u_stride : nullptr,
+        explained_variance ? explained_variance + static_cast<size_t>(b) * static_cast<size_t>(k) : nullptr,
+        explained_variance_ratio ? explained_variance_ratio + static_cast<size_t>(b) * static_cast<size_t>(k) : nullptr,
+        mean ? mean + static_cast<size_t>(b) * static_cast<size_t>(m) : nullptr, p);
+    if (status) status[b] = ok ? 1 : 0;
+    if (ok) {
+      matvecs += plan.svd.n_matvecs;
+      max_iter = std::max(max_iter, static_cast<int32_t>(plan.svd.n_iter));
+    } else {
+      failed += 1;
+    }
+  }
+
+  if (p.info) {
+    p.info->n_iter = max_iter;
+    p.info->n_matvecs = matvecs;
+    p.info->k = failed == 0 ? k : 0;
   }
 }
 
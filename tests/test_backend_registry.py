@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import dimreduce4gpu
+from dimreduce4gpu import _backend
+from dimreduce4gpu.lib_dimreduce4cpu import _load_pca_cpu_lib, cpu_built
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    yield
+    # Tests below stub the probes; do not leak their answers into other tests.
+    dimreduce4gpu.refresh_backends()
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, dimreduce4gpu\n"
+        "loaded = [m for m in sys.modules if m.split('.')[0] in ('numpy', 'scipy', 'ctypes')]\n"
+        "loaded += [m for m in sys.modules if m.startswith('dimreduce4gpu.')]\n"
+        "assert not loaded, loaded\n"
+        "assert 'PCA' in dir(dimreduce4gpu)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(dimreduce4gpu.__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+
+
+def test_backend_probe_is_cached_until_refresh(monkeypatch):
+    calls = []
+    monkeypatch.setattr(_backend, "_probe_gpu", lambda: calls.append(1) or False)
+    dimreduce4gpu.refresh_backends()
+    for _ in range(3):
+        assert dimreduce4gpu.gpu_runnable() is False
+        dimreduce4gpu.select_backend("auto")
+    assert len(calls) == 1
+
+    dimreduce4gpu.refresh_backends()
+    dimreduce4gpu.gpu_runnable()
+    assert len(calls) == 2
+
+
+def test_cpu_entry_points_are_resolved_once(monkeypatch, tmp_path):
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+    assert _load_pca_cpu_lib() is _load_pca_cpu_lib()
+
+    monkeypatch.setenv("DIMREDUCE4GPU_CPU_LIB_PATH", str(tmp_path / "libbroken.so"))
+    (tmp_path / "libbroken.so").write_bytes(b"not a shared object")
+    # The cached probe ignores the new path until an explicit refresh.
+    assert cpu_built()
+    dimreduce4gpu.refresh_backends()
+    assert not cpu_built()
+    with pytest.raises(RuntimeError, match="could not be loaded"):
+        _load_pca_cpu_lib()
+
+    monkeypatch.delenv("DIMREDUCE4GPU_CPU_LIB_PATH")
+    dimreduce4gpu.refresh_backends()
+    assert cpu_built()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_forked_child_reprobes_gpu(monkeypatch):
+    monkeypatch.setattr(_backend, "_probe_gpu", lambda: False)
+    dimreduce4gpu.refresh_backends()
+    dimreduce4gpu.gpu_runnable()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        os._exit(0 if _backend._registry._gpu is None else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert _backend._registry._gpu is False
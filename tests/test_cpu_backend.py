@@ -57,3 +57,180 @@ def test_tsvd_cpu_reconstruction_matches_reference():
     X_ref = _svd_trunc_reconstruct(X.astype(np.float64), 2, center=False)
     err = np.linalg.norm(X_hat - X_ref) / max(1e-12, np.linalg.norm(X_ref))
     assert err < 1e-4
+
+
+def test_pca_cpu_randomized_centers_implicitly():
+    _require_cpu_built()
+    rng = np.random.default_rng(4)
+    n, m, k = 600, 300, 5
+    basis = rng.normal(size=(k, m)).astype(np.float32)
+    scores = rng.normal(size=(n, k)).astype(np.float32) * np.array([20, 15, 10, 8, 6], np.float32)
+    X = scores @ basis + 0.1 * rng.normal(size=(n, m)).astype(np.float32) + 5.0
+    pca = PCA(n_components=k, backend="cpu", algorithm="power", n_iter=4, random_state=0)
+    Z = pca.fit_transform(X)
+    np.testing.assert_allclose(pca.mean_, X.mean(axis=0), rtol=1e-4, atol=1e-4)
+    X_hat = Z @ pca.components_
+    Xc_ref = _svd_trunc_reconstruct(X.astype(np.float64), k, center=True)
+    err = np.linalg.norm(X_hat - Xc_ref) / max(1e-12, np.linalg.norm(Xc_ref))
+    assert err < 1e-3
+
+
+@pytest.mark.parametrize("shape", [(2000, 40), (30, 900)], ids=["tall", "wide"])
+@pytest.mark.parametrize("algorithm", ["gram", "auto"])
+def test_gram_solver_matches_exact(shape, algorithm):
+    _require_cpu_built()
+    rng = np.random.default_rng(8)
+    X = (rng.normal(size=shape) * np.linspace(1.0, 4.0, shape[1]) + 2.0).astype(np.float32)
+    for cls in (PCA, TruncatedSVD):
+        exact = cls(n_components=6, backend="cpu", algorithm="cusolver")
+        Z_exact = exact.fit_transform(X)
+        gram = cls(n_components=6, backend="cpu", algorithm=algorithm)
+        Z_gram = gram.fit_transform(X)
+        np.testing.assert_allclose(gram.singular_values_, exact.singular_values_, rtol=1e-3)
+        np.testing.assert_allclose(
+            gram.explained_variance_ratio_, exact.explained_variance_ratio_, rtol=1e-3
+        )
+        X_hat_gram = Z_gram @ gram.components_
+        X_hat_exact = Z_exact @ exact.components_
+        err = np.linalg.norm(X_hat_gram - X_hat_exact) / np.linalg.norm(X_hat_exact)
+        assert err < 1e-3
+
+
+def test_power_keeps_small_ill_conditioned_problems_exact():
+    """Small tall-skinny "power" fits use the LAPACK SVD, not the condition-squaring Gram path."""
+    _require_cpu_built()
+    rng = np.random.default_rng(13)
+    U, _ = np.linalg.qr(rng.normal(size=(4000, 60)))
+    V, _ = np.linalg.qr(rng.normal(size=(60, 60)))
+    s = np.geomspace(1.0, 1e-5, 60)
+    X = ((U * s) @ V.T).astype(np.float32)
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:40]
+    tsvd = TruncatedSVD(n_components=40, backend="cpu").fit(X)
+    np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-4)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_failed_native_fit_raises(cls, monkeypatch):
+    """Entry points return without writing fit_info.k when the solve fails."""
+    _require_cpu_built()
+    import dimreduce4gpu.truncated_svd as tsvd_module
+
+    monkeypatch.setattr(tsvd_module, "_dense_cpu_entry", lambda *args: lambda *a: None)
+    X = np.random.default_rng(14).normal(size=(60, 12)).astype(np.float32)
+    with pytest.raises(RuntimeError, match="solver failed"):
+        cls(n_components=3, backend="cpu").fit(X)
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_exact_solver_falls_back_on_exactly_rank_deficient_input(cls, order):
+    """sgesvdx returns no values when the bidiagonal splits; the full SVD takes over."""
+    _require_cpu_built()
+    # Zero-mean columns, so PCA factors the same rank-1 matrix.
+    X = np.asarray(np.outer(np.arange(200.0) - 99.5, np.ones(50)), dtype=np.float32, order=order)
+    est = cls(n_components=3, algorithm="cusolver", backend="cpu").fit(X)
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[0]
+    np.testing.assert_allclose(est.singular_values_[0], s_ref, rtol=1e-5)
+    np.testing.assert_allclose(est.singular_values_[1:], 0.0, atol=1e-3 * s_ref)
+
+
+@pytest.mark.parametrize("k", [3, 40])
+def test_exact_solver_partial_and_full_spectrum(k):
+    """k << min(n, m) uses the partial-spectrum driver, k ~ min(n, m) the full SVD."""
+    _require_cpu_built()
+    rng = np.random.default_rng(12)
+    X = rng.normal(size=(150, 48)).astype(np.float32)
+    tsvd = TruncatedSVD(n_components=k, backend="cpu", algorithm="cusolver")
+    Z = tsvd.fit_transform(X)
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:k]
+    np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-4)
+    X_ref = _svd_trunc_reconstruct(X.astype(np.float64), k, center=False)
+    err = np.linalg.norm(Z @ tsvd.components_ - X_ref) / np.linalg.norm(X_ref)
+    assert err < 1e-4
+
+
+def test_randomized_solver_stops_early_on_tol():
+    _require_cpu_built()
+    rng = np.random.default_rng(6)
+    n, m, k = 1000, 400, 8
+    U, _ = np.linalg.qr(rng.normal(size=(n, m)))
+    V, _ = np.linalg.qr(rng.normal(size=(m, m)))
+    s = np.r_[np.linspace(50.0, 20.0, k), np.ones(m - k)]
+    X = ((U * s) @ V.T).astype(np.float32)
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:k]
+
+    full = TruncatedSVD(n_components=k, algorithm="power", n_iter=30, tol=0.0, backend="cpu")
+    full.fit_transform(X)
+    early = TruncatedSVD(n_components=k, algorithm="power", n_iter=30, tol=1e-5, backend="cpu")
+    early.fit_transform(X)
+
+    assert full.n_iter_ == 30
+    assert early.n_iter_ < 30
+    assert early.n_matvecs_ < full.n_matvecs_
+    np.testing.assert_allclose(early.singular_values_, s_ref, rtol=1e-4)
+
+
+@pytest.mark.parametrize("target", [0.5, 0.9, 0.99])
+def test_pca_fractional_n_components_matches_sklearn(target):
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    rng = np.random.default_rng(13)
+    X = (rng.normal(size=(1500, 200)) * (0.9 ** np.arange(200)) + 2.0).astype(np.float32)
+    pca = PCA(n_components=target, n_iter=4, random_state=0, backend="cpu")
+    Z = pca.fit_transform(X)
+    sk = SkPCA(n_components=target, svd_solver="full").fit(X)
+
+    assert pca.n_components_ == sk.n_components_
+    assert Z.shape == (1500, pca.n_components_)
+    assert pca.components_.shape == (pca.n_components_, 200)
+    np.testing.assert_allclose(pca.mean_, sk.mean_, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=1e-3, atol=1e-6
+    )
+    # Blocks are only added while the target is unmet, so the basis stays close to k.
+    assert pca.n_matvecs_ < 200 * (2 * 4 + 2)
+
+
+def test_tsvd_fractional_n_components_uses_uncentered_energy():
+    _require_cpu_built()
+    rng = np.random.default_rng(14)
+    X = (rng.normal(size=(600, 120)) * (0.85 ** np.arange(120))).astype(np.float32)
+    tsvd = TruncatedSVD(n_components=0.9, n_iter=3, random_state=0, backend="cpu")
+    Z = tsvd.fit_transform(X)
+
+    s = np.linalg.svd(X.astype(np.float64), compute_uv=False)
+    k_ref = int(np.searchsorted(np.cumsum(s**2) / np.sum(s**2), 0.9, side="right")) + 1
+    assert tsvd.n_components_ == k_ref
+    np.testing.assert_allclose(tsvd.singular_values_, s[:k_ref], rtol=1e-3)
+    np.testing.assert_allclose(Z, X @ tsvd.components_.T, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.parametrize("layout", ["F", "rows", "float64"])
+def test_fractional_n_components_layouts_and_dtypes(layout):
+    _require_cpu_built()
+    rng = np.random.default_rng(15)
+    base = rng.normal(size=(800, 90)) * (0.8 ** np.arange(90)) + 3.0
+    X = {
+        "F": np.asfortranarray(base.astype(np.float32)),
+        "rows": np.repeat(base.astype(np.float32), 2, axis=0)[::2],
+        "float64": base,
+    }[layout]
+    pca = PCA(n_components=0.95, n_iter=3, random_state=0, backend="cpu").fit(X)
+    ref = PCA(n_components=0.95, n_iter=3, random_state=0, backend="cpu").fit(np.array(X))
+
+    expected_dtype = np.float64 if layout == "float64" else np.float32
+    assert pca.components_.dtype == expected_dtype
+    assert pca.components_.shape == (pca.n_components_, X.shape[1])
+    assert pca.n_components_ == ref.n_components_
+    np.testing.assert_allclose(pca.singular_values_, ref.singular_values_, rtol=1e-4)
+    s = np.linalg.svd(base - base.mean(axis=0), compute_uv=False)
+    np.testing.assert_allclose(pca.singular_values_, s[: pca.n_components_], rtol=1e-3)
+
+
+def test_fractional_n_components_validation():
+    with pytest.raises(ValueError):
+        TruncatedSVD(n_components=1.5)
+    with pytest.raises(ValueError):
+        PCA(n_components=0.0)
+    assert TruncatedSVD(n_components=3.0).n_components == 3
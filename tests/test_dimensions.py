@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4gpu import params
+
+
+def test_params_reject_dimensions_that_would_wrap():
+    p = params()
+    p.set_shape(2**31 - 1, 100)
+    assert (p.X_n, p.X_m) == (2**31 - 1, 100)
+    for shape in [(2**31, 100), (100, 2**32 + 5), (-1, 10)]:
+        with pytest.raises(ValueError, match="each dimension"):
+            p.set_shape(*shape)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_estimators_validate_shape_before_native_call(cls):
+    est = cls(n_components=2, backend="cpu")
+    with pytest.raises(ValueError, match="each dimension"):
+        est._build_params(40_000_000_000, 100, 2)
+    # 40M x 100 exceeds 2**31 elements but each dimension fits, so it is accepted.
+    p = est._build_params(40_000_000, 100, 2)
+    assert p.X_n * p.X_m > 2**31
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _decaying(n: int, m: int, seed: int, offset: float = 0.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, m)) * (0.9 ** np.arange(m)) + offset).astype(np.float32)
+
+
+@pytest.mark.parametrize("mode", ["processes", "threads"])
+def test_pca_tsqr_fit_matches_sklearn(mode):
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _decaying(4000, 120, seed=0, offset=2.0)
+    sk = SkPCA(n_components=6, svd_solver="full").fit(X)
+    pca = PCA(n_components=6, n_iter=3, random_state=0, backend="cpu")
+    if mode == "processes":
+        pca.fit(X, n_jobs=3)
+    else:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pca.fit(X, executor=pool)
+
+    np.testing.assert_allclose(pca.mean_, sk.mean_, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(pca.singular_values_, sk.singular_values_, rtol=1e-4)
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=1e-4
+    )
+    Z = pca._U * pca.singular_values_
+    np.testing.assert_allclose(Z, (X - sk.mean_) @ pca.components_.T, rtol=1e-3, atol=1e-3)
+    assert pca.n_iter_ == 3
+    assert pca.n_matvecs_ == 2 * 16 * 4
+
+
+def test_tsvd_tsqr_fit_from_memmap(tmp_path):
+    _require_cpu_built()
+    X = _decaying(3000, 100, seed=1)
+    path = tmp_path / "X.npy"
+    np.save(path, X)
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:5]
+
+    for source in (path, np.load(path, mmap_mode="r")):
+        tsvd = TruncatedSVD(n_components=5, n_iter=3, random_state=0, backend="cpu")
+        tsvd.fit(source, n_jobs=2)
+        np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-4)
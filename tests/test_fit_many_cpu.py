@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+@pytest.mark.parametrize("algorithm", ["auto", "power"])
+def test_fit_many_matches_individual_fits(cls, algorithm):
+    _require_cpu_built()
+    X_stack = np.random.default_rng(0).normal(size=(12, 200, 24)).astype(np.float32) + 0.5
+    kwargs = dict(n_components=4, algorithm=algorithm, n_iter=3, random_state=3, backend="cpu")
+    result = cls(**kwargs).fit_many(X_stack)
+
+    assert result.components.shape == (12, 4, 24)
+    assert result.singular_values.shape == (12, 4)
+    assert result.X_transformed.shape == (12, 200, 4)
+    assert (result.mean is not None) == (cls is PCA)
+    for b in (0, 5, 11):
+        ref = cls(**kwargs)
+        Z = ref.fit_transform(X_stack[b])
+        np.testing.assert_allclose(result.X_transformed[b], Z, rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(result.components[b], ref.components_, rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(result.singular_values[b], ref.singular_values_, rtol=1e-6)
+        np.testing.assert_allclose(
+            result.explained_variance_ratio[b], ref.explained_variance_ratio_, rtol=1e-6
+        )
+        if cls is PCA:
+            np.testing.assert_allclose(result.mean[b], ref.mean_, rtol=1e-6, atol=1e-6)
+
+
+def test_fit_many_accepts_lists_and_validates_shapes():
+    _require_cpu_built()
+    rng = np.random.default_rng(1)
+    problems = [rng.normal(size=(50, 10)) for _ in range(3)]  # float64 is converted
+    tsvd = TruncatedSVD(n_components=2, random_state=0, backend="cpu")
+    result = tsvd.fit_many(problems)
+    assert result.components.shape == (3, 2, 10)
+    assert result.components.dtype == np.float32
+    # The estimator itself stays unfitted.
+    with pytest.raises(AttributeError):
+        _ = tsvd.components_
+
+    empty = tsvd.fit_many(np.empty((0, 50, 10), dtype=np.float32))
+    assert empty.X_transformed.shape == (0, 50, 2)
+
+    with pytest.raises(ValueError, match="same-shaped"):
+        tsvd.fit_many([problems[0], problems[1][:, :9]])
+    with pytest.raises(ValueError, match="3D"):
+        tsvd.fit_many(problems[0])
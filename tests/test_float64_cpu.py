@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _ill_conditioned(n: int, s: np.ndarray, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.normal(size=(n, s.size)))
+    V, _ = np.linalg.qr(rng.normal(size=(s.size, s.size)))
+    return (U * s) @ V.T
+
+
+@pytest.mark.parametrize("algorithm", ["cusolver", "lanczos"])
+def test_float64_resolves_small_singular_values(algorithm):
+    _require_cpu_built()
+    s = np.logspace(0, -9, 10)
+    X = _ill_conditioned(300, s)
+    kwargs = dict(n_components=10, algorithm=algorithm, n_iter=4, random_state=0, backend="cpu")
+
+    tsvd = TruncatedSVD(**kwargs)
+    Z = tsvd.fit_transform(X)
+    assert Z.dtype == tsvd.components_.dtype == tsvd.singular_values_.dtype == np.float64
+    np.testing.assert_allclose(tsvd.singular_values_, s, rtol=1e-6)
+    np.testing.assert_allclose(Z @ tsvd.components_, X, atol=1e-12)
+
+    # In float32 the trailing values sit below rounding of the leading ones.
+    single = TruncatedSVD(**kwargs, dtype=np.float32).fit(X)
+    assert single.singular_values_.dtype == np.float32
+    assert abs(single.singular_values_[-1] - s[-1]) > 1e-3 * s[-1]
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_pca_float64_outputs_and_transform(order):
+    _require_cpu_built()
+    rng = np.random.default_rng(1)
+    X = np.asarray(1e4 + rng.normal(size=(500, 12)) * np.linspace(1.0, 1e-5, 12), order=order)
+    pca = PCA(n_components=3, backend="cpu")
+    Z = pca.fit_transform(X)
+    for attr in ("components_", "singular_values_", "mean_", "explained_variance_ratio_"):
+        assert getattr(pca, attr).dtype == np.float64, attr
+    np.testing.assert_allclose(pca.mean_, X.mean(axis=0), rtol=1e-14)
+    ref = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)[1][:3]
+    np.testing.assert_allclose(pca.singular_values_, ref, rtol=1e-10)
+    assert pca.transform(X).dtype == np.float64
+    np.testing.assert_allclose(np.abs(Z), np.abs((X - pca.mean_) @ pca.components_.T), atol=1e-8)
+
+
+def test_dtype_option():
+    _require_cpu_built()
+    X = np.random.default_rng(2).normal(size=(60, 8))
+    assert PCA(n_components=2, backend="cpu").fit(X.astype(np.float32)).mean_.dtype == np.float32
+    assert PCA(n_components=2, backend="cpu").fit(X.astype(np.int64)).mean_.dtype == np.float32
+    forced = TruncatedSVD(n_components=2, backend="cpu", dtype="float64")
+    assert forced.fit_transform(X.astype(np.float32)).dtype == np.float64
+
+    with pytest.raises(ValueError, match="dtype"):
+        PCA(dtype=np.float16)
+    with pytest.raises(ValueError, match="CPU backend"):
+        PCA(n_components=2, backend="gpu", dtype=np.float64).fit(X)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _low_rank(n: int, m: int, r: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, r)) @ rng.normal(size=(r, m)) + rng.normal(size=m) * 5.0
+    return X.astype(np.float32)
+
+
+def test_pca_partial_fit_matches_sklearn_incremental_pca():
+    _require_cpu_built()
+    from sklearn.decomposition import IncrementalPCA
+
+    rng = np.random.default_rng(0)
+    X = (rng.normal(size=(2000, 60)) * (0.8 ** np.arange(60)) + 1.0).astype(np.float32)
+    ours = PCA(n_components=5, backend="cpu")
+    ref = IncrementalPCA(n_components=5)
+    for batch in np.array_split(X, 8):
+        assert ours.partial_fit(batch) is ours
+        ref.partial_fit(batch)
+
+    assert ours.n_samples_seen_ == 2000
+    np.testing.assert_allclose(ours.mean_, ref.mean_, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(ours.singular_values_, ref.singular_values_, rtol=1e-4)
+    np.testing.assert_allclose(
+        ours.explained_variance_ratio_, ref.explained_variance_ratio_, rtol=1e-4
+    )
+    np.testing.assert_allclose(np.abs(ours.components_), np.abs(ref.components_), atol=1e-4)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_partial_fit_matches_full_fit_on_low_rank_data(cls):
+    """With rank <= k no information is truncated between batches, so batching is exact."""
+    _require_cpu_built()
+    X = _low_rank(1500, 50, r=4, seed=1)
+    k = 4 if cls is PCA else 5  # the uncentered TSVD sees the mean as one more direction
+    inc = cls(n_components=k, backend="cpu")
+    for batch in np.array_split(X, 6):
+        inc.partial_fit(batch)
+    full = cls(n_components=k, algorithm="cusolver", backend="cpu")
+    full.fit(X)
+
+    np.testing.assert_allclose(inc.singular_values_, full.singular_values_, rtol=1e-3)
+    np.testing.assert_allclose(
+        inc.explained_variance_ratio_, full.explained_variance_ratio_, rtol=1e-3, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        np.abs(inc.transform(X)), np.abs(full.transform(X)), rtol=1e-2, atol=1e-2
+    )
+
+
+def test_partial_fit_validation_and_reset():
+    _require_cpu_built()
+    X = _low_rank(100, 20, r=3, seed=2)
+    pca = PCA(n_components=5, backend="cpu")
+    with pytest.raises(ValueError):
+        pca.partial_fit(X[:3])
+    pca.partial_fit(X[:50])
+    with pytest.raises(ValueError):
+        pca.partial_fit(X[:, :10])
+    with pytest.raises(ValueError):
+        PCA(n_components=0.9, backend="cpu").partial_fit(X)
+
+    pca.fit(X)
+    assert pca.n_samples_seen_ is None
+    pca.partial_fit(X[50:])
+    assert pca.n_samples_seen_ == 50
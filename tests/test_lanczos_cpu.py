@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _flat_spectrum(n: int, m: int, seed: int) -> np.ndarray:
+    """Matrix with slowly decaying singular values s_i = 1 / sqrt(i)."""
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.normal(size=(n, m)))
+    V, _ = np.linalg.qr(rng.normal(size=(m, m)))
+    s = 1.0 / np.sqrt(np.arange(1, m + 1))
+    return ((U * s) @ V.T).astype(np.float32)
+
+
+def _max_rel_err(s: np.ndarray, ref: np.ndarray) -> float:
+    return float(np.max(np.abs(np.asarray(s, dtype=np.float64) - ref) / ref))
+
+
+def test_lanczos_beats_subspace_iteration_with_fewer_matvecs():
+    _require_cpu_built()
+    X = _flat_spectrum(1200, 500, seed=0)
+    ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:10]
+
+    power = TruncatedSVD(
+        n_components=10, algorithm="power", n_iter=4, random_state=0, backend="cpu"
+    )
+    power.fit_transform(X)
+    krylov = TruncatedSVD(
+        n_components=10, algorithm="lanczos", n_iter=4, random_state=0, backend="cpu"
+    )
+    krylov.fit_transform(X)
+
+    assert krylov.n_iter_ == 4
+    assert 0 < krylov.n_matvecs_ < power.n_matvecs_
+    assert _max_rel_err(krylov.singular_values_, ref) < _max_rel_err(power.singular_values_, ref)
+
+
+def test_lanczos_restarts_stay_accurate():
+    _require_cpu_built()
+    X = _flat_spectrum(800, 300, seed=1)
+    ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:8]
+    # 20 steps with block size 8 exceed the Krylov basis cap, so the solver restarts.
+    tsvd = TruncatedSVD(
+        n_components=8, algorithm="lanczos", n_iter=20, random_state=3, backend="cpu"
+    )
+    Z = tsvd.fit_transform(X)
+    assert tsvd.n_iter_ == 20
+    assert _max_rel_err(tsvd.singular_values_, ref) < 1e-4
+    C = np.asarray(tsvd.components_, dtype=np.float64)
+    np.testing.assert_allclose(C @ C.T, np.eye(8), atol=1e-4)
+    np.testing.assert_allclose(Z, X @ C.T, rtol=1e-3, atol=1e-4)
+
+
+def test_lanczos_pca_and_sparse():
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _flat_spectrum(900, 400, seed=2) + 3.0
+    pca = PCA(n_components=6, algorithm="lanczos", n_iter=8, random_state=0, backend="cpu")
+    pca.fit_transform(X)
+    sk = SkPCA(n_components=6, svd_solver="full").fit(X)
+    assert _max_rel_err(pca.singular_values_, sk.singular_values_) < 1e-3
+
+    # Random sparse matrices have an almost flat tail spectrum; Krylov should still win.
+    Xs = sp.random(900, 400, density=0.05, format="csr", random_state=4, dtype=np.float32)
+    ref = np.linalg.svd(Xs.toarray().astype(np.float64), compute_uv=False)[:6]
+    errs = {}
+    for algorithm in ("power", "lanczos"):
+        tsvd = TruncatedSVD(
+            n_components=6, algorithm=algorithm, n_iter=8, random_state=0, backend="cpu"
+        )
+        tsvd.fit_transform(Xs)
+        errs[algorithm] = (_max_rel_err(tsvd.singular_values_, ref), tsvd.n_matvecs_)
+    assert errs["lanczos"][0] < errs["power"][0]
+    assert errs["lanczos"][1] < errs["power"][1]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+from dimreduce4gpu.truncated_svd import _dense_layout
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+class _DLPackOnly:
+    """Exposes an array through the DLPack protocol only, like a PyTorch CPU tensor."""
+
+    def __init__(self, a: np.ndarray) -> None:
+        self._a = a
+
+    def __dlpack__(self, **kwargs):
+        return self._a.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self._a.__dlpack_device__()
+
+
+def test_dense_layout_reads_supported_layouts_in_place():
+    base = np.random.default_rng(0).normal(size=(40, 30)).astype(np.float32)
+    F = np.asfortranarray(base)
+    cases = {
+        "C": (base, 0, 30),
+        "F": (F, 1, 40),
+        "rows": (base[::2], 0, 60),
+        "cols": (base[:, :20], 0, 30),
+        "F rows": (F[5:25], 1, 40),
+        "dlpack": (_DLPackOnly(F), 1, 40),
+    }
+    for name, (X, col_major, ld) in cases.items():
+        out, got_col_major, got_ld = _dense_layout(X)
+        assert np.shares_memory(out, base if col_major == 0 else F), name
+        assert (got_col_major, got_ld) == (col_major, ld), name
+
+    # Converted once, in the same memory order; BLAS-incompatible strides fall back to C order.
+    X64, col_major, _ = _dense_layout(np.asfortranarray(base, dtype=np.float64))
+    assert X64.dtype == np.float32 and col_major == 1
+    out, col_major, ld = _dense_layout(base[:, ::2])
+    assert out.flags.c_contiguous and (col_major, ld) == (0, 15)
+    assert _dense_layout(F, c_order=True)[0].flags.c_contiguous
+
+
+@pytest.mark.parametrize(
+    "algorithm, shape",
+    [
+        ("cusolver", (120, 40)),
+        ("power", (300, 200)),
+        ("lanczos", (300, 200)),
+        ("gram", (400, 30)),
+        ("gram", (30, 400)),
+        ("wide", (40, 2000)),
+    ],
+)
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_layouts_match_c_order(cls, algorithm, shape):
+    _require_cpu_built()
+    n, m = shape
+    big = np.random.default_rng(1).normal(size=(2 * n, m + 7)).astype(np.float32) + 0.5
+    X = np.ascontiguousarray(big[::2, :m])
+    kwargs = dict(n_components=4, algorithm=algorithm, n_iter=4, random_state=0, backend="cpu")
+    ref = cls(**kwargs)
+    Z_ref = ref.fit_transform(X)
+
+    for X_view in (np.asfortranarray(X), big[::2, :m], X.astype(np.float64)):
+        est = cls(**kwargs)
+        Z = est.fit_transform(X_view)
+        np.testing.assert_allclose(est.singular_values_, ref.singular_values_, rtol=1e-4)
+        np.testing.assert_allclose(np.abs(Z), np.abs(Z_ref), rtol=1e-3, atol=1e-3)
+        np.testing.assert_allclose(
+            est.explained_variance_ratio_, ref.explained_variance_ratio_, rtol=1e-4
+        )
+        if cls is PCA:
+            np.testing.assert_allclose(est.mean_, ref.mean_, rtol=1e-5, atol=1e-6)
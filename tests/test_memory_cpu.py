@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+import dimreduce4gpu
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _assert_same_subspace(A, B):
+    # Rows of A and B are unit vectors that may differ in sign.
+    np.testing.assert_allclose(np.abs(np.sum(A * B, axis=1)), 1.0, atol=1e-4)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_fit_matches_fit_transform_without_row_outputs(cls, sparse):
+    _require_cpu_built()
+    X = np.random.default_rng(0).normal(size=(300, 40)).astype(np.float32) + 1.0
+    if sparse:
+        X = scipy.sparse.csr_matrix(X)
+    kwargs = dict(n_components=4, algorithm="power", n_iter=4, random_state=0, backend="cpu")
+    fitted = cls(**kwargs).fit(X)
+    ref = cls(**kwargs)
+    ref.fit_transform(X)
+
+    assert fitted._U is None
+    np.testing.assert_array_equal(fitted.components_, ref.components_)
+    np.testing.assert_array_equal(fitted.singular_values_, ref.singular_values_)
+    np.testing.assert_array_equal(fitted.explained_variance_ratio_, ref.explained_variance_ratio_)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_out_buffers(cls):
+    _require_cpu_built()
+    X = np.random.default_rng(1).normal(size=(200, 30)).astype(np.float32)
+    est = cls(n_components=3, random_state=0, backend="cpu")
+    out = np.empty((200, 3), dtype=np.float32)
+    Z = est.fit_transform(X, out=out)
+    assert Z is out
+    np.testing.assert_allclose(
+        Z, cls(n_components=3, random_state=0, backend="cpu").fit_transform(X)
+    )
+
+    T = np.empty((50, 3), dtype=np.float32)
+    assert est.transform(X[:50], out=T) is T
+    np.testing.assert_allclose(T, est.transform(X[:50]), rtol=1e-6)
+
+    with pytest.raises(ValueError, match="out must be"):
+        est.fit_transform(X, out=np.empty((200, 3), dtype=np.float64))
+    with pytest.raises(ValueError, match="out must be"):
+        est.transform(X, out=np.empty((3, 200), dtype=np.float32).T)
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("k", [4, 12])  # partial (gesvdx) and full (gesdd) LAPACK paths
+def test_copy_false_factors_in_place(cls, order, dtype, k):
+    _require_cpu_built()
+    base = np.random.default_rng(2).normal(size=(120, 25)) * np.linspace(3.0, 0.5, 25) + 2.0
+    base = np.asarray(base, dtype=dtype, order=order)
+    kwargs = dict(n_components=k, algorithm="cusolver", backend="cpu", dtype=dtype)
+    ref = cls(**kwargs)
+    Z_ref = ref.fit_transform(base.copy(order=order))
+
+    X = base.copy(order=order)
+    est = cls(**kwargs, copy=False)
+    Z = est.fit_transform(X)
+    # The exact solver used X as LAPACK workspace.
+    assert not np.array_equal(X, base)
+    _assert_same_subspace(est.components_, ref.components_)
+    np.testing.assert_allclose(np.abs(Z), np.abs(Z_ref), rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(est.singular_values_, ref.singular_values_, rtol=1e-5)
+    np.testing.assert_allclose(
+        est.explained_variance_ratio_, ref.explained_variance_ratio_, rtol=1e-5
+    )
+    if cls is PCA:
+        np.testing.assert_allclose(est.mean_, ref.mean_, rtol=1e-6)
+
+
+@pytest.mark.parametrize("copy, bound", [(False, 0.5), (True, 1.5)])
+def test_copy_false_allocates_no_full_size_buffer(copy, bound):
+    _require_cpu_built()
+    pytest.importorskip("resource")
+    # Peak RSS is per process, so the fit runs in a fresh one after a small warm-up fit.
+    code = (
+        "import resource, numpy as np\n"
+        "from dimreduce4gpu import PCA\n"
+        "rng = np.random.default_rng(0)\n"
+        "warm_up = rng.standard_normal((200, 50), dtype=np.float32)\n"
+        "PCA(n_components=2, algorithm='cusolver', backend='cpu', copy=False).fit(warm_up)\n"
+        "X = rng.standard_normal((8000, 500), dtype=np.float32)\n"
+        "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+        f"PCA(n_components=10, algorithm='cusolver', backend='cpu', copy={copy}).fit(X)\n"
+        "after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+        "print((after - before) * 1024 / X.nbytes)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(dimreduce4gpu.__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=root, capture_output=True, text=True
+    )
+    # k = 10 takes the partial (sgesvdx) path; copy=False must not keep a copy of X beside it.
+    assert float(result.stdout) < bound
+
+
+def test_copy_false_failure_asks_for_a_copy():
+    """An in-place exact fit has no copy of X to fall back on when sgesvdx fails."""
+    _require_cpu_built()
+    X = np.outer(np.arange(200.0) - 99.5, np.ones(50)).astype(np.float32)
+    with pytest.raises(RuntimeError, match="copy=True"):
+        TruncatedSVD(n_components=3, algorithm="cusolver", backend="cpu", copy=False).fit(X)
+
+
+def test_copy_false_leaves_read_only_and_iterative_inputs_alone():
+    _require_cpu_built()
+    X = np.random.default_rng(3).normal(size=(150, 20)).astype(np.float32)
+    frozen = X.copy()
+    frozen.flags.writeable = False
+    PCA(n_components=3, algorithm="cusolver", backend="cpu", copy=False).fit(frozen)
+    np.testing.assert_array_equal(frozen, X)
+
+    # min(n, m) > 256 keeps "power" on the randomized solver, which only reads X.
+    X = np.random.default_rng(4).normal(size=(400, 300)).astype(np.float32)
+    work = X.copy()
+    PCA(n_components=3, algorithm="power", backend="cpu", copy=False).fit(work)
+    np.testing.assert_array_equal(work, X)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD, select_rank
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _low_rank(seed=0, n=500, m=30, r=5):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, r)) @ rng.normal(size=(r, m)) * 3 + rng.normal(size=(n, m))
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_truncate_matches_a_direct_fit(cls):
+    _require_cpu_built()
+    X = _low_rank().astype(np.float32)
+    full = cls(n_components=12, algorithm="cusolver", backend="cpu").fit(X)
+    direct = cls(n_components=4, algorithm="cusolver", backend="cpu").fit(X)
+    small = full.truncate(4)
+    assert small.n_components_ == 4 and full.n_components_ == 12
+    np.testing.assert_allclose(small.singular_values_, direct.singular_values_, rtol=1e-5)
+    np.testing.assert_allclose(
+        small.explained_variance_ratio_, direct.explained_variance_ratio_, rtol=1e-5
+    )
+    np.testing.assert_allclose(small.transform(X), full.transform(X)[:, :4], rtol=1e-5, atol=1e-4)
+
+    path = full.components_path([2, 4, 8])
+    assert sorted(path) == [2, 4, 8]
+    assert path[8].components_.shape == (8, X.shape[1])
+    assert len(full.components_path()) == 12
+    with pytest.raises(ValueError, match="between"):
+        full.truncate(13)
+
+
+def test_truncated_whitened_pca_scores():
+    _require_cpu_built()
+    X = _low_rank(1).astype(np.float32)
+    pca = PCA(n_components=10, whiten=True, backend="cpu").fit(X).truncate(3)
+    np.testing.assert_allclose(pca.transform(X).var(axis=0, ddof=1), 1.0, rtol=1e-3)
+
+
+def test_mle_matches_sklearn():
+    _require_cpu_built()
+    sklearn_decomposition = pytest.importorskip("sklearn.decomposition")
+    X = _low_rank(2)
+    expected = sklearn_decomposition.PCA(n_components="mle").fit(X).n_components_
+    estimator = PCA(algorithm="cusolver", backend="cpu", dtype=np.float64)
+    full = select_rank(X, range(1, X.shape[1]), "mle", estimator=estimator)
+    assert full.rank == expected
+    # A fit at a smaller maximum rank stands in for the unfitted spectrum by its mean.
+    partial = select_rank(X, [2, 4, 5, 8, 12], "mle", estimator=estimator)
+    assert partial.rank == expected
+    np.testing.assert_allclose(partial.scores[:3], full.scores[[1, 3, 4]], rtol=1e-6)
+    assert partial.model.n_components_ == 12
+
+
+def test_threshold_criteria():
+    _require_cpu_built()
+    X = _low_rank(3)
+    ev = select_rank(X, [1, 3, 5, 8], "explained_variance", threshold=0.9)
+    assert ev.rank == 5
+    assert np.all(np.diff(ev.scores) > 0)
+    np.testing.assert_allclose(
+        ev.scores, np.cumsum(ev.model.explained_variance_ratio_)[[0, 2, 4, 7]], rtol=1e-6
+    )
+
+    rec = select_rank(X, [1, 3, 5, 8], "reconstruction", threshold=0.9, random_state=0)
+    assert rec.rank == 5
+    assert np.all(np.diff(rec.scores) < 0)
+    # Scores are the held-out reconstruction errors of the truncated models.
+    perm = np.random.default_rng(0).permutation(X.shape[0])
+    X_test = X[np.sort(perm[:100])]
+    np.testing.assert_allclose(
+        rec.scores[1], rec.model.truncate(3).reconstruction_error(X_test).mean(), rtol=1e-4
+    )
+
+
+def test_select_rank_validates_arguments():
+    _require_cpu_built()
+    X = _low_rank(4, n=60, m=10)
+    with pytest.raises(ValueError, match="criterion"):
+        select_rank(X, [1, 2], "bic")
+    with pytest.raises(ValueError, match="PCA"):
+        select_rank(X, [1, 2], "mle", estimator=TruncatedSVD(backend="cpu"))
+    with pytest.raises(ValueError, match="positive"):
+        select_rank(X, [0, 2])
+    with pytest.raises(ValueError, match="below"):
+        select_rank(X, [10], "mle")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _decaying(n: int, m: int, seed: int, offset: float = 0.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, m)) * (0.9 ** np.arange(m)) + offset).astype(np.float32)
+
+
+def test_pca_fit_from_npy_path_and_memmap(tmp_path):
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _decaying(3000, 150, seed=0, offset=3.0)
+    path = tmp_path / "X.npy"
+    np.save(path, X)
+    sk = SkPCA(n_components=6, svd_solver="full").fit(X)
+
+    for source in (path, np.load(path, mmap_mode="r")):
+        pca = PCA(n_components=6, n_iter=2, random_state=0, backend="cpu")
+        pca.fit(source, chunk_size=700)
+        np.testing.assert_allclose(pca.mean_, sk.mean_, rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(pca.singular_values_, sk.singular_values_, rtol=1e-4)
+        np.testing.assert_allclose(
+            pca.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=1e-4
+        )
+        # One range pass, n_iter power passes and the projection pass, each X^T X V with l = 16.
+        assert pca.n_matvecs_ == 2 * 16 * (2 + 2)
+
+
+@pytest.mark.parametrize("offset", [1e3, 1e4])
+def test_streamed_pca_on_large_column_offsets(tmp_path, offset):
+    _require_cpu_built()
+    rng = np.random.default_rng(4)
+    signal = rng.normal(size=(4000, 3)) * [3.0, 2.0, 1.0] @ rng.normal(size=(3, 300))
+    X = signal + 0.1 * rng.normal(size=(4000, 300)) + offset * rng.uniform(0.5, 1.5, 300)
+    X = X.astype(np.float32)
+    np.save(tmp_path / "X.npy", X)
+    X64 = X.astype(np.float64)
+    s_ref = np.linalg.svd(X64 - X64.mean(axis=0), compute_uv=False)[:3]
+
+    pca = PCA(n_components=3, random_state=0, backend="cpu").fit(tmp_path / "X.npy")
+    np.testing.assert_allclose(pca.singular_values_, s_ref, rtol=1e-4)
+    tsvd = TruncatedSVD(n_components=3, random_state=0, backend="cpu").fit(tmp_path / "X.npy")
+    s_ref = np.linalg.svd(X64, compute_uv=False)[:3]
+    np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-5)
+
+
+@pytest.mark.parametrize("algorithm", ["cusolver", "power"])
+def test_memmap_without_chunk_size_fits_in_memory(tmp_path, algorithm):
+    _require_cpu_built()
+    X = _decaying(3000, 200, seed=2)
+    np.save(tmp_path / "X.npy", X)
+    mm = np.load(tmp_path / "X.npy", mmap_mode="r")
+    kw = dict(n_components=20, algorithm=algorithm, random_state=0, backend="cpu")
+
+    direct = TruncatedSVD(**kw).fit(X)
+    mapped = TruncatedSVD(**kw).fit(mm)
+    np.testing.assert_array_equal(mapped.singular_values_, direct.singular_values_)
+    assert mapped.n_matvecs_ == direct.n_matvecs_
+    Z = TruncatedSVD(**kw).fit_transform(mm)
+    np.testing.assert_allclose(Z, TruncatedSVD(**kw).fit_transform(X), rtol=1e-5, atol=1e-5)
+
+
+def test_fit_transform_streams_like_fit(tmp_path):
+    _require_cpu_built()
+    X = _decaying(2000, 100, seed=3, offset=1.0)
+    path = tmp_path / "X.npy"
+    np.save(path, X)
+    for source, chunk_size in ((path, None), (np.load(path, mmap_mode="r"), 500)):
+        fitted = PCA(n_components=4, n_iter=2, random_state=0, backend="cpu")
+        fitted.fit(source, chunk_size=chunk_size)
+        est = PCA(n_components=4, n_iter=2, random_state=0, backend="cpu")
+        Z = est.fit_transform(source, chunk_size=chunk_size)
+        np.testing.assert_array_equal(est.components_, fitted.components_)
+        np.testing.assert_allclose(Z, fitted.transform(X), rtol=1e-5, atol=1e-5)
+
+
+def test_tsvd_fit_from_chunk_iterables():
+    _require_cpu_built()
+    X = _decaying(2000, 120, seed=1)
+    chunks = [X[i : i + 333] for i in range(0, 2000, 333)]
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:5]
+
+    listed = TruncatedSVD(n_components=5, n_iter=2, random_state=0, backend="cpu").fit(chunks)
+    np.testing.assert_allclose(listed.singular_values_, s_ref, rtol=1e-4)
+    called = TruncatedSVD(n_components=5, n_iter=2, random_state=0, backend="cpu")
+    called.fit(lambda: iter(chunks))
+    np.testing.assert_allclose(called.components_, listed.components_, atol=1e-6)
+
+    dense = TruncatedSVD(n_components=5, algorithm="cusolver", backend="cpu").fit(X)
+    np.testing.assert_allclose(
+        listed.explained_variance_ratio_, dense.explained_variance_ratio_, rtol=1e-3
+    )
+
+    with pytest.raises(ValueError):
+        TruncatedSVD(n_components=5, backend="cpu").fit(iter(chunks))
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, SVDPlan, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+@pytest.mark.parametrize(
+    "algorithm, shape",
+    [
+        ("auto", (500, 60)),
+        ("cusolver", (200, 120)),
+        ("power", (600, 400)),
+        ("gram", (300, 40)),
+        ("wide", (50, 2000)),
+    ],
+)
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_planned_fit_matches_unplanned(cls, algorithm, shape):
+    _require_cpu_built()
+    X = np.random.default_rng(0).normal(size=shape).astype(np.float32) + 1.0
+    kwargs = dict(n_components=5, algorithm=algorithm, n_iter=3, random_state=1, backend="cpu")
+    ref = cls(**kwargs)
+    Z_ref = ref.fit_transform(X)
+
+    with SVDPlan(*shape, 5, algorithm=algorithm) as plan:
+        est = cls(**kwargs, plan=plan)
+        for _ in range(3):
+            Z = est.fit_transform(X)
+        np.testing.assert_allclose(Z, Z_ref, rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(est.components_, ref.components_, rtol=1e-6, atol=1e-6)
+        np.testing.assert_allclose(est.singular_values_, ref.singular_values_, rtol=1e-6)
+        np.testing.assert_allclose(
+            est.explained_variance_ratio_, ref.explained_variance_ratio_, rtol=1e-6
+        )
+        assert est.n_matvecs_ == ref.n_matvecs_
+        if cls is PCA:
+            np.testing.assert_allclose(est.mean_, ref.mean_, rtol=1e-6, atol=1e-6)
+
+
+def test_plan_reuses_its_output_buffers():
+    _require_cpu_built()
+    rng = np.random.default_rng(1)
+    plan = SVDPlan(300, 50, 4, algorithm="power")
+    pca = PCA(n_components=4, algorithm="power", n_iter=4, random_state=0, plan=plan)
+
+    Z1 = pca.fit_transform(rng.normal(size=(300, 50)).astype(np.float32))
+    first = pca.components_.copy()
+    Z2 = pca.fit_transform(rng.normal(size=(300, 50)).astype(np.float32))
+    # Same arrays, new contents: the plan does not allocate outputs per fit.
+    assert Z1 is Z2 is plan.X_transformed
+    assert pca.components_ is plan.components
+    assert not np.allclose(pca.components_, first)
+    plan.close()
+
+
+def test_truncated_plan_model_survives_a_refit():
+    _require_cpu_built()
+    rng = np.random.default_rng(2)
+    with SVDPlan(300, 50, 4, algorithm="power") as plan:
+        pca = PCA(n_components=4, algorithm="power", n_iter=4, random_state=0, plan=plan)
+        pca.fit(rng.normal(size=(300, 50)).astype(np.float32))
+        small = pca.truncate(2)
+        path = pca.components_path([3])
+        kept = small.components_.copy(), small.singular_values_.copy(), small.mean_.copy()
+        assert small.plan is None and path[3].plan is None
+
+        pca.fit(rng.normal(size=(300, 50)).astype(np.float32) + 1.0)
+        np.testing.assert_array_equal(small.components_, kept[0])
+        np.testing.assert_array_equal(small.singular_values_, kept[1])
+        np.testing.assert_array_equal(small.mean_, kept[2])
+        assert not np.shares_memory(path[3].components_, plan.components)
+
+
+def test_plan_validation():
+    _require_cpu_built()
+    with pytest.raises(ValueError, match="float32"):
+        SVDPlan(100, 20, 3, dtype=np.float64)
+    with pytest.raises(ValueError, match="lanczos"):
+        SVDPlan(100, 20, 3, algorithm="lanczos")
+
+    plan = SVDPlan(100, 20, 3)
+    X = np.ones((100, 21), dtype=np.float32)
+    with pytest.raises(ValueError, match="shape"):
+        TruncatedSVD(n_components=3, plan=plan).fit_transform(X)
+    with pytest.raises(ValueError, match="n_components"):
+        TruncatedSVD(n_components=4, plan=plan).fit_transform(X[:, :20])
+    plan.close()
+    with pytest.raises(ValueError, match="closed"):
+        TruncatedSVD(n_components=3, plan=plan).fit_transform(X[:, :20])
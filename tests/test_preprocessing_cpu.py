@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import dimreduce4gpu
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+@pytest.mark.parametrize("layout", ["C", "F", "rows"])
+@pytest.mark.parametrize("algorithm", ["cusolver", "power"])
+def test_mean_and_variance_survive_large_offsets(layout, algorithm):
+    _require_cpu_built()
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(6000, 40)) * np.linspace(0.5, 2.0, 40) + 1e4
+    X = {
+        "C": base.astype(np.float32),
+        "F": np.asfortranarray(base.astype(np.float32)),
+        "rows": np.repeat(base.astype(np.float32), 2, axis=0)[::2],
+    }[layout]
+    X64 = np.asarray(X, dtype=np.float64)
+    total_var = X64.var(axis=0, ddof=1).sum()
+
+    pca = PCA(n_components=5, algorithm=algorithm, n_iter=4, random_state=0, backend="cpu").fit(X)
+    np.testing.assert_allclose(pca.mean_, X64.mean(axis=0), rtol=1e-7)
+    np.testing.assert_allclose(
+        pca.explained_variance_ / pca.explained_variance_ratio_, total_var, rtol=1e-5
+    )
+
+    tsvd = TruncatedSVD(n_components=5, algorithm=algorithm, random_state=0, backend="cpu").fit(X)
+    np.testing.assert_allclose(
+        tsvd.explained_variance_ / tsvd.explained_variance_ratio_, total_var, rtol=1e-5
+    )
+
+
+def test_results_do_not_depend_on_thread_count():
+    _require_cpu_built()
+    code = (
+        "import sys, numpy as np\n"
+        "from dimreduce4gpu import PCA\n"
+        "X = np.random.default_rng(1).normal(size=(5000, 300)).astype(np.float32) + 3.0\n"
+        "pca = PCA(n_components=4, algorithm='cusolver', backend='cpu').fit(X)\n"
+        "out = np.concatenate([pca.mean_, pca.explained_variance_ratio_, pca.singular_values_])\n"
+        "sys.stdout.write(out.tobytes().hex())\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(dimreduce4gpu.__file__)))
+    outputs = set()
+    for threads in ("1", "4"):
+        env = dict(os.environ, OMP_NUM_THREADS=threads, OPENBLAS_NUM_THREADS="1")
+        run = subprocess.run(
+            [sys.executable, "-c", code], check=True, cwd=root, env=env, capture_output=True
+        )
+        outputs.add(run.stdout)
+    assert len(outputs) == 1
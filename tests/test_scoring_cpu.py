@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _data(seed=0, n=900, m=24):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, m)) * np.linspace(4, 0.5, m) + 20).astype(np.float32)
+
+
+@pytest.mark.parametrize(("cls", "whiten"), [(TruncatedSVD, False), (PCA, False), (PCA, True)])
+def test_inverse_transform_matches_numpy(cls, whiten):
+    _require_cpu_built()
+    X = _data()
+    kwargs = {"whiten": whiten} if cls is PCA else {}
+    est = cls(n_components=6, random_state=0, backend="cpu", **kwargs).fit(X)
+    Z = est.transform(X)
+    V = est.components_.astype(np.float64)
+    Z_raw = Z.astype(np.float64)
+    if whiten:
+        Z_raw *= np.sqrt(est.explained_variance_.astype(np.float64))
+    expected = Z_raw @ V
+    if cls is PCA:
+        expected += est.mean_
+    X_back = est.inverse_transform(Z)
+    assert X_back.dtype == np.float32
+    np.testing.assert_allclose(X_back, expected, rtol=1e-4, atol=1e-3)
+
+    out = np.empty_like(X)
+    assert est.inverse_transform(Z, out=out) is out
+    with pytest.raises(ValueError, match="expected"):
+        est.inverse_transform(Z[:, :5])
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+@pytest.mark.parametrize("layout", ["C", "F", "float64", "sparse"])
+def test_reconstruction_error_matches_round_trip(cls, layout):
+    _require_cpu_built()
+    X = _data(1)
+    est = cls(n_components=5, random_state=0, backend="cpu").fit(X)
+    if layout == "sparse":
+        import scipy.sparse
+
+        X_in = scipy.sparse.csr_matrix(X)
+    else:
+        X_in = {"C": X, "F": np.asfortranarray(X), "float64": X.astype(np.float64)}[layout]
+    X64 = X.astype(np.float64)
+    V = est.components_.astype(np.float64)
+    X_c = X64 - est.mean_ if cls is PCA else X64
+    expected = ((X_c - X_c @ V.T @ V) ** 2).sum(axis=1)
+    err = est.reconstruction_error(X_in)
+    assert err.shape == (X.shape[0],) and err.dtype == np.float32
+    np.testing.assert_allclose(err, expected, rtol=1e-3, atol=1e-2)
+
+
+@pytest.mark.parametrize("n_components", [4, 24])
+def test_score_samples_matches_sklearn(n_components):
+    _require_cpu_built()
+    sklearn_decomposition = pytest.importorskip("sklearn.decomposition")
+    X = _data(2).astype(np.float64)
+    ours = PCA(n_components=n_components, algorithm="cusolver", backend="cpu", dtype=np.float64)
+    ours.fit(X)
+    ref = sklearn_decomposition.PCA(n_components=n_components, svd_solver="full").fit(X)
+    np.testing.assert_allclose(ours.noise_variance_, ref.noise_variance_, rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(ours.score_samples(X), ref.score_samples(X), rtol=1e-6)
+    np.testing.assert_allclose(
+        ours.score_samples(np.asfortranarray(X)), ref.score_samples(X), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("n_components", [3, 10])
+def test_score_samples_of_a_rank_deficient_fit_is_finite(n_components):
+    _require_cpu_built()
+    X = np.zeros((50, 10))
+    X[:, 0] = np.random.default_rng(5).normal(size=50)
+    pca = PCA(n_components=n_components, algorithm="cusolver", backend="cpu", dtype=np.float64)
+    pca.fit(X)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        scores = pca.score_samples(X)
+    assert np.all(np.isfinite(scores))
+    # Only the one non-degenerate direction tells the rows apart.
+    x = X[:, 0] - X[:, 0].mean()
+    expected = -0.5 * (x**2 - x[0] ** 2) / pca.explained_variance_[0]
+    np.testing.assert_allclose(scores - scores[0], expected, rtol=1e-8, atol=1e-8)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+try:
+    from scipy.linalg import subspace_angles
+except Exception:  # pragma: no cover
+    subspace_angles = None  # type: ignore[assignment]
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _sparse_lowrank(n: int, m: int, density: float, seed: int) -> sp.csr_matrix:
+    rng = np.random.default_rng(seed)
+    X = sp.random(n, m, density=density, format="csr", random_state=seed, dtype=np.float32)
+    # Boost a few columns so the leading spectrum is well separated.
+    scale = np.ones(m, dtype=np.float32)
+    scale[rng.choice(m, size=5, replace=False)] = 10.0
+    return sp.csr_matrix(X @ sp.diags(scale))
+
+
+SPARSE_CTORS = {
+    "csr_matrix": sp.csr_matrix,
+    "csc_matrix": sp.csc_matrix,
+    "csr_array": getattr(sp, "csr_array", sp.csr_matrix),
+    "csc_array": getattr(sp, "csc_array", sp.csc_matrix),
+    "coo_matrix": sp.coo_matrix,
+}
+
+
+@pytest.mark.parametrize("fmt", sorted(SPARSE_CTORS))
+def test_tsvd_sparse_matches_dense(fmt: str) -> None:
+    _require_cpu_built()
+    X = _sparse_lowrank(300, 120, density=0.05, seed=3)
+    Xs = SPARSE_CTORS[fmt](X)
+
+    dense = TruncatedSVD(n_components=5, algorithm="power", n_iter=7, random_state=0, backend="cpu")
+    Z_dense = dense.fit_transform(X.toarray())
+
+    ours = TruncatedSVD(n_components=5, algorithm="power", n_iter=7, random_state=0, backend="cpu")
+    Z_sparse = ours.fit_transform(Xs)
+
+    assert Z_sparse.shape == Z_dense.shape == (300, 5)
+    np.testing.assert_allclose(ours.singular_values_, dense.singular_values_, rtol=1e-3)
+    np.testing.assert_allclose(
+        ours.explained_variance_ratio_, dense.explained_variance_ratio_, rtol=1e-3, atol=1e-6
+    )
+    if subspace_angles is not None:
+        ang = subspace_angles(
+            np.asarray(ours.components_, dtype=np.float64).T,
+            np.asarray(dense.components_, dtype=np.float64).T,
+        )
+        assert float(np.max(ang)) < 1e-2
+
+    # transform() on the sparse input agrees with fit_transform().
+    np.testing.assert_allclose(ours.transform(Xs), Z_sparse, rtol=1e-3, atol=1e-3)
+
+
+def test_tsvd_sparse_wide_matches_numpy_svd() -> None:
+    _require_cpu_built()
+    X = _sparse_lowrank(80, 400, density=0.1, seed=5).T.tocsr().T  # CSC view of a wide matrix
+    ours = TruncatedSVD(n_components=4, algorithm="power", n_iter=10, random_state=1, backend="cpu")
+    ours.fit_transform(X)
+
+    s_ref = np.linalg.svd(X.toarray().astype(np.float64), compute_uv=False)[:4]
+    np.testing.assert_allclose(ours.singular_values_, s_ref, rtol=1e-3)
+
+
+@pytest.mark.parametrize("fmt", ["csr_matrix", "csc_array"])
+def test_pca_sparse_matches_sklearn_dense(fmt: str) -> None:
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _sparse_lowrank(400, 90, density=0.08, seed=11)
+    Xs = SPARSE_CTORS[fmt](X)
+
+    ours = PCA(n_components=5, algorithm="power", n_iter=7, random_state=0, backend="cpu")
+    Z = ours.fit_transform(Xs)
+
+    sk = SkPCA(n_components=5, svd_solver="full").fit(X.toarray())
+    np.testing.assert_allclose(ours.mean_, sk.mean_, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(ours.singular_values_, sk.singular_values_, rtol=1e-3)
+    np.testing.assert_allclose(
+        ours.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=1e-3
+    )
+    Z_ref = (X.toarray() - sk.mean_) @ np.asarray(ours.components_).T
+    np.testing.assert_allclose(Z, Z_ref, rtol=1e-3, atol=1e-3)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, FrequentDirections, StreamingSVD, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _low_rank_plus_noise(n: int, m: int, r: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    U, _ = np.linalg.qr(rng.normal(size=(n, r)))
+    V, _ = np.linalg.qr(rng.normal(size=(m, r)))
+    X = (U * np.geomspace(100.0, 10.0, r)) @ V.T + 1e-3 * rng.normal(size=(n, m)) + 4.0
+    return X.astype(np.float32)
+
+
+def test_streaming_svd_single_pass_matches_exact_svd():
+    _require_cpu_built()
+    X = _low_rank_plus_noise(3000, 150, r=6, seed=0)
+    stream = StreamingSVD(n_components=5, sketch_size=15, random_state=0)
+    for batch in np.array_split(X, 11):
+        assert stream.update(batch) is stream
+    tsvd = stream.finalize()
+
+    assert isinstance(tsvd, TruncatedSVD) and not isinstance(tsvd, PCA)
+    assert stream.n_samples_seen_ == 3000
+    assert tsvd.n_matvecs_ == 15 + 31
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:5]
+    np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-3)
+    # The sketch also yields the projections of the rows it has already discarded.
+    np.testing.assert_allclose(
+        tsvd._U * tsvd.singular_values_, X @ tsvd.components_.T, rtol=1e-2, atol=0.1
+    )
+
+
+def test_streaming_svd_keeps_no_co_range_test_matrix():
+    _require_cpu_built()
+    X = _low_rank_plus_noise(900, 40, r=4, seed=3)
+    stream = StreamingSVD(n_components=3, random_state=0)
+    for batch in np.array_split(X, 5):
+        stream.update(batch)
+    assert all(rows == 180 for _, rows in stream._psi_states)
+    # The redrawn Psi is the one each update folded into W = Psi (X - shift).
+    psi = stream._redraw_psi().astype(np.float64)
+    W = (X - stream._shift).astype(np.float64).T @ psi
+    np.testing.assert_allclose(stream._W, W, rtol=1e-4, atol=1e-3)
+
+
+def test_streaming_pca_matches_sklearn():
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _low_rank_plus_noise(2500, 120, r=5, seed=1)
+    stream = StreamingSVD(n_components=5, center=True, random_state=0)
+    for batch in np.array_split(X, 7):
+        stream.update(batch)
+    pca = stream.finalize()
+    sk = SkPCA(n_components=5, svd_solver="full").fit(X)
+
+    assert isinstance(pca, PCA)
+    np.testing.assert_allclose(pca.mean_, sk.mean_, rtol=1e-5, atol=1e-5)
+    # The default sketch (2k + 1 columns) leaves a small bias from the noise tail.
+    np.testing.assert_allclose(pca.singular_values_, sk.singular_values_, rtol=1e-2)
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=2e-2
+    )
+
+
+def test_streaming_svd_validation():
+    _require_cpu_built()
+    stream = StreamingSVD(n_components=3, random_state=0)
+    with pytest.raises(ValueError):
+        stream.finalize()
+    stream.update(np.ones((20, 8), dtype=np.float32))
+    with pytest.raises(ValueError):
+        stream.update(np.ones((5, 9), dtype=np.float32))
+    with pytest.raises(ValueError):
+        StreamingSVD(n_components=5, sketch_size=3)
+
+
+def test_frequent_directions_merge_satisfies_error_bound():
+    _require_cpu_built()
+    rng = np.random.default_rng(2)
+    X = (rng.normal(size=(6000, 100)) * (0.85 ** np.arange(100))).astype(np.float32)
+    shards = [FrequentDirections(n_components=5, sketch_size=20) for _ in range(4)]
+    for fd, part in zip(shards, np.array_split(X, 4)):
+        fd.update(part)
+    merged = shards[0]
+    for other in shards[1:]:
+        assert merged.merge(other) is merged
+    assert merged.n_samples_seen_ == 6000
+    assert merged.sketch_.shape[0] <= 2 * 20
+
+    X64 = X.astype(np.float64)
+    B = merged.sketch_.astype(np.float64)
+    cov_err = np.linalg.norm(X64.T @ X64 - B.T @ B, 2)
+    s = np.linalg.svd(X64, compute_uv=False)
+    # Float32 shrinks add rounding on the order of 1e-5 * ||X||_F^2 to the exact-arithmetic bound.
+    assert cov_err <= merged.covariance_error_ + 1e-4 * np.sum(s**2)
+    assert merged.covariance_error_ <= np.sum(s[5:] ** 2) / (20 - 5)
+
+    tsvd = merged.to_estimator()
+    assert isinstance(tsvd, TruncatedSVD)
+    assert np.all(tsvd.singular_values_ <= s[:5] * (1 + 1e-5))
+    assert np.all(tsvd.singular_values_**2 >= s[:5] ** 2 - merged.covariance_error_ * 1.05)
+    full = TruncatedSVD(n_components=5, algorithm="cusolver", backend="cpu").fit(X)
+    np.testing.assert_allclose(
+        tsvd.explained_variance_ratio_, full.explained_variance_ratio_, rtol=2e-2
+    )
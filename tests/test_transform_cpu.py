@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _reference(est, X):
+    X = np.asarray(X, dtype=np.float64)
+    Z = X @ est.components_.T.astype(np.float64)
+    if isinstance(est, PCA):
+        Z -= est.mean_.astype(np.float64) @ est.components_.T.astype(np.float64)
+        if est.whiten:
+            Z /= np.sqrt(est.explained_variance_.astype(np.float64))
+    return Z
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+@pytest.mark.parametrize("layout", ["C", "F", "rows", "float64", "int"])
+def test_transform_layouts_and_dtypes(cls, layout):
+    _require_cpu_built()
+    rng = np.random.default_rng(0)
+    X = (rng.normal(size=(1000, 30)) * 4 + 50).astype(np.float32)
+    est = cls(n_components=5, random_state=0, backend="cpu").fit(X)
+    inputs = {
+        "C": X,
+        "F": np.asfortranarray(X),
+        "rows": np.repeat(X, 2, axis=0)[::2],
+        "float64": X.astype(np.float64),
+        "int": np.rint(X).astype(np.int32),
+    }
+    X_in = inputs[layout]
+    Z = est.transform(X_in)
+    assert Z.dtype == np.float32
+    np.testing.assert_allclose(Z, _reference(est, X_in), rtol=1e-4, atol=1e-3)
+
+
+def test_pca_transform_centers_and_matches_fit_transform():
+    _require_cpu_built()
+    X = np.random.default_rng(1).normal(size=(700, 20)).astype(np.float32) + 1e3
+    pca = PCA(n_components=4, algorithm="cusolver", backend="cpu")
+    Z_fit = pca.fit_transform(X)
+    np.testing.assert_allclose(pca.transform(X), Z_fit, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(pca.transform(X).mean(axis=0), 0.0, atol=1e-3)
+
+
+@pytest.mark.parametrize("algorithm", ["cusolver", "power"])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_whitened_scores_have_unit_variance(algorithm, sparse):
+    _require_cpu_built()
+    rng = np.random.default_rng(2)
+    X = (rng.normal(size=(800, 25)) * np.linspace(5, 0.5, 25)).astype(np.float32)
+    if sparse:
+        import scipy.sparse
+
+        X = scipy.sparse.csr_matrix(X)
+    pca = PCA(n_components=4, algorithm=algorithm, whiten=True, random_state=0, backend="cpu")
+    Z_fit = pca.fit_transform(X)
+    np.testing.assert_allclose(Z_fit.var(axis=0, ddof=1), 1.0, rtol=1e-3)
+    # The sparse solver is randomized, so its U is close to, not exactly, X_c V / S.
+    atol = 1e-2 if sparse else 1e-3
+    np.testing.assert_allclose(pca.transform(X), Z_fit, rtol=1e-3, atol=atol)
+
+
+def test_transform_validates_features():
+    _require_cpu_built()
+    X = np.random.default_rng(3).normal(size=(50, 10)).astype(np.float32)
+    est = TruncatedSVD(n_components=2, random_state=0, backend="cpu").fit(X)
+    with pytest.raises(ValueError, match="features"):
+        est.transform(X[:, :9])
+    assert est.transform(X[:0]).shape == (0, 2)
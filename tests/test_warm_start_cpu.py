@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _windows(seed=0, n=6000, m=300, r=20, shift=600):
+    # Two overlapping windows of a low-rank-plus-noise stream; min(n, m) > 256 keeps "power"
+    # on the randomized solver.
+    rng = np.random.default_rng(seed)
+    B = rng.normal(size=(r, m)) * np.geomspace(10, 1, r)[:, None]
+    data = rng.normal(size=(n + shift, r)) @ B + 0.5 * rng.normal(size=(n + shift, m))
+    data = data.astype(np.float32)
+    return data[:n], data[shift:]
+
+
+_KW = dict(n_components=8, algorithm="power", n_iter=20, tol=1e-4, random_state=0, backend="cpu")
+
+
+@pytest.mark.parametrize("cls", [PCA, TruncatedSVD])
+def test_warm_refit_converges_faster(cls):
+    _require_cpu_built()
+    X0, X1 = _windows()
+    prev = cls(**_KW).fit(X0)
+    cold = cls(**_KW).fit(X1)
+    warm = cls(**_KW).fit(X1, init=prev)
+    exact = cls(n_components=8, algorithm="cusolver", backend="cpu").fit(X1)
+    assert warm.n_iter_ < cold.n_iter_
+    np.testing.assert_allclose(warm.singular_values_, exact.singular_values_, rtol=1e-4)
+    np.testing.assert_allclose(
+        np.abs(np.sum(warm.components_ * exact.components_, axis=1)), 1.0, atol=1e-3
+    )
+
+
+def test_warm_start_flag_reuses_previous_components():
+    _require_cpu_built()
+    X0, X1 = _windows(1)
+    est = PCA(warm_start=True, **_KW).fit(X0)
+    seeded = PCA(**_KW).fit(X1, init=est.components_.copy())
+    est.fit(X1)
+    np.testing.assert_array_equal(est.components_, seeded.components_)
+    assert est.n_iter_ == seeded.n_iter_
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_subsample_init_matches_cold_fit(sparse):
+    _require_cpu_built()
+    _, X = _windows(2)
+    if sparse:
+        import scipy.sparse
+
+        X = scipy.sparse.csr_matrix(X)
+    cold = TruncatedSVD(**_KW).fit(X)
+    refined = TruncatedSVD(**_KW).fit(X, init="subsample")
+    assert refined.n_iter_ <= cold.n_iter_
+    np.testing.assert_allclose(refined.singular_values_, cold.singular_values_, rtol=1e-4)
+
+
+def test_init_is_validated():
+    _require_cpu_built()
+    X0, _ = _windows(3, n=400, m=40)
+    with pytest.raises(ValueError, match="features"):
+        PCA(**_KW).fit(X0, init=np.ones((3, 39), dtype=np.float32))
+    with pytest.raises(ValueError, match="subsample"):
+        PCA(**_KW).fit(X0, init="coarse")
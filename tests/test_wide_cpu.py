@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from dimreduce4gpu import PCA, TruncatedSVD
+from dimreduce4gpu.lib_dimreduce4cpu import cpu_built
+
+
+def _require_cpu_built():
+    if not cpu_built():
+        pytest.skip("CPU native library is not built or cannot be loaded.")
+
+
+def _wide_lowrank(n: int, m: int, seed: int, offset: float = 0.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    scales = 10.0 * 0.6 ** np.arange(20)
+    X = (rng.normal(size=(n, 20)) * scales) @ rng.normal(size=(20, m))
+    return (X + 0.1 * rng.normal(size=(n, m)) + offset).astype(np.float32)
+
+
+def test_wide_tsvd_matches_numpy_svd():
+    _require_cpu_built()
+    X = _wide_lowrank(150, 10000, seed=0)
+    tsvd = TruncatedSVD(n_components=5, algorithm="wide", n_iter=3, random_state=0, backend="cpu")
+    Z = tsvd.fit_transform(X)
+
+    s_ref = np.linalg.svd(X.astype(np.float64), compute_uv=False)[:5]
+    np.testing.assert_allclose(tsvd.singular_values_, s_ref, rtol=1e-4)
+    C = np.asarray(tsvd.components_, dtype=np.float64)
+    np.testing.assert_allclose(C @ C.T, np.eye(5), atol=1e-4)
+    np.testing.assert_allclose(Z, X @ C.T, rtol=1e-3, atol=1e-2)
+    width = 5 + 10
+    assert tsvd.n_iter_ == 3
+    assert tsvd.n_matvecs_ == width * (2 * 3 + 3)
+
+
+def test_wide_pca_matches_sklearn():
+    _require_cpu_built()
+    from sklearn.decomposition import PCA as SkPCA
+
+    X = _wide_lowrank(120, 8000, seed=1, offset=3.0)
+    pca = PCA(n_components=4, algorithm="wide", n_iter=3, random_state=0, backend="cpu")
+    pca.fit_transform(X)
+    sk = SkPCA(n_components=4, svd_solver="full").fit(X)
+
+    np.testing.assert_allclose(pca.mean_, sk.mean_, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(pca.singular_values_, sk.singular_values_, rtol=1e-4)
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, sk.explained_variance_ratio_, rtol=1e-4
+    )
+    cos = np.abs(np.sum(np.asarray(pca.components_) * sk.components_, axis=1))
+    np.testing.assert_allclose(cos, 1.0, atol=1e-4)
+
+
+@pytest.mark.parametrize("mode", ["processes", "threads"])
+def test_wide_column_partitions_match_single_process(mode):
+    _require_cpu_built()
+    X = _wide_lowrank(100, 9000, seed=2, offset=1.0)
+    ref = PCA(n_components=5, algorithm="wide", n_iter=2, random_state=7, backend="cpu")
+    ref.fit_transform(X)
+
+    # Omega is generated from the column index, so any column partition draws the same sketch.
+    pca = PCA(n_components=5, algorithm="wide", n_iter=2, random_state=7, backend="cpu")
+    if mode == "processes":
+        pca.fit(X, n_jobs=3)
+    else:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pca.fit(X, executor=pool)
+
+    np.testing.assert_allclose(pca.mean_, ref.mean_, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(pca.singular_values_, ref.singular_values_, rtol=1e-4)
+    np.testing.assert_allclose(
+        np.abs(pca.components_), np.abs(ref.components_), rtol=1e-3, atol=1e-5
+    )
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, ref.explained_variance_ratio_, rtol=1e-4
+    )
+    assert pca.n_matvecs_ == ref.n_matvecs_